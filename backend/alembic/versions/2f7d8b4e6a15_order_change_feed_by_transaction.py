@@ -0,0 +1,57 @@
+"""order change feed by transaction
+
+Revision ID: 2f7d8b4e6a15
+Revises: 9a4c2e7f1d58
+Create Date: 2026-10-20 10:41:27.905318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7d8b4e6a15'
+down_revision: Union[str, None] = '9a4c2e7f1d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHANGE_TABLES = ('pets', 'abc_logs', 'insights', 'sync_tombstones')
+
+
+def upgrade() -> None:
+    # Existing rows take this migration's transaction id
+    for table in CHANGE_TABLES:
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default=sa.text('pg_current_xact_id()::text::bigint'), nullable=False))
+        op.drop_index(f'idx_{table}_user_change', table_name=table)
+        op.create_index(f'idx_{table}_user_change', table, ['user_id', 'change_xid', 'change_seq'], unique=False)
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := pg_current_xact_id()::text::bigint;
+            NEW.change_seq := nextval('change_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_seq := nextval('change_seq');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in CHANGE_TABLES:
+        op.drop_index(f'idx_{table}_user_change', table_name=table)
+        op.create_index(f'idx_{table}_user_change', table, ['user_id', 'change_seq'], unique=False)
+        op.drop_column(table, 'change_xid')
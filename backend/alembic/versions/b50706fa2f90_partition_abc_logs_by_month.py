@@ -0,0 +1,213 @@
+"""partition abc_logs by month
+
+Revision ID: b50706fa2f90
+Revises: 89612ffde57e
+Create Date: 2026-10-19 17:02:31.664018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b50706fa2f90'
+down_revision: Union[str, None] = '89612ffde57e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(behavior_notes, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(antecedent_notes, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(consequence_notes, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C')"
+)
+
+COPY_COLUMNS = (
+    'id, pet_id, user_id, antecedent_category, antecedent_tags, antecedent_notes, '
+    'behavior_category, behavior_tags, behavior_severity, behavior_notes, '
+    'consequence_category, consequence_tags, consequence_notes, occurred_at, location, '
+    'duration_seconds, other_pets_present, created_at, change_seq'
+)
+
+MONTHS_AHEAD = 3
+
+
+def _create_abc_logs(table: str, primary_key: tuple[str, ...], **kw) -> None:
+    op.create_table(table,
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('pet_id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('antecedent_category', sa.String(length=50), nullable=False),
+    sa.Column('antecedent_tags', postgresql.ARRAY(sa.String(length=50)), nullable=False),
+    sa.Column('antecedent_notes', sa.String(), nullable=True),
+    sa.Column('behavior_category', sa.String(length=50), nullable=False),
+    sa.Column('behavior_tags', postgresql.ARRAY(sa.String(length=50)), nullable=False),
+    sa.Column('behavior_severity', sa.Integer(), nullable=False),
+    sa.Column('behavior_notes', sa.String(), nullable=True),
+    sa.Column('consequence_category', sa.String(length=50), nullable=False),
+    sa.Column('consequence_tags', postgresql.ARRAY(sa.String(length=50)), nullable=False),
+    sa.Column('consequence_notes', sa.String(), nullable=True),
+    sa.Column('occurred_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('location', sa.String(length=100), nullable=True),
+    sa.Column('duration_seconds', sa.Integer(), nullable=True),
+    sa.Column('other_pets_present', postgresql.ARRAY(sa.UUID()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('NOW()'), nullable=False),
+    sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True),
+    sa.Column('change_seq', sa.BigInteger(), server_default=sa.text("nextval('change_seq')"), nullable=False),
+    sa.CheckConstraint('behavior_severity BETWEEN 1 AND 5', name='ck_abc_logs_severity'),
+    sa.ForeignKeyConstraint(['pet_id'], ['pets.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint(*primary_key, name='abc_logs_pkey'),
+    **kw
+    )
+
+
+def _create_indexes() -> None:
+    op.create_index('idx_abc_logs_pet_occurred', 'abc_logs', ['pet_id', 'occurred_at', 'id'], unique=False)
+    op.create_index(op.f('ix_abc_logs_pet_id'), 'abc_logs', ['pet_id'], unique=False)
+    op.create_index(op.f('ix_abc_logs_user_id'), 'abc_logs', ['user_id'], unique=False)
+    op.create_index('idx_abc_logs_user_change', 'abc_logs', ['user_id', 'change_seq'], unique=False)
+    op.create_index('idx_abc_logs_pet_antecedent', 'abc_logs', ['pet_id', 'antecedent_category', 'occurred_at'], unique=False)
+    op.create_index('idx_abc_logs_pet_behavior', 'abc_logs', ['pet_id', 'behavior_category', 'occurred_at'], unique=False)
+    op.create_index('idx_abc_logs_pet_consequence', 'abc_logs', ['pet_id', 'consequence_category', 'occurred_at'], unique=False)
+    op.create_index('idx_abc_logs_antecedent_tags', 'abc_logs', ['antecedent_tags'], unique=False, postgresql_using='gin')
+    op.create_index('idx_abc_logs_behavior_tags', 'abc_logs', ['behavior_tags'], unique=False, postgresql_using='gin')
+    op.create_index('idx_abc_logs_consequence_tags', 'abc_logs', ['consequence_tags'], unique=False, postgresql_using='gin')
+    op.create_index('idx_abc_logs_search', 'abc_logs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def _retire_old_table(new_name: str) -> None:
+    """Rename the current table out of the way, freeing its index and trigger names."""
+    op.execute('DROP TRIGGER trg_abc_logs_tombstone ON abc_logs')
+    op.execute('DROP TRIGGER trg_abc_logs_change_seq ON abc_logs')
+    for index in (
+        'idx_abc_logs_pet_occurred', 'ix_abc_logs_pet_id', 'ix_abc_logs_user_id',
+        'idx_abc_logs_user_change', 'idx_abc_logs_pet_antecedent', 'idx_abc_logs_pet_behavior',
+        'idx_abc_logs_pet_consequence', 'idx_abc_logs_antecedent_tags',
+        'idx_abc_logs_behavior_tags', 'idx_abc_logs_consequence_tags', 'idx_abc_logs_search',
+    ):
+        op.execute(f'DROP INDEX {index}')
+    op.execute(f'ALTER TABLE abc_logs RENAME CONSTRAINT abc_logs_pkey TO {new_name}_pkey')
+    op.execute(f'ALTER TABLE abc_logs RENAME TO {new_name}')
+
+
+def upgrade() -> None:
+    _retire_old_table('abc_logs_unpartitioned')
+    _create_abc_logs('abc_logs', ('id', 'occurred_at'), postgresql_partition_by='RANGE (occurred_at)')
+    op.execute('CREATE TABLE abc_logs_default PARTITION OF abc_logs DEFAULT')
+
+    op.execute(
+        """
+        CREATE FUNCTION ensure_abc_logs_partition(target date) RETURNS boolean AS $$
+        DECLARE
+            lower_bound date := date_trunc('month', target)::date;
+            upper_bound date := (date_trunc('month', target) + interval '1 month')::date;
+            partition_name text := 'abc_logs_p' || to_char(lower_bound, 'YYYYMM');
+        BEGIN
+            IF to_regclass(partition_name) IS NOT NULL THEN
+                RETURN false;
+            END IF;
+            -- Attaching a range that already has rows in the default partition
+            -- would fail; those rows stay where they are.
+            IF EXISTS (
+                SELECT 1 FROM abc_logs_default
+                WHERE occurred_at >= lower_bound AND occurred_at < upper_bound
+            ) THEN
+                RAISE NOTICE 'abc_logs_default has rows for %, not creating %',
+                    lower_bound, partition_name;
+                RETURN false;
+            END IF;
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF abc_logs FOR VALUES FROM (%L) TO (%L)',
+                partition_name, lower_bound, upper_bound
+            );
+            RETURN true;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f"""
+        SELECT ensure_abc_logs_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', coalesce((SELECT min(occurred_at) FROM abc_logs_unpartitioned), now() AT TIME ZONE 'UTC')),
+            greatest(
+                date_trunc('month', (SELECT max(occurred_at) FROM abc_logs_unpartitioned)),
+                date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months'
+            ),
+            interval '1 month'
+        ) AS month
+        """
+    )
+    op.execute(
+        f'INSERT INTO abc_logs ({COPY_COLUMNS}) SELECT {COPY_COLUMNS} FROM abc_logs_unpartitioned'
+    )
+    op.drop_table('abc_logs_unpartitioned')
+    _create_indexes()
+
+    # A partition's TG_TABLE_NAME is its own name, so partitioned tables pass
+    # the parent's name as an argument. A row-moving UPDATE (occurred_at into
+    # another month) runs as a delete plus an insert; the row still exists, so
+    # it must not leave a tombstone.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        DECLARE
+            source_table text := coalesce(TG_ARGV[0], TG_TABLE_NAME);
+            moved boolean := false;
+        BEGIN
+            IF TG_NARGS > 0 THEN
+                EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I WHERE id = $1)', source_table)
+                    INTO moved USING OLD.id;
+            END IF;
+            IF NOT moved THEN
+                INSERT INTO sync_tombstones (table_name, row_id, user_id)
+                VALUES (source_table, OLD.id, OLD.user_id);
+            END IF;
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER trg_abc_logs_change_seq BEFORE UPDATE ON abc_logs '
+        'FOR EACH ROW EXECUTE FUNCTION bump_change_seq()'
+    )
+    op.execute(
+        "CREATE TRIGGER trg_abc_logs_tombstone AFTER DELETE ON abc_logs "
+        "FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone('abc_logs')"
+    )
+
+
+def downgrade() -> None:
+    _retire_old_table('abc_logs_partitioned')
+    _create_abc_logs('abc_logs', ('id',))
+    op.execute(
+        f'INSERT INTO abc_logs ({COPY_COLUMNS}) SELECT {COPY_COLUMNS} FROM abc_logs_partitioned'
+    )
+    op.drop_table('abc_logs_partitioned')
+    op.execute('DROP FUNCTION ensure_abc_logs_partition(date)')
+    _create_indexes()
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO sync_tombstones (table_name, row_id, user_id)
+            VALUES (TG_TABLE_NAME, OLD.id, OLD.user_id);
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER trg_abc_logs_change_seq BEFORE UPDATE ON abc_logs '
+        'FOR EACH ROW EXECUTE FUNCTION bump_change_seq()'
+    )
+    op.execute(
+        'CREATE TRIGGER trg_abc_logs_tombstone AFTER DELETE ON abc_logs '
+        'FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()'
+    )
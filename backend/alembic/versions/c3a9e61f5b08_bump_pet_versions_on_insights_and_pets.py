@@ -0,0 +1,67 @@
+"""bump pet versions on insights and pets
+
+Revision ID: c3a9e61f5b08
+Revises: 7b2e4f8c9d13
+Create Date: 2026-10-19 21:36:12.905117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e61f5b08'
+down_revision: Union[str, None] = '7b2e4f8c9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The abc_logs function only reads pet_id from the transition tables, so
+    # insights can share it. Triggers reference functions by oid; the
+    # existing abc_logs triggers follow the rename.
+    op.execute('ALTER FUNCTION bump_abc_logs_pet_versions() RENAME TO bump_rows_pet_versions')
+    op.execute(
+        'CREATE TRIGGER trg_insights_pet_version_insert AFTER INSERT ON insights '
+        'REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION bump_rows_pet_versions()'
+    )
+    op.execute(
+        'CREATE TRIGGER trg_insights_pet_version_update AFTER UPDATE ON insights '
+        'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION bump_rows_pet_versions()'
+    )
+    op.execute(
+        'CREATE TRIGGER trg_insights_pet_version_delete AFTER DELETE ON insights '
+        'REFERENCING OLD TABLE AS old_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION bump_rows_pet_versions()'
+    )
+
+    # A new pet starts at version 0 (no row) and a deleted one cascades its
+    # row away, so only profile updates need a bump.
+    op.execute(
+        """
+        CREATE FUNCTION bump_pets_versions() RETURNS trigger AS $$
+        BEGIN
+            PERFORM bump_pet_data_versions(ARRAY(SELECT id FROM new_rows));
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER trg_pets_version_update AFTER UPDATE ON pets '
+        'REFERENCING NEW TABLE AS new_rows '
+        'FOR EACH STATEMENT EXECUTE FUNCTION bump_pets_versions()'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER trg_pets_version_update ON pets')
+    op.execute('DROP FUNCTION bump_pets_versions()')
+    op.execute('DROP TRIGGER trg_insights_pet_version_delete ON insights')
+    op.execute('DROP TRIGGER trg_insights_pet_version_update ON insights')
+    op.execute('DROP TRIGGER trg_insights_pet_version_insert ON insights')
+    op.execute('ALTER FUNCTION bump_rows_pet_versions() RENAME TO bump_abc_logs_pet_versions')
@@ -0,0 +1,20 @@
+"""Dependencies shared across API endpoint modules."""
+
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException
+from app.models.pet import Pet
+
+
+async def get_user_pet(db: AsyncSession, pet_id: uuid.UUID, user_id: str) -> Pet:
+    """Fetch a pet owned by the given user, or raise 404."""
+    result = await db.execute(
+        select(Pet).where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
+    )
+    pet = result.scalar_one_or_none()
+    if pet is None:
+        raise NotFoundException(f"Pet {pet_id}")
+    return pet
@@ -2,35 +2,58 @@
 
 import uuid
 from datetime import UTC, datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import Select, func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundException, ValidationException
+from app.api.deps import get_user_pet
+from app.core.cache import cached, invalidate_on_commit, invalidate_pet, pet_tag, user_tag
+from app.core.etag import pet_data_version
+from app.core.exceptions import NotFoundException, PawLogicException, ValidationException
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    after_cursor,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
 from app.core.security import ensure_db_user
+from app.core.singleflight import single_flight
 from app.core.taxonomy import (
     CONSEQUENCE_CATEGORIES,
     get_antecedent_categories,
     get_behavior_categories,
 )
+from app.db.partitions import ensure_partitions, month_start
 from app.db.session import get_db
-from app.models.abc_log import ABCLog
+from app.models.abc_log import SEARCH_CONFIG, ABCLog
 from app.models.pet import Pet
-from app.schemas.abc_log import ABCLogCreate, ABCLogResponse, ABCLogSummary, ABCLogUpdate
+from app.schemas.abc_log import (
+    ABCLogBatchCreate,
+    ABCLogBatchItemResult,
+    ABCLogBatchResponse,
+    ABCLogCreate,
+    ABCLogFilters,
+    ABCLogImportReport,
+    ABCLogResponse,
+    ABCLogSearchHit,
+    ABCLogSummary,
+    ABCLogUpdate,
+)
+from app.services.anomaly import observe_day, observe_days
+from app.services.history_index import history_index
+from app.services.log_import import ImportFormat, import_abc_logs
+from app.services.pet_stats import get_pet_stats
 
 router = APIRouter()
 
-
-async def _get_user_pet(db: AsyncSession, pet_id: uuid.UUID, user_id: str) -> Pet:
-    """Fetch a pet owned by the given user, or raise 404."""
-    result = await db.execute(
-        select(Pet).where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
-    )
-    pet = result.scalar_one_or_none()
-    if pet is None:
-        raise NotFoundException(f"Pet {pet_id}")
-    return pet
+SNIPPET_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=20, MinWords=6, "
+    'FragmentDelimiter=" … "'
+)
 
 
 def _validate_taxonomy(species: str, body: ABCLogCreate | ABCLogUpdate) -> None:
@@ -74,16 +97,8 @@ def _validate_taxonomy(species: str, body: ABCLogCreate | ABCLogUpdate) -> None:
             )
 
 
-@router.post("", response_model=ABCLogResponse, status_code=201)
-async def create_abc_log(
-    body: ABCLogCreate,
-    user_id: str = Depends(ensure_db_user),
-    db: AsyncSession = Depends(get_db),
-) -> ABCLog:
-    pet = await _get_user_pet(db, body.pet_id, user_id)
-    _validate_taxonomy(pet.species, body)
-
-    now = datetime.now(UTC)
+def _log_values(body: ABCLogCreate, user_id: uuid.UUID, now: datetime) -> dict:
+    """Column values for a new log; rejects ``occurred_at`` in the future."""
     if body.occurred_at and body.occurred_at.replace(tzinfo=UTC) > now:
         raise ValidationException("occurred_at cannot be in the future")
 
@@ -91,107 +106,355 @@ async def create_abc_log(
     occurred = (
         body.occurred_at.replace(tzinfo=None) if body.occurred_at else now.replace(tzinfo=None)
     )
+    return {
+        "pet_id": body.pet_id,
+        "user_id": user_id,
+        "antecedent_category": body.antecedent_category,
+        "antecedent_tags": body.antecedent_tags,
+        "antecedent_notes": body.antecedent_notes,
+        "behavior_category": body.behavior_category,
+        "behavior_tags": body.behavior_tags,
+        "behavior_severity": body.behavior_severity,
+        "behavior_notes": body.behavior_notes,
+        "consequence_category": body.consequence_category,
+        "consequence_tags": body.consequence_tags,
+        "consequence_notes": body.consequence_notes,
+        "occurred_at": occurred,
+        "location": body.location,
+        "duration_seconds": body.duration_seconds,
+        "other_pets_present": body.other_pets_present,
+    }
+
+
+async def _ensure_backdated_partitions(
+    db: AsyncSession, occurred: list[datetime], now: datetime
+) -> None:
+    """Create the monthly partitions for logs dated before the current month.
+
+    The current and coming months are kept ready by the partition task;
+    without this, backdated logs would land in ``abc_logs_default``.
+    """
+    current = month_start(now.date())
+    await ensure_partitions(db, [at.date() for at in occurred if at.date() < current])
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Convert to naive UTC for comparison with TIMESTAMP WITHOUT TIME ZONE."""
+    return value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _log_filters(
+    antecedent_category: str | None = Query(None),
+    behavior_category: str | None = Query(None),
+    consequence_category: str | None = Query(None),
+    antecedent_tags: list[str] | None = Query(None),
+    behavior_tags: list[str] | None = Query(None),
+    consequence_tags: list[str] | None = Query(None),
+    tag_match: Literal["any", "all"] = Query("any"),
+    severity_min: int | None = Query(None, ge=1, le=5),
+    severity_max: int | None = Query(None, ge=1, le=5),
+    location: str | None = Query(None, max_length=100),
+    occurred_after: datetime | None = Query(None),
+    occurred_before: datetime | None = Query(None),
+) -> ABCLogFilters:
+    return ABCLogFilters(
+        antecedent_category=antecedent_category,
+        behavior_category=behavior_category,
+        consequence_category=consequence_category,
+        antecedent_tags=antecedent_tags,
+        behavior_tags=behavior_tags,
+        consequence_tags=consequence_tags,
+        tag_match=tag_match,
+        severity_min=severity_min,
+        severity_max=severity_max,
+        location=location,
+        occurred_after=occurred_after,
+        occurred_before=occurred_before,
+    )
+
+
+def _apply_filters(query: Select, filters: ABCLogFilters) -> Select:
+    if (
+        filters.severity_min is not None
+        and filters.severity_max is not None
+        and filters.severity_min > filters.severity_max
+    ):
+        raise ValidationException("severity_min cannot be greater than severity_max")
+
+    for column, value in (
+        (ABCLog.antecedent_category, filters.antecedent_category),
+        (ABCLog.behavior_category, filters.behavior_category),
+        (ABCLog.consequence_category, filters.consequence_category),
+    ):
+        if value is not None:
+            query = query.where(column == value)
+
+    for column, tags in (
+        (ABCLog.antecedent_tags, filters.antecedent_tags),
+        (ABCLog.behavior_tags, filters.behavior_tags),
+        (ABCLog.consequence_tags, filters.consequence_tags),
+    ):
+        if tags:
+            query = query.where(
+                column.contains(tags) if filters.tag_match == "all" else column.overlap(tags)
+            )
 
-    log = ABCLog(
-        pet_id=body.pet_id,
-        user_id=uuid.UUID(user_id),
-        antecedent_category=body.antecedent_category,
-        antecedent_tags=body.antecedent_tags,
-        antecedent_notes=body.antecedent_notes,
-        behavior_category=body.behavior_category,
-        behavior_tags=body.behavior_tags,
-        behavior_severity=body.behavior_severity,
-        behavior_notes=body.behavior_notes,
-        consequence_category=body.consequence_category,
-        consequence_tags=body.consequence_tags,
-        consequence_notes=body.consequence_notes,
-        occurred_at=occurred,
-        location=body.location,
-        duration_seconds=body.duration_seconds,
-        other_pets_present=body.other_pets_present,
+    if filters.severity_min is not None:
+        query = query.where(ABCLog.behavior_severity >= filters.severity_min)
+    if filters.severity_max is not None:
+        query = query.where(ABCLog.behavior_severity <= filters.severity_max)
+    if filters.location:
+        query = query.where(func.lower(ABCLog.location) == filters.location.lower())
+    if filters.occurred_after is not None:
+        query = query.where(ABCLog.occurred_at >= _naive_utc(filters.occurred_after))
+    if filters.occurred_before is not None:
+        query = query.where(ABCLog.occurred_at < _naive_utc(filters.occurred_before))
+    return query
+
+
+def _format_item_errors(exc: PydanticValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
     )
+
+
+@router.post("", response_model=ABCLogResponse, status_code=201)
+async def create_abc_log(
+    body: ABCLogCreate,
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> ABCLog:
+    pet = await get_user_pet(db, body.pet_id, user_id)
+    _validate_taxonomy(pet.species, body)
+
+    now = datetime.now(UTC)
+    log = ABCLog(**_log_values(body, uuid.UUID(user_id), now))
+    await _ensure_backdated_partitions(db, [log.occurred_at], now)
     db.add(log)
     await db.flush()
     await db.refresh(log)
+    await observe_day(db, log.pet_id, log.user_id, log.occurred_at.date())
+    invalidate_pet(db, user_id, log.pet_id)
     return log
 
 
+@router.post("/batch", response_model=ABCLogBatchResponse)
+async def create_abc_logs_batch(
+    body: ABCLogBatchCreate,
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> ABCLogBatchResponse:
+    """Create many ABC logs at once, e.g. an offline backlog from the mobile app.
+
+    Logs may reference any of the user's pets. Each item is validated on its
+    own; invalid items are reported in ``results`` (matched by ``index``)
+    while the valid ones are created in a single multi-row insert.
+    """
+    uid = uuid.UUID(user_id)
+    now = datetime.now(UTC)
+    results: dict[int, ABCLogBatchItemResult] = {}
+
+    parsed: dict[int, ABCLogCreate] = {}
+    for index, item in enumerate(body.logs):
+        try:
+            parsed[index] = ABCLogCreate.model_validate(item)
+        except PydanticValidationError as exc:
+            results[index] = ABCLogBatchItemResult(
+                index=index, status="error", error=_format_item_errors(exc)
+            )
+
+    # Ownership and species for every referenced pet in one query
+    pet_ids = {log.pet_id for log in parsed.values()}
+    species_by_pet: dict[uuid.UUID, str] = {}
+    if pet_ids:
+        pets = await db.execute(
+            select(Pet.id, Pet.species).where(Pet.id.in_(pet_ids), Pet.user_id == uid)
+        )
+        species_by_pet = dict(pets.all())
+
+    rows: list[dict] = []
+    row_indexes: list[int] = []
+    for index, log in parsed.items():
+        try:
+            species = species_by_pet.get(log.pet_id)
+            if species is None:
+                raise NotFoundException(f"Pet {log.pet_id}")
+            _validate_taxonomy(species, log)
+            rows.append(_log_values(log, uid, now))
+            row_indexes.append(index)
+        except PawLogicException as exc:
+            results[index] = ABCLogBatchItemResult(index=index, status="error", error=exc.message)
+
+    if rows:
+        await _ensure_backdated_partitions(db, [row["occurred_at"] for row in rows], now)
+        created = await db.scalars(
+            insert(ABCLog).returning(ABCLog, sort_by_parameter_order=True), rows
+        )
+        for index, log in zip(row_indexes, created.all(), strict=True):
+            results[index] = ABCLogBatchItemResult(
+                index=index, status="created", log=ABCLogResponse.model_validate(log)
+            )
+        await observe_days(db, uid, ((r["pet_id"], r["occurred_at"].date()) for r in rows))
+        invalidate_on_commit(db, user_tag(user_id), *(pet_tag(row["pet_id"]) for row in rows))
+
+    return ABCLogBatchResponse(
+        created=len(rows),
+        failed=len(body.logs) - len(rows),
+        results=[results[index] for index in range(len(body.logs))],
+    )
+
+
+@router.post("/import", response_model=ABCLogImportReport)
+async def import_abc_logs_file(
+    file: UploadFile = File(...),
+    pet_id: uuid.UUID | None = Query(None),
+    format: ImportFormat | None = Query(None),
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> ABCLogImportReport:
+    """Bulk-load a CSV or NDJSON history, e.g. when migrating from a spreadsheet.
+
+    ``pet_id`` assigns every row to one pet; without it each row needs a
+    ``pet_id`` column. The format follows the file extension unless given.
+    Invalid rows are listed in the report, and rows matching an existing
+    log (same pet, behavior category and time) are counted as duplicates.
+    """
+    if pet_id is not None:
+        await get_user_pet(db, pet_id, user_id)
+    if format is None:
+        format = "ndjson" if (file.filename or "").endswith((".ndjson", ".jsonl")) else "csv"
+
+    report = await import_abc_logs(db, uuid.UUID(user_id), file.file, format, pet_id)
+    # Per-pet entries are also keyed on data versions, which the insert bumped
+    invalidate_on_commit(db, user_tag(user_id), *([pet_tag(pet_id)] if pet_id else []))
+    return ABCLogImportReport.model_validate(report)
+
+
 @router.get("", response_model=list[ABCLogResponse])
 async def list_abc_logs(
+    response: Response,
     pet_id: uuid.UUID = Query(...),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None),
+    filters: ABCLogFilters = Depends(_log_filters),
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[ABCLog]:
-    await _get_user_pet(db, pet_id, user_id)
-    result = await db.execute(
+    """List a pet's logs, newest first, optionally filtered.
+
+    Filters combine with AND. Tag filters (repeat the parameter for several
+    tags) use the GIN indexes on the tag arrays; category and date filters
+    use the ``(pet_id, <category>, occurred_at)`` composite indexes.
+
+    Paginated by keyset on ``(occurred_at, id)``: when more logs exist, the
+    ``X-Next-Cursor`` response header holds the cursor for the next page.
+    ``offset`` is still accepted for older clients but cannot be combined
+    with ``cursor``.
+    """
+    if cursor and offset:
+        raise ValidationException("Use either cursor or offset, not both")
+    await get_user_pet(db, pet_id, user_id)
+
+    query = (
         select(ABCLog)
         .where(ABCLog.pet_id == pet_id)
-        .order_by(ABCLog.occurred_at.desc())
-        .limit(limit)
-        .offset(offset)
+        .order_by(ABCLog.occurred_at.desc(), ABCLog.id.desc())
+        .limit(limit + 1)
     )
-    return list(result.scalars().all())
+    query = _apply_filters(query, filters)
+    if cursor:
+        query = query.where(after_cursor(ABCLog.occurred_at, ABCLog.id, cursor))
+    elif offset:
+        query = query.offset(offset)
+    result = await db.execute(query)
+    logs = list(result.scalars().all())
+
+    if len(logs) > limit:
+        logs = logs[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(logs[-1].occurred_at, logs[-1].id)
+    return logs
 
 
 @router.get("/summary", response_model=ABCLogSummary)
+@cached("abc-logs:summary", tags=lambda kw: [pet_tag(kw["pet_id"])])
+@single_flight("abc-logs:summary")
 async def abc_log_summary(
     pet_id: uuid.UUID = Query(...),
-    user_id: str = Depends(ensure_db_user),
+    version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    await _get_user_pet(db, pet_id, user_id)
-
-    # Aggregate stats
-    stats = await db.execute(
-        select(
-            func.count().label("total"),
-            func.min(ABCLog.occurred_at).label("earliest"),
-            func.max(ABCLog.occurred_at).label("latest"),
-            func.avg(ABCLog.behavior_severity).label("severity_avg"),
-        ).where(ABCLog.pet_id == pet_id)
-    )
-    row = stats.one()
+    stats = await get_pet_stats(db, pet_id, version)
+    return {
+        "total_logs": stats.total_logs,
+        "earliest_log": stats.earliest,
+        "latest_log": stats.latest,
+        "severity_avg": stats.severity_avg,
+        "top_behaviors": stats.top_behaviors,
+        "top_antecedents": stats.top_antecedents,
+    }
 
-    # Top behavior categories
-    top_behaviors_q = await db.execute(
-        select(
-            ABCLog.behavior_category,
-            func.count().label("count"),
-        )
-        .where(ABCLog.pet_id == pet_id)
-        .group_by(ABCLog.behavior_category)
-        .order_by(func.count().desc())
-        .limit(5)
-    )
-    top_behaviors = [
-        {"category": r.behavior_category, "count": r.count} for r in top_behaviors_q.all()
-    ]
 
-    # Top antecedent categories
-    top_antecedents_q = await db.execute(
-        select(
-            ABCLog.antecedent_category,
-            func.count().label("count"),
-        )
-        .where(ABCLog.pet_id == pet_id)
-        .group_by(ABCLog.antecedent_category)
-        .order_by(func.count().desc())
-        .limit(5)
+@router.get("/search", response_model=list[ABCLogSearchHit])
+async def search_abc_logs(
+    response: Response,
+    q: str = Query(..., min_length=2, max_length=200),
+    pet_id: uuid.UUID | None = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[ABCLogSearchHit]:
+    """Full-text search over log notes and location, best matches first.
+
+    ``q`` accepts web-search syntax (quoted phrases, ``or``, ``-exclude``).
+    Searches all of the user's pets unless ``pet_id`` is given. Matches come
+    from the GIN index on the generated ``search_vector`` column; only the
+    returned page is highlighted. When more results exist, the
+    ``X-Next-Cursor`` response header holds the cursor for the next page.
+    """
+    uid = uuid.UUID(user_id)
+    if pet_id is not None:
+        await get_user_pet(db, pet_id, user_id)
+
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(ABCLog.search_vector, tsquery)
+    page = (
+        select(ABCLog.id, rank.label("rank"))
+        .where(ABCLog.user_id == uid, ABCLog.search_vector.bool_op("@@")(tsquery))
+        .order_by(rank.desc(), ABCLog.id.desc())
+        .limit(limit + 1)
     )
-    top_antecedents = [
-        {"category": r.antecedent_category, "count": r.count} for r in top_antecedents_q.all()
-    ]
+    if pet_id is not None:
+        page = page.where(ABCLog.pet_id == pet_id)
+    if cursor:
+        page = page.where(tuple_(rank, ABCLog.id) < decode_rank_cursor(cursor))
+    page = page.subquery()
+
+    document = func.concat_ws(
+        " … ",
+        ABCLog.antecedent_notes,
+        ABCLog.behavior_notes,
+        ABCLog.consequence_notes,
+        ABCLog.location,
+    )
+    snippet = func.ts_headline(SEARCH_CONFIG, document, tsquery, SNIPPET_OPTIONS)
+    result = await db.execute(
+        select(ABCLog, page.c.rank, snippet)
+        .join(page, page.c.id == ABCLog.id)
+        .order_by(page.c.rank.desc(), ABCLog.id.desc())
+    )
+    rows = result.all()
 
-    return {
-        "total_logs": row.total,
-        "earliest_log": row.earliest,
-        "latest_log": row.latest,
-        "severity_avg": float(row.severity_avg) if row.severity_avg else None,
-        "top_behaviors": top_behaviors,
-        "top_antecedents": top_antecedents,
-    }
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last, last_rank, _ = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_rank_cursor(last_rank, last.id)
+
+    return [
+        ABCLogSearchHit(log=ABCLogResponse.model_validate(log), rank=log_rank, snippet=text)
+        for log, log_rank, text in rows
+    ]
 
 
 @router.get("/{log_id}", response_model=ABCLogResponse)
@@ -229,10 +492,15 @@ async def update_abc_log(
     _validate_taxonomy(pet.species, body)
 
     update_data = body.model_dump(exclude_unset=True)
+    if update_data.get("occurred_at") is not None:
+        await _ensure_backdated_partitions(db, [update_data["occurred_at"]], datetime.now(UTC))
     for field, value in update_data.items():
         setattr(log, field, value)
     await db.flush()
     await db.refresh(log)
+    history_index.invalidate(log.pet_id)
+    await observe_day(db, log.pet_id, log.user_id, log.occurred_at.date())
+    invalidate_pet(db, user_id, log.pet_id)
     return log
 
 
@@ -249,6 +517,8 @@ async def delete_abc_log(
     if log is None:
         raise NotFoundException(f"ABC log {log_id}")
     await db.delete(log)
+    history_index.invalidate(log.pet_id)
+    invalidate_pet(db, user_id, log.pet_id)
 
 
 @router.get("/taxonomy/{species}")
@@ -0,0 +1,83 @@
+"""Admin endpoints -- operational telemetry for tuning AI features."""
+
+from datetime import UTC, datetime, timedelta
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import Date, cast, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.security import require_admin
+from app.core.singleflight import flights
+from app.db.session import get_db
+from app.models.coaching_session import CoachingMessage
+
+router = APIRouter()
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def _percentiles(column, name: str, condition) -> list:
+    return [
+        func.percentile_cont(q)
+        .within_group(column)
+        .filter(condition)
+        .label(f"{name}_p{int(q * 100)}")
+        for q in PERCENTILES
+    ]
+
+
+@router.get("/coaching-telemetry")
+async def coaching_telemetry(
+    days: int = Query(7, ge=1, le=90),
+    _admin: str = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Per-model, per-day coaching latency and token aggregates.
+
+    Latency and time-to-first-token percentiles only cover live model calls;
+    answer-cache hits and fallbacks are reported as counts.
+    """
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
+    day = cast(CoachingMessage.created_at, Date)
+    live = CoachingMessage.cache_hit.is_(False) & CoachingMessage.fallback_reason.is_(None)
+
+    result = await db.execute(
+        select(
+            day.label("date"),
+            CoachingMessage.model,
+            func.count().label("calls"),
+            func.count().filter(CoachingMessage.cache_hit.is_(True)).label("cache_hits"),
+            func.count().filter(CoachingMessage.fallback_reason.is_not(None)).label("fallbacks"),
+            *_percentiles(CoachingMessage.latency_ms, "latency_ms", live),
+            *_percentiles(CoachingMessage.ttft_ms, "ttft_ms", live),
+            func.avg(CoachingMessage.input_tokens).label("avg_input_tokens"),
+            func.avg(CoachingMessage.output_tokens).label("avg_output_tokens"),
+            func.sum(CoachingMessage.input_tokens).label("input_tokens"),
+            func.sum(CoachingMessage.output_tokens).label("output_tokens"),
+            func.sum(CoachingMessage.cached_tokens).label("cached_tokens"),
+        )
+        .where(CoachingMessage.role == "assistant", CoachingMessage.created_at >= cutoff)
+        .group_by(day, CoachingMessage.model)
+        .order_by(day.desc(), CoachingMessage.model)
+    )
+
+    data = []
+    for row in result.all():
+        entry = dict(row._mapping)
+        entry["date"] = str(row.date)
+        for key, value in entry.items():
+            if key.startswith(("latency_ms_", "ttft_ms_", "avg_")) and value is not None:
+                entry[key] = round(float(value), 1)
+            elif key in ("input_tokens", "output_tokens", "cached_tokens"):
+                entry[key] = int(value or 0)
+        data.append(entry)
+
+    return {"days": days, "data": data}
+
+
+@router.get("/cache-stats")
+async def cache_stats(_admin: str = Depends(require_admin)) -> dict:
+    """Response cache and single-flight counters for this API process since it
+    started."""
+    return {**response_cache.stats(), "single_flight": flights.stats()}
@@ -1,26 +1,29 @@
 """Analysis endpoints -- trigger pattern detection, AI coaching, and view results."""
 
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, Query, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from app.api.deps import get_user_pet
 from app.core.exceptions import NotFoundException, ValidationException
+from app.core.pagination import NEXT_CURSOR_HEADER, after_cursor, encode_cursor
 from app.core.security import ensure_db_user
+from app.core.singleflight import single_flight
 from app.db.session import get_db
 from app.models.abc_log import ABCLog
 from app.models.coaching_session import CoachingMessage, CoachingSession
-from app.models.pet import Pet
 from app.schemas.coaching import (
     CoachingMessageResponse,
     CoachingSessionDetail,
     CoachingSessionResponse,
 )
 from app.services.ai_analysis import coaching_response
+from app.services.archive import archived_totals
+from app.services.coaching_context import load_coaching_context, record_coaching_turn
 from app.services.pattern_detection import MIN_LOGS_FOR_PATTERNS, detect_patterns
 
 router = APIRouter()
@@ -48,126 +51,135 @@ async def ask_coaching(
     If null, creates a new session.
     """
     uid = uuid.UUID(user_id)
-    session: CoachingSession | None = None
-    conversation_history: list[dict] | None = None
-
-    if body.session_id:
-        # Load existing session
-        result = await db.execute(
-            select(CoachingSession)
-            .options(selectinload(CoachingSession.messages))
-            .where(CoachingSession.id == body.session_id, CoachingSession.user_id == uid)
-        )
-        session = result.scalar_one_or_none()
-        if session is None:
-            raise NotFoundException(f"Coaching session {body.session_id}")
-
-        # Build conversation history from existing messages (cap at 20)
-        history_msgs = session.messages[-20:]
-        if history_msgs:
-            conversation_history = [
-                {"role": msg.role, "content": msg.content} for msg in history_msgs
-            ]
-    else:
-        # Create new session
-        title = body.question[:100].strip()
-        session = CoachingSession(
-            pet_id=body.pet_id,
-            user_id=uid,
-            title=title,
-        )
-        db.add(session)
-        await db.flush()
-
-    # Save user message
-    user_msg = CoachingMessage(
-        session_id=session.id,
-        role="user",
-        content=body.question,
-    )
-    db.add(user_msg)
+    # Naive UTC, like every other timestamp column (and the admin telemetry cutoff)
+    asked_at = datetime.now(UTC).replace(tzinfo=None)
 
-    # Get AI response
+    # One query for the pet, recent logs and insights, and the session tail
+    context = await load_coaching_context(db, body.pet_id, uid, session_id=body.session_id)
+    if body.session_id and not context.session_found:
+        raise NotFoundException(f"Coaching session {body.session_id}")
+    if context.pet is None:
+        raise NotFoundException(f"Pet {body.pet_id}")
+
+    # Get AI response, with the last 20 messages as conversation history
     ai_result = await coaching_response(
-        db, body.pet_id, uid, body.question, conversation_history=conversation_history
+        db,
+        body.pet_id,
+        uid,
+        body.question,
+        conversation_history=context.history or None,
+        context=context,
     )
 
-    # Save assistant message
-    assistant_msg = CoachingMessage(
-        session_id=session.id,
-        role="assistant",
-        content=ai_result["response"],
+    # Save the session and both messages (with per-call telemetry) in one statement
+    telemetry = ai_result.pop("telemetry", {})
+    session_id = await record_coaching_turn(
+        db,
+        session_id=body.session_id,
+        pet_id=body.pet_id,
+        user_id=uid,
+        question=body.question,
+        asked_at=asked_at,
+        answer=ai_result["response"],
+        answered_at=datetime.now(UTC).replace(tzinfo=None),
         model=ai_result.get("model"),
+        telemetry=telemetry,
     )
-    db.add(assistant_msg)
-
-    # Update session timestamp
-    session.updated_at = datetime.now()
-
     await db.commit()
 
     return {
         **ai_result,
-        "session_id": str(session.id),
+        "session_id": str(session_id),
     }
 
 
 @router.get("/coaching/sessions", response_model=list[CoachingSessionResponse])
 async def list_coaching_sessions(
+    response: Response,
     pet_id: uuid.UUID = Query(...),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[CoachingSessionResponse]:
-    """List coaching sessions for a pet, ordered by most recent first."""
+    """List coaching sessions for a pet, newest first.
+
+    Paginated by keyset on ``(created_at, id)``: when more sessions exist,
+    the ``X-Next-Cursor`` response header holds the cursor for the next page.
+    The key never changes, so a session that gets a new turn while a client
+    is paging neither moves ahead of the cursor nor shows up twice.
+    """
     uid = uuid.UUID(user_id)
 
-    result = await db.execute(
-        select(
-            CoachingSession.id,
-            CoachingSession.pet_id,
-            CoachingSession.title,
-            func.count(CoachingMessage.id).label("message_count"),
-            CoachingSession.created_at,
-            CoachingSession.updated_at,
-        )
-        .outerjoin(CoachingMessage)
+    query = (
+        select(CoachingSession)
         .where(CoachingSession.pet_id == pet_id, CoachingSession.user_id == uid)
-        .group_by(CoachingSession.id)
-        .order_by(CoachingSession.updated_at.desc())
+        .order_by(CoachingSession.created_at.desc(), CoachingSession.id.desc())
+        .limit(limit + 1)
     )
-    rows = result.all()
+    if cursor:
+        query = query.where(after_cursor(CoachingSession.created_at, CoachingSession.id, cursor))
+    result = await db.execute(query)
+    sessions = list(result.scalars().all())
+
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        last = sessions[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
 
     return [
         CoachingSessionResponse(
-            id=row.id,
-            pet_id=row.pet_id,
-            title=row.title,
-            message_count=row.message_count,
-            created_at=row.created_at,
-            updated_at=row.updated_at,
+            id=s.id,
+            pet_id=s.pet_id,
+            title=s.title,
+            message_count=s.message_count,
+            created_at=s.created_at,
+            updated_at=s.updated_at,
         )
-        for row in rows
+        for s in sessions
     ]
 
 
 @router.get("/coaching/sessions/{session_id}", response_model=CoachingSessionDetail)
 async def get_coaching_session(
     session_id: uuid.UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None),
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> CoachingSessionDetail:
-    """Get a coaching session with all its messages."""
+    """Get a coaching session with a page of its messages.
+
+    Returns the most recent ``limit`` messages in chronological order. Pass
+    ``next_cursor`` back as ``cursor`` to load the page of older messages.
+    """
     uid = uuid.UUID(user_id)
 
     result = await db.execute(
-        select(CoachingSession)
-        .options(selectinload(CoachingSession.messages))
-        .where(CoachingSession.id == session_id, CoachingSession.user_id == uid)
+        select(CoachingSession).where(
+            CoachingSession.id == session_id, CoachingSession.user_id == uid
+        )
     )
     session = result.scalar_one_or_none()
     if session is None:
         raise NotFoundException(f"Coaching session {session_id}")
 
+    query = (
+        select(CoachingMessage)
+        .where(CoachingMessage.session_id == session_id)
+        .order_by(CoachingMessage.created_at.desc(), CoachingMessage.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        query = query.where(after_cursor(CoachingMessage.created_at, CoachingMessage.id, cursor))
+    messages = list((await db.execute(query)).scalars().all())
+
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_cursor(messages[-1].created_at, messages[-1].id)
+    messages.reverse()
+
     return CoachingSessionDetail(
         id=session.id,
         pet_id=session.pet_id,
@@ -181,8 +193,9 @@ async def get_coaching_session(
                 model=msg.model,
                 created_at=msg.created_at,
             )
-            for msg in session.messages
+            for msg in messages
         ],
+        next_cursor=next_cursor,
         created_at=session.created_at,
         updated_at=session.updated_at,
     )
@@ -213,24 +226,23 @@ async def delete_coaching_session(
 
 
 @router.post("/detect-patterns")
+# Runs for a pet serialize on a lock in detect_patterns; share the one in flight here.
+# Not distributed: a published result would be replayed to callers before it commits.
+@single_flight("analysis:detect-patterns")
 async def run_pattern_detection(
     pet_id: uuid.UUID = Query(...),
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Trigger pattern detection for a pet. Requires minimum 10 ABC logs."""
-    # Verify ownership
-    result = await db.execute(
-        select(Pet).where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
-    )
-    if result.scalar_one_or_none() is None:
-        raise NotFoundException(f"Pet {pet_id}")
+    await get_user_pet(db, pet_id, user_id)
 
     # Check log count
     count_result = await db.execute(
         select(func.count()).select_from(ABCLog).where(ABCLog.pet_id == pet_id)
     )
-    log_count = count_result.scalar()
+    archived_count, _ = await archived_totals(db, pet_id)
+    log_count = count_result.scalar() + archived_count
     if log_count < MIN_LOGS_FOR_PATTERNS:
         raise ValidationException(
             f"Need at least {MIN_LOGS_FOR_PATTERNS} ABC logs for pattern detection. "
@@ -0,0 +1,50 @@
+"""Bulk export endpoints -- full behavior history for vets and behaviorists."""
+
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_user_pet
+from app.core.security import ensure_db_user
+from app.db.session import get_db
+from app.services.export import MEDIA_TYPES, ExportDataset, ExportFormat, stream_export
+
+router = APIRouter()
+
+
+@router.get(
+    "/{dataset}",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media: {} for media in MEDIA_TYPES.values()}}},
+)
+async def export_dataset(
+    dataset: ExportDataset,
+    pet_id: uuid.UUID | None = Query(None),
+    format: ExportFormat = Query("ndjson"),
+    gzip: bool = Query(False),
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream every ABC log, insight or coaching message for a user or one pet.
+
+    The body is written as rows are read, so exports of any size start
+    immediately and use constant memory. With ``gzip=true`` the file itself
+    is gzipped (``.gz`` download), not just the transfer.
+    """
+    if pet_id is not None:
+        await get_user_pet(db, pet_id, user_id)
+
+    filename = f"pawlogic-{dataset}-{datetime.now(UTC):%Y%m%d}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        stream_export(dataset, format, uuid.UUID(user_id), pet_id, compress=gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
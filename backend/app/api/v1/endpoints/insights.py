@@ -6,32 +6,25 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import cached, invalidate_pet, pet_tag
+from app.core.etag import pet_data_version
 from app.core.exceptions import NotFoundException
 from app.core.security import ensure_db_user
 from app.db.session import get_db
 from app.models.insight import Insight
-from app.models.pet import Pet
 from app.schemas.insight import InsightMarkRead, InsightResponse
 
 router = APIRouter()
 
 
-async def _verify_pet_ownership(db: AsyncSession, pet_id: uuid.UUID, user_id: str) -> None:
-    result = await db.execute(
-        select(Pet).where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
-    )
-    if result.scalar_one_or_none() is None:
-        raise NotFoundException(f"Pet {pet_id}")
-
-
 @router.get("/pets/{pet_id}/insights", response_model=list[InsightResponse])
+@cached("insights:list", tags=lambda kw: [pet_tag(kw["pet_id"])], model=list[InsightResponse])
 async def list_insights(
     pet_id: uuid.UUID,
     unread_only: bool = Query(False),
-    user_id: str = Depends(ensure_db_user),
+    _version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> list[Insight]:
-    await _verify_pet_ownership(db, pet_id, user_id)
     query = select(Insight).where(Insight.pet_id == pet_id)
     if unread_only:
         query = query.where(Insight.is_read.is_(False))
@@ -41,12 +34,12 @@ async def list_insights(
 
 
 @router.get("/pets/{pet_id}/insights/summary")
+@cached("insights:summary", tags=lambda kw: [pet_tag(kw["pet_id"])])
 async def insights_summary(
     pet_id: uuid.UUID,
-    user_id: str = Depends(ensure_db_user),
+    _version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    await _verify_pet_ownership(db, pet_id, user_id)
     total = await db.execute(
         select(func.count()).select_from(Insight).where(Insight.pet_id == pet_id)
     )
@@ -89,4 +82,5 @@ async def mark_insight_read(
     insight.is_read = body.is_read
     await db.flush()
     await db.refresh(insight)
+    invalidate_pet(db, user_id, insight.pet_id)
     return insight
@@ -6,11 +6,13 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundException
+from app.api.deps import get_user_pet
+from app.core.cache import cached, invalidate_on_commit, invalidate_pet, pet_tag, user_tag
 from app.core.security import ensure_db_user
 from app.db.session import get_db
 from app.models.pet import Pet
 from app.schemas.pet import PetCreate, PetResponse, PetUpdate
+from app.services.archive import purge_archived_pets
 
 router = APIRouter()
 
@@ -37,10 +39,12 @@ async def create_pet(
     db.add(pet)
     await db.flush()
     await db.refresh(pet)
+    invalidate_on_commit(db, user_tag(user_id))
     return pet
 
 
 @router.get("", response_model=list[PetResponse])
+@cached("pets:list", tags=lambda kw: [user_tag(kw["user_id"])], model=list[PetResponse])
 async def list_pets(
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
@@ -52,12 +56,13 @@ async def list_pets(
 
 
 @router.get("/{pet_id}", response_model=PetResponse)
+@cached("pets:get", tags=lambda kw: [pet_tag(kw["pet_id"])], model=PetResponse)
 async def get_pet(
     pet_id: uuid.UUID,
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> Pet:
-    pet = await _get_user_pet(db, pet_id, user_id)
+    pet = await get_user_pet(db, pet_id, user_id)
     return pet
 
 
@@ -68,12 +73,13 @@ async def update_pet(
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> Pet:
-    pet = await _get_user_pet(db, pet_id, user_id)
+    pet = await get_user_pet(db, pet_id, user_id)
     update_data = body.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(pet, field, value)
     await db.flush()
     await db.refresh(pet)
+    invalidate_pet(db, user_id, pet_id)
     return pet
 
 
@@ -83,16 +89,8 @@ async def delete_pet(
     user_id: str = Depends(ensure_db_user),
     db: AsyncSession = Depends(get_db),
 ) -> None:
-    pet = await _get_user_pet(db, pet_id, user_id)
+    pet = await get_user_pet(db, pet_id, user_id)
+    # Archived logs live outside the database; the cascade can't reach them
+    await purge_archived_pets(db, [pet_id])
     await db.delete(pet)
-
-
-async def _get_user_pet(db: AsyncSession, pet_id: uuid.UUID, user_id: str) -> Pet:
-    """Fetch a pet owned by the given user, or raise 404."""
-    result = await db.execute(
-        select(Pet).where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
-    )
-    pet = result.scalar_one_or_none()
-    if pet is None:
-        raise NotFoundException(f"Pet {pet_id}")
-    return pet
+    invalidate_pet(db, user_id, pet_id)
@@ -1,194 +1,205 @@
-"""Progress and stats endpoints for behavior trend visualization."""
+"""Progress and stats endpoints for behavior trend visualization.
+
+Everything here reads rollups kept current by triggers on ``abc_logs`` --
+``pet_daily_stats`` per day, ``pet_period_stats`` per week and month --
+rather than aggregating raw logs. Time series pick their resolution from
+the range, so a chart reads at most a few hundred small rows however many
+years it covers. Archived months keep their rollup rows, so all-time
+figures include them. The dashboard's figures come from
+``app.services.pet_stats`` and are cached per data version; ``/household``
+serves every pet's card from one grouped query (``app.services.household``).
+``/forecast`` projects daily counts two weeks ahead (``app.services.forecast``).
+Every endpoint answers ``If-None-Match`` from the pet's data version
+(``app.core.etag``) before running any of its own queries.
+"""
 
 import uuid
-from datetime import UTC, datetime, timedelta
+from collections import Counter
+from datetime import UTC, date, datetime, timedelta
+from typing import Literal
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import Date, cast, func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import NotFoundException
+from app.core.cache import cached, pet_tag, user_tag
+from app.core.etag import household_data_version, pet_data_version
+from app.core.exceptions import ValidationException
 from app.core.security import ensure_db_user
+from app.core.singleflight import single_flight
 from app.db.session import get_db
-from app.models.abc_log import ABCLog
-from app.models.pet import Pet
+from app.models.daily_stats import PetDailyStats
+from app.services.forecast import HORIZON_DAYS, MIN_HISTORY_DAYS, get_forecast
+from app.services.household import SPARKLINE_DAYS, load_household
+from app.services.pattern_detection import MIN_LOGS_FOR_PATTERNS
+from app.services.pet_stats import get_pet_stats
+from app.services.series import Resolution, load_series
 
 router = APIRouter()
 
+# Ten years; long ranges are served at week or month resolution
+MAX_SERIES_DAYS = 3660
 
-async def _verify_pet_ownership(db: AsyncSession, pet_id: uuid.UUID, user_id: str) -> None:
-    result = await db.execute(
-        select(Pet).where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
-    )
-    if result.scalar_one_or_none() is None:
-        raise NotFoundException(f"Pet {pet_id}")
+
+def _today() -> date:
+    return datetime.now(UTC).date()
+
+
+def _since(days: int) -> date:
+    return _today() - timedelta(days=days)
+
+
+def _ranked(counts: Counter[str]) -> list[dict]:
+    return [
+        {"category": category, "count": count}
+        for category, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
 
 
 @router.get("/frequency")
+@cached("progress:frequency", tags=lambda kw: [pet_tag(kw["pet_id"])])
 async def behavior_frequency(
     pet_id: uuid.UUID = Query(...),
-    days: int = Query(30, ge=7, le=90),
-    user_id: str = Depends(ensure_db_user),
+    days: int = Query(30, ge=7, le=MAX_SERIES_DAYS),
+    resolution: Resolution | Literal["auto"] = Query("auto"),
+    _version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    """Daily behavior log counts for the past N days. Data for line/bar charts."""
-    await _verify_pet_ownership(db, pet_id, user_id)
-    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
-    result = await db.execute(
-        select(
-            cast(ABCLog.occurred_at, Date).label("date"),
-            func.count().label("count"),
-        )
-        .where(ABCLog.pet_id == pet_id, ABCLog.occurred_at >= cutoff)
-        .group_by(cast(ABCLog.occurred_at, Date))
-        .order_by(cast(ABCLog.occurred_at, Date))
-    )
-    data = [{"date": str(r.date), "count": r.count} for r in result.all()]
-    return {"pet_id": str(pet_id), "days": days, "data": data}
+    """Behavior log counts per day, week or month over the past N days, gaps
+    filled with zeros. Data for line/bar charts."""
+    resolution, points = await load_series(db, pet_id, _today(), days, resolution)
+    data = [{"date": str(p.bucket), "count": p.log_count} for p in points]
+    return {"pet_id": str(pet_id), "days": days, "resolution": resolution, "data": data}
 
 
 @router.get("/severity-trend")
+@cached("progress:severity-trend", tags=lambda kw: [pet_tag(kw["pet_id"])])
 async def severity_trend(
     pet_id: uuid.UUID = Query(...),
-    days: int = Query(30, ge=7, le=90),
-    user_id: str = Depends(ensure_db_user),
+    days: int = Query(30, ge=7, le=MAX_SERIES_DAYS),
+    resolution: Resolution | Literal["auto"] = Query("auto"),
+    _version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    """Daily average severity for the past N days. Data for line charts."""
-    await _verify_pet_ownership(db, pet_id, user_id)
-    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
-    result = await db.execute(
-        select(
-            cast(ABCLog.occurred_at, Date).label("date"),
-            func.avg(ABCLog.behavior_severity).label("avg_severity"),
-            func.max(ABCLog.behavior_severity).label("max_severity"),
-        )
-        .where(ABCLog.pet_id == pet_id, ABCLog.occurred_at >= cutoff)
-        .group_by(cast(ABCLog.occurred_at, Date))
-        .order_by(cast(ABCLog.occurred_at, Date))
-    )
+    """Average and max severity per day, week or month over the past N days;
+    buckets without logs are null. Data for line charts."""
+    resolution, points = await load_series(db, pet_id, _today(), days, resolution)
     data = [
-        {
-            "date": str(r.date),
-            "avg_severity": round(float(r.avg_severity), 1),
-            "max_severity": r.max_severity,
-        }
-        for r in result.all()
+        {"date": str(p.bucket), "avg_severity": p.severity_avg, "max_severity": p.severity_max}
+        for p in points
     ]
-    return {"pet_id": str(pet_id), "days": days, "data": data}
+    return {"pet_id": str(pet_id), "days": days, "resolution": resolution, "data": data}
 
 
 @router.get("/category-breakdown")
+@cached("progress:category-breakdown", tags=lambda kw: [pet_tag(kw["pet_id"])])
+@single_flight("progress:category-breakdown")
 async def category_breakdown(
     pet_id: uuid.UUID = Query(...),
     days: int = Query(30, ge=7, le=90),
-    user_id: str = Depends(ensure_db_user),
+    _version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Breakdown of behavior and antecedent categories. Data for pie/donut charts."""
-    await _verify_pet_ownership(db, pet_id, user_id)
-    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
-
-    behaviors = await db.execute(
-        select(
-            ABCLog.behavior_category,
-            func.count().label("count"),
-        )
-        .where(ABCLog.pet_id == pet_id, ABCLog.occurred_at >= cutoff)
-        .group_by(ABCLog.behavior_category)
-        .order_by(func.count().desc())
-    )
-    antecedents = await db.execute(
-        select(
-            ABCLog.antecedent_category,
-            func.count().label("count"),
-        )
-        .where(ABCLog.pet_id == pet_id, ABCLog.occurred_at >= cutoff)
-        .group_by(ABCLog.antecedent_category)
-        .order_by(func.count().desc())
-    )
-    consequences = await db.execute(
+    result = await db.execute(
         select(
-            ABCLog.consequence_category,
-            func.count().label("count"),
-        )
-        .where(ABCLog.pet_id == pet_id, ABCLog.occurred_at >= cutoff)
-        .group_by(ABCLog.consequence_category)
-        .order_by(func.count().desc())
+            PetDailyStats.behavior_counts,
+            PetDailyStats.antecedent_counts,
+            PetDailyStats.consequence_counts,
+        ).where(PetDailyStats.pet_id == pet_id, PetDailyStats.day >= _since(days))
     )
+    behaviors: Counter[str] = Counter()
+    antecedents: Counter[str] = Counter()
+    consequences: Counter[str] = Counter()
+    for r in result.all():
+        behaviors.update(r.behavior_counts)
+        antecedents.update(r.antecedent_counts)
+        consequences.update(r.consequence_counts)
 
     return {
         "pet_id": str(pet_id),
         "days": days,
-        "behaviors": [{"category": r.behavior_category, "count": r.count} for r in behaviors.all()],
-        "antecedents": [
-            {"category": r.antecedent_category, "count": r.count} for r in antecedents.all()
-        ],
-        "consequences": [
-            {"category": r.consequence_category, "count": r.count} for r in consequences.all()
-        ],
+        "behaviors": _ranked(behaviors),
+        "antecedents": _ranked(antecedents),
+        "consequences": _ranked(consequences),
     }
 
 
 @router.get("/dashboard")
 async def pet_dashboard(
     pet_id: uuid.UUID = Query(...),
-    user_id: str = Depends(ensure_db_user),
+    version: int = Depends(pet_data_version),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Combined dashboard data: total logs, recent trend, top patterns."""
-    await _verify_pet_ownership(db, pet_id, user_id)
-
-    # Total logs
-    total_result = await db.execute(
-        select(func.count()).select_from(ABCLog).where(ABCLog.pet_id == pet_id)
-    )
-    total_logs = total_result.scalar()
+    stats = await get_pet_stats(db, pet_id, version)
+    return {
+        "pet_id": str(pet_id),
+        "total_logs": stats.total_logs,
+        "recent_7d": stats.recent_7d,
+        "previous_7d": stats.previous_7d,
+        "trend_pct": stats.trend_pct,
+        "avg_severity": round(stats.severity_avg, 1) if stats.severity_avg else None,
+        # Pattern detection readiness
+        "pattern_detection_ready": stats.total_logs >= MIN_LOGS_FOR_PATTERNS,
+    }
 
-    # Last 7 days vs previous 7 days (trend direction)
-    now = datetime.now(UTC).replace(tzinfo=None)
-    week_ago = now - timedelta(days=7)
-    two_weeks_ago = now - timedelta(days=14)
 
-    recent = await db.execute(
-        select(func.count())
-        .select_from(ABCLog)
-        .where(ABCLog.pet_id == pet_id, ABCLog.occurred_at >= week_ago)
-    )
-    previous = await db.execute(
-        select(func.count())
-        .select_from(ABCLog)
-        .where(
-            ABCLog.pet_id == pet_id,
-            ABCLog.occurred_at >= two_weeks_ago,
-            ABCLog.occurred_at < week_ago,
+@router.get("/forecast")
+async def behavior_forecast(
+    pet_id: uuid.UUID = Query(...),
+    version: int = Depends(pet_data_version),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Expected daily log counts over the next two weeks, with ~90% intervals,
+    and whether the trend is improving. Refitted only when new data arrives."""
+    today = _today()
+    forecast = await get_forecast(db, pet_id, version, today)
+    if forecast is None:
+        raise ValidationException(
+            f"Need at least {MIN_HISTORY_DAYS} days of logs to forecast. Keep logging!"
         )
-    )
-    recent_count = recent.scalar()
-    previous_count = previous.scalar()
-
-    if previous_count > 0:
-        trend_pct = round(((recent_count - previous_count) / previous_count) * 100, 1)
-    elif recent_count > 0:
-        trend_pct = 100.0
-    else:
-        trend_pct = 0.0
-
-    # Average severity
-    avg_sev = await db.execute(
-        select(func.avg(ABCLog.behavior_severity)).where(ABCLog.pet_id == pet_id)
-    )
+    return {
+        "pet_id": str(pet_id),
+        "horizon_days": HORIZON_DAYS,
+        "trend": forecast.trend,
+        "weekly_change_pct": forecast.weekly_change_pct,
+        "data": [
+            {"date": str(today + timedelta(days=i)), "expected": e, "lower": lo, "upper": hi}
+            for i, (e, lo, hi) in enumerate(
+                zip(forecast.expected, forecast.lower, forecast.upper, strict=True)
+            )
+        ],
+    }
 
-    # Pattern detection readiness
-    pattern_ready = total_logs >= 10
 
-    avg_val = avg_sev.scalar()
+@router.get("/household")
+@cached("progress:household", tags=lambda kw: [user_tag(kw["user_id"])])
+async def household_dashboard(
+    _version: str = Depends(household_data_version),
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Dashboard figures, a daily sparkline and unread insight counts for
+    all of the user's pets, in one query."""
+    today = _today()
+    pets = await load_household(db, uuid.UUID(user_id), today)
     return {
-        "pet_id": str(pet_id),
-        "total_logs": total_logs,
-        "recent_7d": recent_count,
-        "previous_7d": previous_count,
-        "trend_pct": trend_pct,
-        "avg_severity": round(float(avg_val), 1) if avg_val else None,
-        "pattern_detection_ready": pattern_ready,
+        "sparkline_start": str(today - timedelta(days=SPARKLINE_DAYS - 1)),
+        "pets": [
+            {
+                "pet_id": str(pet.pet_id),
+                "name": pet.name,
+                "species": pet.species,
+                "total_logs": pet.total_logs,
+                "recent_7d": pet.recent_7d,
+                "previous_7d": pet.previous_7d,
+                "trend_pct": pet.trend_pct,
+                "avg_severity": round(pet.severity_avg, 1) if pet.severity_avg else None,
+                "pattern_detection_ready": pet.total_logs >= MIN_LOGS_FOR_PATTERNS,
+                "sparkline": pet.sparkline,
+                "unread_insights": pet.unread_insights,
+            }
+            for pet in pets
+        ],
     }
@@ -0,0 +1,126 @@
+"""Delta sync endpoint -- the change feed for offline-capable clients."""
+
+import uuid
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.pagination import decode_change_cursor, encode_change_cursor
+from app.core.security import ensure_db_user
+from app.db.session import get_db
+from app.models.abc_log import ABCLog
+from app.models.insight import Insight
+from app.models.pet import Pet
+from app.models.sync import SyncTombstone
+from app.schemas.abc_log import ABCLogResponse
+from app.schemas.insight import InsightResponse
+from app.schemas.pet import PetResponse
+from app.schemas.sync import SyncChanges, SyncDeletion
+
+router = APIRouter()
+
+
+# Every transaction below ``settled_xid`` has committed or aborted; tombstones
+# up to the horizon have been pruned
+_FEED_BOUNDS_SQL = text(
+    "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS settled_xid, "
+    "h.change_xid, h.change_seq "
+    "FROM (SELECT 1) AS one LEFT JOIN sync_tombstone_horizon h ON true"
+)
+
+
+def _key(row) -> tuple[int, int]:
+    return row.change_xid, row.change_seq
+
+
+async def _changed_since(
+    db: AsyncSession,
+    model,
+    user_id: uuid.UUID,
+    since: tuple[int, int],
+    settled_xid: int,
+    limit: int,
+):
+    result = await db.execute(
+        select(model)
+        .where(
+            model.user_id == user_id,
+            tuple_(model.change_xid, model.change_seq) > since,
+            model.change_xid < settled_xid,
+        )
+        .order_by(model.change_xid, model.change_seq)
+        .limit(limit + 1)
+    )
+    return list(result.scalars().all())
+
+
+@router.get("/changes", response_model=SyncChanges)
+async def get_changes(
+    cursor: str | None = Query(None),
+    limit: int = Query(500, ge=1, le=2000),
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> SyncChanges:
+    """Return pets, ABC logs and insights changed since ``cursor``, plus deletions.
+
+    Every insert and update on a synced table records its transaction id
+    and the next value of one shared ``change_seq``, and deletes leave a
+    tombstone doing the same, so a cursor is a ``(change_xid, change_seq)``
+    position and each call reads only the ``(user_id, change_xid,
+    change_seq)`` index ranges past it. Omit ``cursor`` for a full initial
+    sync; keep calling with ``next_cursor`` while ``has_more`` is true.
+
+    Tombstones are kept for ``SYNC_TOMBSTONE_RETENTION_DAYS``. A cursor from
+    before the newest pruned one may have missed deletions: the feed then
+    starts over from the beginning with ``reset`` set, and the client must
+    replace its local copy with what it receives instead of merging.
+
+    Clients apply upserts and deletions in any order within a page: a row
+    appears at most once, with its latest state. Only changes from
+    transactions older than every transaction still open are served. A
+    sequence value is taken at write time and may commit after higher ones
+    have been read, but a transaction still open has a higher id than any
+    change served so far, so it can't land behind a client's cursor. Any
+    open writing transaction holds later changes back until it ends, so bulk
+    writes bound theirs (see ``bound_bulk_write``).
+    """
+    uid = uuid.UUID(user_id)
+    xid, seq, full = decode_change_cursor(cursor) if cursor else (0, 0, True)
+    since = (xid, seq)
+    bounds = (await db.execute(_FEED_BOUNDS_SQL)).one()
+    settled_xid = bounds.settled_xid
+    reset = (
+        not full
+        and bounds.change_xid is not None
+        and since < (bounds.change_xid, bounds.change_seq)
+    )
+    if reset:
+        since, full = (0, 0), True
+
+    pets = await _changed_since(db, Pet, uid, since, settled_xid, limit)
+    logs = await _changed_since(db, ABCLog, uid, since, settled_xid, limit)
+    insights = await _changed_since(db, Insight, uid, since, settled_xid, limit)
+    tombstones = await _changed_since(db, SyncTombstone, uid, since, settled_xid, limit)
+
+    # Each table returned its lowest ``limit + 1`` changes, so the page is the
+    # lowest ``limit`` of the merged set; cut every table at the same key.
+    # A caught-up client moves on to the settled point, so its cursor keeps
+    # pace with the tombstone horizon even when it has nothing to sync.
+    keys = sorted(_key(row) for rows in (pets, logs, insights, tombstones) for row in rows)
+    has_more = len(keys) > limit
+    upto = keys[limit - 1] if has_more else max(since, (settled_xid, 0))
+
+    return SyncChanges(
+        pets=[PetResponse.model_validate(p) for p in pets if _key(p) <= upto],
+        abc_logs=[ABCLogResponse.model_validate(log) for log in logs if _key(log) <= upto],
+        insights=[InsightResponse.model_validate(i) for i in insights if _key(i) <= upto],
+        deleted=[
+            SyncDeletion(table=t.table_name, id=t.row_id, deleted_at=t.deleted_at)
+            for t in tombstones
+            if _key(t) <= upto
+        ],
+        next_cursor=encode_change_cursor(*upto, full=full and has_more),
+        has_more=has_more,
+        reset=reset,
+    )
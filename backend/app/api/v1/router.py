@@ -1,12 +1,15 @@
 from fastapi import APIRouter
 
 from app.api.v1.endpoints.abc_logs import router as abc_logs_router
+from app.api.v1.endpoints.admin import router as admin_router
 from app.api.v1.endpoints.analysis import router as analysis_router
 from app.api.v1.endpoints.auth import router as auth_router
+from app.api.v1.endpoints.exports import router as exports_router
 from app.api.v1.endpoints.health import router as health_router
 from app.api.v1.endpoints.insights import router as insights_router
 from app.api.v1.endpoints.pets import router as pets_router
 from app.api.v1.endpoints.progress import router as progress_router
+from app.api.v1.endpoints.sync import router as sync_router
 
 v1_router = APIRouter()
 
@@ -17,3 +20,6 @@ v1_router.include_router(abc_logs_router, prefix="/abc-logs", tags=["abc-logs"])
 v1_router.include_router(insights_router, tags=["insights"])
 v1_router.include_router(analysis_router, prefix="/analysis", tags=["analysis"])
 v1_router.include_router(progress_router, prefix="/progress", tags=["progress"])
+v1_router.include_router(sync_router, prefix="/sync", tags=["sync"])
+v1_router.include_router(exports_router, prefix="/exports", tags=["exports"])
+v1_router.include_router(admin_router, prefix="/admin", tags=["admin"])
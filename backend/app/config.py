@@ -21,17 +21,51 @@ class Settings(BaseSettings):
 
     # AI
     ANTHROPIC_API_KEY: str = ""
+    ANTHROPIC_BASE_URL: str = ""  # Override for local stub servers
+    BIP_BATCH_POLL_SECONDS: int = 60
+
+    # Coaching answer cache (in front of the LLM)
+    COACHING_CACHE_ENABLED: bool = True
+    COACHING_CACHE_MAX_ENTRIES: int = 2000
+    COACHING_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    COACHING_CACHE_MIN_SIMILARITY: float = 0.7
+    COACHING_FAQ_PATH: str = ""
 
     # Redis / Celery
     REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1.0
+
+    # Two-tier (in-process LRU + Redis) cache for read endpoints
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    # Idempotency-Key replay window, and how long an in-flight request's key
+    # outlives its last heartbeat (it is renewed while the request runs)
+    IDEMPOTENCY_TTL_SECONDS: int = 24 * 3600
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+
+    # Bulk writes (imports, archiving) hold back the sync feed while their
+    # transaction is open; each statement, and each pause between them, is capped
+    BULK_WRITE_STATEMENT_TIMEOUT_SECONDS: int = 120
+    BULK_WRITE_IDLE_TIMEOUT_SECONDS: int = 30
+
+    # Deletions are reported to sync clients for this long; older cursors resync
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+
+    # Cold-tier archive of old ABC logs: a local path, file:// or s3:// URI.
+    # Empty disables archiving.
+    ARCHIVE_URI: str = ""
+    ARCHIVE_AFTER_MONTHS: int = 24
 
     # Application
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "DEBUG"
     CORS_ORIGINS: list[str] = ["http://localhost:8081", "http://localhost:19006"]
+    ADMIN_USER_IDS: list[str] = []
     APP_VERSION: str = "0.1.0"
 
-    @field_validator("CORS_ORIGINS", mode="before")
+    @field_validator("CORS_ORIGINS", "ADMIN_USER_IDS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: str | list[str]) -> list[str]:
         if isinstance(v, str):
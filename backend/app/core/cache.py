@@ -0,0 +1,273 @@
+"""Two-tier response cache with tag-based invalidation.
+
+Read endpoints wrapped with ``@cached`` keep their encoded result in a
+bounded in-process LRU and in Redis, shared across API replicas. Every
+entry carries tags -- ``user:<id>``, ``pet:<id>`` -- and each tag has a
+generation counter in Redis. The generations of an entry's tags are part
+of its key, so invalidating a tag is one ``INCR``: every entry tagged with
+it, in every process and in Redis, stops being addressable at once and
+ages out through the LRU and TTL instead of being hunted down. Writers
+invalidate once their transaction commits (``invalidate_on_commit``): a
+read between an earlier bump and the commit would store the old rows under
+the new generations.
+
+A lookup costs one ``MGET`` of the tag generations, then the local LRU, then
+a Redis ``GET``. The key also holds the UTC day and the endpoint's
+parameters, including the data version from ``app.core.etag``, so per-pet
+entries go stale even when a worker or import writes without invalidating.
+If Redis is unreachable, requests are computed uncached.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import UTC, date, datetime
+from typing import Any
+
+from fastapi import BackgroundTasks, Request, Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.redis import get_redis
+from app.db.session import after_commit
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "cache:"
+# Session.info key for the tags a transaction will invalidate on commit
+_PENDING_TAGS = "cache_invalidations"
+TAG_PREFIX = "cache-tag:"
+# Generations must outlive every entry keyed on them; a counter that expired
+# and restarted at 0 could readdress an old entry.
+TAG_TTL_SECONDS = 7 * 24 * 3600
+
+# Parameter types that identify a request
+_KEY_TYPES = (str, int, float, bool, uuid.UUID, date, type(None))
+# Structured parameters also identify it; they're keyed on canonical JSON
+_STRUCTURED_KEY_TYPES = (list, tuple, dict, BaseModel)
+# Per-request plumbing, never part of the key
+_CONTEXT_TYPES = (AsyncSession, Request, Response, BackgroundTasks)
+
+
+def user_tag(user_id: str | uuid.UUID) -> str:
+    return f"user:{user_id}"
+
+
+def pet_tag(pet_id: str | uuid.UUID) -> str:
+    return f"pet:{pet_id}"
+
+
+@dataclass
+class CacheMetrics:
+    local_hits: int = 0
+    remote_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    errors: int = 0
+
+
+class LocalLRU:
+    """Bounded map of key -> encoded value, each entry expiring after a TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: str, value: bytes, ttl_seconds: int | None = None) -> int:
+        """Store ``value``; returns how many entries were evicted to make room."""
+        expires = time.monotonic() + min(ttl_seconds or self.ttl_seconds, self.ttl_seconds)
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = settings.RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: int = settings.RESPONSE_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.local = LocalLRU(max_entries, ttl_seconds)
+        self.metrics = CacheMetrics()
+
+    async def get_or_compute(
+        self,
+        key: str,
+        tags: Iterable[str],
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = jsonable_encoder,
+        ttl_seconds: int | None = None,
+    ) -> Any:
+        """The cached value for ``key`` under the current tag generations, or
+        ``encode(await compute())`` stored in both tiers."""
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return encode(await compute())
+        ttl_seconds = ttl_seconds or self.ttl_seconds
+        redis = get_redis()
+        tags = sorted(set(tags))
+        try:
+            generations = await redis.mget([TAG_PREFIX + tag for tag in tags]) if tags else []
+        except RedisError as exc:
+            self.metrics.errors += 1
+            logger.warning("Response cache unavailable; computing uncached: %s", exc)
+            return encode(await compute())
+        full_key = KEY_PREFIX + key + ":" + ".".join((g or b"0").decode() for g in generations)
+
+        raw = self.local.get(full_key)
+        if raw is not None:
+            self.metrics.local_hits += 1
+            return json.loads(raw)
+        try:
+            raw = await redis.get(full_key)
+        except RedisError as exc:
+            self.metrics.errors += 1
+            logger.warning("Response cache read failed: %s", exc)
+        if raw is not None:
+            self.metrics.remote_hits += 1
+            self.metrics.evictions += self.local.put(full_key, raw, ttl_seconds)
+            return json.loads(raw)
+
+        self.metrics.misses += 1
+        value = encode(await compute())
+        raw = json.dumps(value, separators=(",", ":")).encode()
+        try:
+            await redis.set(full_key, raw, ex=ttl_seconds)
+        except RedisError as exc:
+            self.metrics.errors += 1
+            logger.warning("Response cache write failed: %s", exc)
+        self.metrics.evictions += self.local.put(full_key, raw, ttl_seconds)
+        return value
+
+    async def invalidate(self, *tags: str) -> None:
+        """Make every entry tagged with any of ``tags`` unreachable, everywhere."""
+        if not tags:
+            return
+        self.metrics.invalidations += len(tags)
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(TAG_PREFIX + tag)
+                    pipe.expire(TAG_PREFIX + tag, TAG_TTL_SECONDS)
+                await pipe.execute()
+        except RedisError as exc:
+            # Entries keyed on data versions still go stale; others live out their TTL
+            self.metrics.errors += 1
+            logger.warning("Response cache invalidation failed for %s: %s", tags, exc)
+
+    def stats(self) -> dict:
+        return {**asdict(self.metrics), "local_entries": len(self.local)}
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_on_commit(db: AsyncSession, *tags: str) -> None:
+    """Invalidate ``tags`` once ``db``'s transaction commits."""
+    pending = db.info.get(_PENDING_TAGS)
+    if pending is None:
+        pending = db.info[_PENDING_TAGS] = set()
+        after_commit(db, lambda: response_cache.invalidate(*sorted(db.info.pop(_PENDING_TAGS))))
+    pending.update(tags)
+
+
+def invalidate_pet(db: AsyncSession, user_id: str | uuid.UUID, pet_id: str | uuid.UUID) -> None:
+    """Invalidate, on commit, after a write to a pet or anything derived from its logs."""
+    invalidate_on_commit(db, user_tag(user_id), pet_tag(pet_id))
+
+
+def request_key(namespace: str, kwargs: dict[str, Any]) -> str:
+    """``namespace`` plus a digest of an endpoint call's identifying parameters.
+
+    Every argument counts except sessions, requests and the like, plus the
+    UTC day: results relative to "today" roll over at midnight. Lists, dicts
+    and Pydantic models are encoded as sorted-key JSON; any other type raises
+    ``TypeError`` rather than being left out of the key, where two different
+    requests would share an entry.
+    """
+    params: dict[str, Any] = {}
+    for name, value in kwargs.items():
+        if isinstance(value, _CONTEXT_TYPES):
+            continue
+        if isinstance(value, _STRUCTURED_KEY_TYPES):
+            value = jsonable_encoder(value)
+        elif not isinstance(value, _KEY_TYPES):
+            raise TypeError(
+                f"{namespace}: can't key on parameter {name!r} of type {type(value).__name__}"
+            )
+        params[name] = value
+    params["_day"] = datetime.now(UTC).date()
+    digest = hashlib.sha1(
+        json.dumps(params, default=str, sort_keys=True).encode(), usedforsecurity=False
+    )
+    return f"{namespace}:{digest.hexdigest()}"
+
+
+def cached(
+    namespace: str,
+    *,
+    tags: Callable[[dict[str, Any]], Iterable[str]],
+    model: Any = None,
+    ttl_seconds: int | None = None,
+) -> Callable:
+    """Cache an endpoint's result, keyed on its parameters (see ``request_key``).
+
+    ``tags`` maps the endpoint's keyword arguments to the entry's tags.
+    ``model`` is the response model for endpoints that return ORM objects;
+    the cached value is its JSON form, which FastAPI validates as usual.
+    """
+    if model is not None:
+        adapter = TypeAdapter(model)
+
+        def encode(value: Any) -> Any:
+            return adapter.dump_python(
+                adapter.validate_python(value, from_attributes=True), mode="json"
+            )
+    else:
+        encode = jsonable_encoder
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            return await response_cache.get_or_compute(
+                request_key(namespace, kwargs),
+                tags(kwargs),
+                lambda: func(**kwargs),
+                encode,
+                ttl_seconds,
+            )
+
+        return wrapper
+
+    return decorator
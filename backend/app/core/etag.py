@@ -0,0 +1,98 @@
+"""Weak ETags and conditional GETs keyed on per-pet data versions.
+
+Every per-pet read endpoint derives from the pet's logs, insights and
+profile, and ``pet_data_versions`` is bumped by triggers whenever any of
+those change. The ETag is the pet's version plus the UTC day (windows such
+as "last 7 days" move at midnight even when nothing is written), so a
+client that sends it back in ``If-None-Match`` gets ``304`` after one
+indexed lookup -- the same query that checks ownership -- and none of the
+endpoint's own queries run.
+"""
+
+import hashlib
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundException, NotModifiedException
+from app.core.security import ensure_db_user
+from app.db.session import get_db
+from app.models.data_version import PetDataVersion
+from app.models.pet import Pet
+
+
+def weak_etag(*parts: object) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+def _conditional(request: Request, response: Response, etag: str) -> None:
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModifiedException(etag)
+    response.headers["ETag"] = etag
+
+
+async def pet_data_version(
+    pet_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> int:
+    """Dependency for per-pet reads: checks ownership, answers ``If-None-Match``.
+
+    Returns the pet's data version for endpoints that cache on it. Raises
+    ``NotFoundException`` if the pet is not the user's, and
+    ``NotModifiedException`` if the client's copy is current.
+    """
+    result = await db.execute(
+        select(PetDataVersion.version)
+        .select_from(Pet)
+        .outerjoin(PetDataVersion, PetDataVersion.pet_id == Pet.id)
+        .where(Pet.id == pet_id, Pet.user_id == uuid.UUID(user_id))
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise NotFoundException(f"Pet {pet_id}")
+    version = row.version or 0
+    _conditional(request, response, weak_etag(pet_id, version, f"{datetime.now(UTC):%Y%m%d}"))
+    return version
+
+
+async def household_data_version(
+    request: Request,
+    response: Response,
+    user_id: str = Depends(ensure_db_user),
+    db: AsyncSession = Depends(get_db),
+) -> str:
+    """Like ``pet_data_version`` over all of the user's pets.
+
+    The ETag digests every (pet, version) pair, so adding or removing a pet
+    changes it as well as any write to an existing one. Returns the digest.
+    """
+    result = await db.execute(
+        select(Pet.id, PetDataVersion.version)
+        .outerjoin(PetDataVersion, PetDataVersion.pet_id == Pet.id)
+        .where(Pet.user_id == uuid.UUID(user_id))
+        .order_by(Pet.id)
+    )
+    digest = hashlib.sha1(usedforsecurity=False)
+    for pet_id, version in result.all():
+        digest.update(f"{pet_id}:{version or 0};".encode())
+    household_version = digest.hexdigest()[:16]
+    _conditional(request, response, weak_etag(household_version, f"{datetime.now(UTC):%Y%m%d}"))
+    return household_version
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 
 class PawLogicException(Exception):
@@ -38,6 +38,14 @@ class RateLimitException(PawLogicException):
         super().__init__(message=message, status_code=429)
 
 
+class NotModifiedException(PawLogicException):
+    """The client's cached copy (by ``If-None-Match``) is current."""
+
+    def __init__(self, etag: str) -> None:
+        self.etag = etag
+        super().__init__(message="Not modified", status_code=304)
+
+
 def register_exception_handlers(app: FastAPI) -> None:
     @app.exception_handler(PawLogicException)
     async def pawlogic_exception_handler(request: Request, exc: PawLogicException) -> JSONResponse:
@@ -45,3 +53,8 @@ def register_exception_handlers(app: FastAPI) -> None:
             status_code=exc.status_code,
             content={"detail": exc.message},
         )
+
+    @app.exception_handler(NotModifiedException)
+    async def not_modified_handler(request: Request, exc: NotModifiedException) -> Response:
+        # A 304 carries no body
+        return Response(status_code=304, headers={"ETag": exc.etag})
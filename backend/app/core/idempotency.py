@@ -0,0 +1,242 @@
+"""Idempotency-Key support for retried writes.
+
+Mobile clients on flaky networks retry POSTs whose responses they never
+saw. When a request to one of ``IDEMPOTENT_PATHS`` carries an
+``Idempotency-Key`` header, the first response for that (user, key) is kept
+in Redis, and later requests with the same key are answered from it without
+reaching the handler -- no second log row, no second model call.
+
+The key is claimed with ``SET NX`` before the handler runs, holding a token
+unique to the request. While the handler runs, a heartbeat renews the claim
+every third of ``IDEMPOTENCY_LOCK_SECONDS``, so a long coaching stream or
+import keeps it however long it takes; the expiry only frees keys of workers
+that died. A duplicate that arrives while the original is still in flight
+gets ``409`` with ``Retry-After`` instead of repeating the work; reusing a
+key for a different request body is rejected with ``422``. If Redis is
+unreachable, requests are processed normally.
+"""
+
+import asyncio
+import base64
+import contextlib
+import hashlib
+import json
+import logging
+import uuid
+
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.core.exceptions import PawLogicException
+from app.core.redis import get_redis
+from app.middleware.auth import verify_jwt
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY_BYTES = 1024 * 1024
+
+IDEMPOTENT_PATHS = frozenset(
+    {"/api/v1/abc-logs", "/api/v1/abc-logs/batch", "/api/v1/analysis/coaching"}
+)
+
+# Responses a client should be able to retry with the same key
+_UNSTORED_STATUSES = frozenset({401, 408, 409, 429})
+_IN_FLIGHT = b"in-flight"
+
+# Renew or release the claim only while this request still holds it
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _user_id(headers: Headers) -> str | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_jwt(token)["sub"]
+    except PawLogicException:
+        return None
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay_body(body: bytes, receive: Receive) -> Receive:
+    """A ``receive`` that yields the already-read body, then defers to the server."""
+    sent = False
+
+    async def wrapped() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return wrapped
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp, paths: frozenset[str] = IDEMPOTENT_PATHS) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get(IDEMPOTENCY_HEADER)
+        user_id = _user_id(headers) if key is not None else None
+        if user_id is None:
+            # No key, or unauthenticated (the endpoint will reject it)
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters"},
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        receive = _replay_body(body, receive)
+        fingerprint = hashlib.sha256(
+            b"\0".join((scope["path"].encode(), scope.get("query_string", b""), body))
+        ).hexdigest()
+        redis_key = f"idempotency:{user_id}:{key}"
+        claim = _IN_FLIGHT + b":" + uuid.uuid4().hex.encode()
+
+        try:
+            redis = get_redis()
+            claimed = await redis.set(
+                redis_key, claim, nx=True, ex=settings.IDEMPOTENCY_LOCK_SECONDS
+            )
+            stored = None if claimed else await redis.get(redis_key)
+        except RedisError as exc:
+            logger.warning("Idempotency store unavailable; processing request anyway: %s", exc)
+            await self.app(scope, receive, send)
+            return
+
+        if not claimed:
+            await self._answer_duplicate(stored, fingerprint, scope, receive, send)
+            return
+
+        status: int | None = None
+        response_headers: list[tuple[bytes, bytes]] = []
+        chunks: list[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        heartbeat = asyncio.create_task(self._renew(redis_key, claim))
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await heartbeat
+            await self._store(
+                redis_key, claim, fingerprint, status, response_headers, b"".join(chunks)
+            )
+
+    async def _renew(self, redis_key: str, claim: bytes) -> None:
+        """Keep the in-flight claim alive until cancelled."""
+        interval = settings.IDEMPOTENCY_LOCK_SECONDS / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await get_redis().eval(
+                    _RENEW_SCRIPT, 1, redis_key, claim, settings.IDEMPOTENCY_LOCK_SECONDS
+                )
+            except RedisError as exc:
+                logger.warning("Could not renew idempotency claim %s: %s", redis_key, exc)
+
+    async def _answer_duplicate(
+        self, stored: bytes | None, fingerprint: str, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if stored is None or stored.startswith(_IN_FLIGHT):
+            response = JSONResponse(
+                {"detail": f"A request with this {IDEMPOTENCY_HEADER} is already in progress"},
+                status_code=409,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        record = json.loads(stored)
+        if record["fingerprint"] != fingerprint:
+            response = JSONResponse(
+                {"detail": f"{IDEMPOTENCY_HEADER} was already used for a different request"},
+                status_code=422,
+            )
+            await response(scope, receive, send)
+            return
+
+        headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+        headers.append((REPLAYED_HEADER.lower().encode(), b"true"))
+        await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": base64.b64decode(record["body"])})
+
+    async def _store(
+        self,
+        redis_key: str,
+        claim: bytes,
+        fingerprint: str,
+        status: int | None,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+    ) -> None:
+        """Keep the response for replays, or release the key so a retry runs again."""
+        keep = (
+            status is not None
+            and status < 500
+            and status not in _UNSTORED_STATUSES
+            and len(body) <= MAX_STORED_BODY_BYTES
+        )
+        try:
+            redis = get_redis()
+            if not keep:
+                await redis.eval(_RELEASE_SCRIPT, 1, redis_key, claim)
+                return
+            record = {
+                "fingerprint": fingerprint,
+                "status": status,
+                "headers": [(k.decode("latin-1"), v.decode("latin-1")) for k, v in headers],
+                "body": base64.b64encode(body).decode(),
+            }
+            await redis.set(redis_key, json.dumps(record), ex=settings.IDEMPOTENCY_TTL_SECONDS)
+        except RedisError as exc:
+            logger.warning("Could not record idempotent response for %s: %s", redis_key, exc)
@@ -0,0 +1,26 @@
+"""Shared async Redis client for request-path features (idempotency, caching)."""
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+_client: aioredis.Redis | None = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Return the process-wide client; connections are pooled and opened lazily."""
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+    return _client
+
+
+async def close_redis() -> None:
+    global _client  # noqa: PLW0603
+    if _client is not None:
+        await _client.aclose()
+        _client = None
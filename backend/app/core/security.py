@@ -7,6 +7,8 @@ Provides:
   the verified JWT.
 - ``ensure_db_user`` -- FastAPI dependency that auto-provisions a user row
   on first request, using email from Supabase JWT claims when available.
+- ``require_admin`` -- FastAPI dependency that restricts an endpoint to the
+  user IDs listed in ``ADMIN_USER_IDS``.
 - ``create_dev_token`` -- Helper to mint JWTs for local development/testing.
 """
 
@@ -89,6 +91,19 @@ async def ensure_db_user(
     return user_id
 
 
+async def require_admin(
+    user_id: str = Depends(get_current_user),
+) -> str:
+    """FastAPI dependency that only admits users listed in ``ADMIN_USER_IDS``.
+
+    Raises:
+        ForbiddenException: If the authenticated user is not an admin.
+    """
+    if user_id not in settings.ADMIN_USER_IDS:
+        raise ForbiddenException("Admin access required")
+    return user_id
+
+
 def create_dev_token(user_id: str) -> str:
     """Create a signed JWT for local development and testing.
 
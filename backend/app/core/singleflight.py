@@ -0,0 +1,165 @@
+"""Single-flight coalescing of identical concurrent requests.
+
+The same expensive read often arrives several times at once -- one user on
+two devices, or duplicate effects in a frontend. Endpoints wrapped with
+``@single_flight`` share one in-flight computation per key (the endpoint's
+namespace plus its normalized parameters, as for ``app.core.cache``):
+the first caller runs it, and identical callers that arrive before it
+finishes await the same result, or the same exception.
+
+With ``distributed=True`` the flight also spans API replicas. The leader
+holds a short Redis lock while it computes and then publishes the
+JSON-encoded result for a few seconds; callers on other replicas poll for
+it instead of computing. They compute themselves if the leader disappears
+or Redis is unreachable. A published result can be served to a caller
+arriving just after the flight, so keep distributed flights to keys that
+include a data version or to work where a few seconds' reuse is harmless.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from redis.exceptions import RedisError
+
+from app.core.cache import request_key
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "flight-lock:"
+RESULT_PREFIX = "flight-result:"
+LOCK_SECONDS = 60
+RESULT_SECONDS = 5
+POLL_MAX_SECONDS = 0.2
+
+# Delete the lock only if this leader still holds it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class FlightMetrics:
+    leaders: int = 0
+    coalesced: int = 0
+    remote_coalesced: int = 0
+    errors: int = 0
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: dict[str, asyncio.Future] = {}
+        self.metrics = FlightMetrics()
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``compute`` unless a call with the same key is in flight; either
+        way, return that call's result."""
+        flight = self._flights.get(key)
+        if flight is None:
+            self.metrics.leaders += 1
+            flight = asyncio.ensure_future(compute())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.metrics.coalesced += 1
+        # A caller that goes away must not cancel the flight for the others
+        return await asyncio.shield(flight)
+
+    async def do_distributed(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any] = jsonable_encoder,
+    ) -> Any:
+        """Like ``do``, coalescing with identical calls on other replicas too.
+
+        Returns the encoded (JSON-compatible) result.
+        """
+        return await self.do(key, lambda: self._across_replicas(key, compute, encode))
+
+    async def _across_replicas(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any],
+    ) -> Any:
+        redis = get_redis()
+        lock_key, result_key = LOCK_PREFIX + key, RESULT_PREFIX + key
+        token = uuid.uuid4().hex
+        try:
+            leader = await redis.set(lock_key, token, nx=True, ex=LOCK_SECONDS)
+        except RedisError as exc:
+            self.metrics.errors += 1
+            logger.warning("Single-flight lock unavailable; computing locally: %s", exc)
+            return encode(await compute())
+
+        if leader:
+            try:
+                value = encode(await compute())
+                await redis.set(result_key, json.dumps(value), ex=RESULT_SECONDS)
+                return value
+            finally:
+                try:
+                    await redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+                except RedisError as exc:
+                    self.metrics.errors += 1
+                    logger.warning("Single-flight lock release failed: %s", exc)
+
+        deadline = time.monotonic() + LOCK_SECONDS
+        delay = 0.01
+        try:
+            while time.monotonic() < deadline:
+                raw = await redis.get(result_key)
+                if raw is not None:
+                    self.metrics.remote_coalesced += 1
+                    return json.loads(raw)
+                if not await redis.exists(lock_key):
+                    # The leader finished without publishing (it failed); don't wait on it
+                    break
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, POLL_MAX_SECONDS)
+        except RedisError as exc:
+            self.metrics.errors += 1
+            logger.warning("Single-flight result unavailable; computing locally: %s", exc)
+        return encode(await compute())
+
+    def stats(self) -> dict:
+        return {**asdict(self.metrics), "in_flight": len(self)}
+
+
+flights = SingleFlight()
+
+
+def single_flight(namespace: str, *, distributed: bool = False) -> Callable:
+    """Coalesce identical concurrent calls to an endpoint.
+
+    Parameters that decide access (the user, or a dependency that checked
+    ownership) must be part of the key or run before the endpoint, since
+    every caller gets the leader's result.
+    """
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(func)
+        async def wrapper(**kwargs: Any) -> Any:
+            key = request_key(namespace, kwargs)
+            if distributed:
+                return await flights.do_distributed(key, lambda: func(**kwargs))
+            return await flights.do(key, lambda: func(**kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,42 @@
+"""Lightweight text analysis shared by the coaching cache and history retrieval."""
+
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+_STOPWORDS = frozenset(
+    {
+        "a", "an", "and", "are", "as", "at", "be", "can", "do", "does", "for",
+        "from", "have", "how", "i", "in", "is", "it", "its", "me", "my", "of",
+        "on", "or", "she", "he", "so", "that", "the", "their", "them", "they",
+        "this", "to", "we", "what", "when", "where", "which", "who", "why",
+        "with", "you", "your", "our", "keep", "always", "still", "really", "her",
+        "his", "him",
+    }
+)  # fmt: skip
+
+
+def tokenize(text: str, pet_name: str | None = None) -> list[str]:
+    """Lowercase, tokenize and strip stopwords from free text.
+
+    The pet's name is replaced with a neutral token and trailing ``-ing`` and
+    plural ``s`` are dropped so "Why does Luna scratch couches" and "why does my cat
+    scratch the couch" normalize to overlapping terms.
+    """
+    text = text.lower()
+    if pet_name:
+        text = re.sub(rf"\b{re.escape(pet_name.lower())}\b", "pet", text)
+
+    tokens = []
+    for token in _TOKEN_RE.findall(text):
+        token = token.strip("'")
+        if token.endswith("'s"):
+            token = token[:-2]
+        if not token or token in _STOPWORDS:
+            continue
+        if len(token) > 5 and token.endswith("ing"):
+            token = token[:-3]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
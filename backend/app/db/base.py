@@ -1,5 +1,12 @@
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
 
+# Synced tables (pets, abc_logs, insights) take their change_seq from one
+# shared sequence, and record the writing transaction's id in change_xid.
+# The change feed is ordered by (change_xid, change_seq) across all of them.
+CHANGE_SEQ_DEFAULT = text("nextval('change_seq')")
+CHANGE_XID_DEFAULT = text("pg_current_xact_id()::text::bigint")
+
 
 class Base(DeclarativeBase):
     """SQLAlchemy declarative base for all PawLogic models."""
@@ -0,0 +1,53 @@
+"""Monthly range partitions of ``abc_logs``.
+
+Partitions are named ``abc_logs_pYYYYMM`` and are created by the
+``ensure_abc_logs_partition(date)`` SQL function (see the partitioning
+migration), which is a no-op for months that already exist. Rows outside
+every monthly partition land in ``abc_logs_default``; a month whose rows
+already sit there is left alone rather than failing, since creating the
+partition would require moving them.
+"""
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import Date, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# How far ahead of the current month partitions are kept ready
+PARTITION_MONTHS_AHEAD = 3
+
+_ENSURE_SQL = text(
+    "SELECT count(*) FILTER (WHERE created) "
+    "FROM unnest(:months) AS m, LATERAL ensure_abc_logs_partition(m) AS created"
+).bindparams(bindparam("months", type_=ARRAY(Date)))
+
+
+def partition_name(month: date) -> str:
+    return f"abc_logs_p{month:%Y%m}"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def ensure_partitions(db: AsyncSession, months: list[date]) -> int:
+    """Create any missing partitions for the months containing ``months``."""
+    if not months:
+        return 0
+    distinct = sorted({month_start(m) for m in months})
+    result = await db.execute(_ENSURE_SQL, {"months": distinct})
+    return result.scalar_one()
+
+
+async def ensure_future_partitions(
+    db: AsyncSession, months_ahead: int = PARTITION_MONTHS_AHEAD
+) -> int:
+    """Keep partitions ready from the current month through ``months_ahead``."""
+    current = month_start(datetime.now(UTC).date())
+    return await ensure_partitions(db, [add_months(current, n) for n in range(months_ahead + 1)])
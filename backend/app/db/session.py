@@ -1,5 +1,6 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -23,11 +24,46 @@ async_session_factory = async_sessionmaker(
 )
 
 
+_AFTER_COMMIT = "after_commit"
+
+
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """Run ``callback`` once ``session`` is committed through ``commit`` (as
+    ``get_db`` does); it is dropped if the session rolls back instead."""
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def commit(session: AsyncSession) -> None:
+    """Commit, then run the callbacks registered with ``after_commit``."""
+    await session.commit()
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        await callback()
+
+
 async def get_db() -> AsyncGenerator[AsyncSession]:
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
+            await commit(session)
         except Exception:
             await session.rollback()
             raise
+
+
+async def bound_bulk_write(session: AsyncSession) -> None:
+    """Cap each statement of ``session``'s transaction, and each pause between
+    them, at the ``BULK_WRITE_*`` timeouts.
+
+    An open writing transaction holds back every user's sync feed (see the
+    sync endpoint), so long imports and archive runs fail rather than stall it.
+    """
+    await session.execute(
+        text(
+            "SELECT set_config('statement_timeout', :statement, true), "
+            "set_config('idle_in_transaction_session_timeout', :idle, true)"
+        ),
+        {
+            "statement": f"{settings.BULK_WRITE_STATEMENT_TIMEOUT_SECONDS}s",
+            "idle": f"{settings.BULK_WRITE_IDLE_TIMEOUT_SECONDS}s",
+        },
+    )
@@ -7,14 +7,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import v1_router
 from app.config import settings
 from app.core.exceptions import register_exception_handlers
+from app.core.idempotency import REPLAYED_HEADER, IdempotencyMiddleware
 from app.core.middleware import RequestLoggingMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.redis import close_redis
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
-    # Startup: initialize DB pool, cache connections, etc.
+    # The DB pool, the Redis client and the response cache (app.core.cache)
+    # all connect lazily on first use
     yield
-    # Shutdown: close DB pool, flush caches, etc.
+    await close_redis()
 
 
 app = FastAPI(
@@ -43,11 +47,17 @@ app = FastAPI(
         {"name": "analysis", "description": "AI-powered behavior pattern detection"},
         {"name": "insights", "description": "AI-generated behavioral insights and recommendations"},
         {"name": "progress", "description": "Progress tracking, charts, and dashboard data"},
+        {"name": "sync", "description": "Delta sync change feed for offline clients"},
+        {"name": "exports", "description": "Streaming NDJSON/CSV exports of behavior history"},
+        {"name": "admin", "description": "Operational telemetry (admin users only)"},
     ],
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
+# Inside CORS, so replayed responses still get CORS headers
+app.add_middleware(IdempotencyMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -55,6 +65,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, REPLAYED_HEADER, "ETag"],
 )
 
 # Middleware (order matters: last added = first executed)
@@ -1,7 +1,31 @@
 from app.models.abc_log import ABCLog
+from app.models.archive import ABCLogArchiveSegment
+from app.models.baseline import BehaviorBaseline
+from app.models.bip import BehaviorPlan, BipBatchRun
 from app.models.coaching_session import CoachingMessage, CoachingSession
+from app.models.daily_stats import PetDailyStats, PetPeriodStats
+from app.models.data_version import PetDataVersion
+from app.models.forecast import PetForecast
 from app.models.insight import Insight
 from app.models.pet import Pet
+from app.models.sync import SyncTombstone, SyncTombstoneHorizon
 from app.models.user import User
 
-__all__ = ["User", "Pet", "ABCLog", "Insight", "CoachingSession", "CoachingMessage"]
+__all__ = [
+    "User",
+    "Pet",
+    "ABCLog",
+    "ABCLogArchiveSegment",
+    "Insight",
+    "CoachingSession",
+    "CoachingMessage",
+    "BehaviorPlan",
+    "BipBatchRun",
+    "SyncTombstone",
+    "SyncTombstoneHorizon",
+    "PetDailyStats",
+    "PetPeriodStats",
+    "PetDataVersion",
+    "BehaviorBaseline",
+    "PetForecast",
+]
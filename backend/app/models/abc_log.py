@@ -1,18 +1,53 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, String, text
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    Computed,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base import Base
+from app.db.base import CHANGE_SEQ_DEFAULT, CHANGE_XID_DEFAULT, Base
+
+# Full-text search document: behavior notes rank highest, then the
+# antecedent/consequence notes, then location.
+SEARCH_CONFIG = "english"
+SEARCH_VECTOR_SQL = " || ".join(
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+    for column, weight in (
+        ("behavior_notes", "A"),
+        ("antecedent_notes", "B"),
+        ("consequence_notes", "B"),
+        ("location", "C"),
+    )
+)
 
 
 class ABCLog(Base):
     __tablename__ = "abc_logs"
     __table_args__ = (
         CheckConstraint("behavior_severity BETWEEN 1 AND 5", name="ck_abc_logs_severity"),
-        Index("idx_abc_logs_pet_occurred", "pet_id", "occurred_at"),
+        Index("idx_abc_logs_pet_occurred", "pet_id", "occurred_at", "id"),
+        Index("idx_abc_logs_user_change", "user_id", "change_xid", "change_seq"),
+        # List filters: categories within a pet's timeline, and tag containment/overlap
+        Index("idx_abc_logs_pet_antecedent", "pet_id", "antecedent_category", "occurred_at"),
+        Index("idx_abc_logs_pet_behavior", "pet_id", "behavior_category", "occurred_at"),
+        Index("idx_abc_logs_pet_consequence", "pet_id", "consequence_category", "occurred_at"),
+        Index("idx_abc_logs_antecedent_tags", "antecedent_tags", postgresql_using="gin"),
+        Index("idx_abc_logs_behavior_tags", "behavior_tags", postgresql_using="gin"),
+        Index("idx_abc_logs_consequence_tags", "consequence_tags", postgresql_using="gin"),
+        Index("idx_abc_logs_search", "search_vector", postgresql_using="gin"),
+        # Monthly range partitions (abc_logs_pYYYYMM plus abc_logs_default), created
+        # ahead of time by app.db.partitions; the partition key is part of the PK.
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -46,12 +81,25 @@ class ABCLog(Base):
     consequence_notes: Mapped[str | None] = mapped_column()
 
     # Metadata
-    occurred_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
+    occurred_at: Mapped[datetime] = mapped_column(primary_key=True, server_default=text("NOW()"))
     location: Mapped[str | None] = mapped_column(String(100))
     duration_seconds: Mapped[int | None] = mapped_column()
     other_pets_present: Mapped[list[uuid.UUID] | None] = mapped_column(ARRAY(UUID(as_uuid=True)))
 
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
 
+    # Generated from the notes and location; not loaded with the row
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+
+    # Change-feed position: assigned on insert, bumped by trigger on update
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_SEQ_DEFAULT, server_onupdate=FetchedValue()
+    )
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_XID_DEFAULT, server_onupdate=FetchedValue()
+    )
+
     # Relationships
     pet: Mapped["Pet"] = relationship(back_populates="abc_logs")  # noqa: F821
@@ -0,0 +1,47 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ABCLogArchiveSegment(Base):
+    """One pet's rows within one archived month file, plus their rollup.
+
+    The manifest for the cold tier (see ``app.services.archive``): which
+    Parquet file and row groups hold the pet's archived logs, so they can be
+    read without scanning whole files, and enough aggregates that all-time
+    totals never have to open them.
+    """
+
+    __tablename__ = "abc_log_archive_segments"
+    __table_args__ = (Index("idx_abc_log_archive_segments_pet_period", "pet_id", "period"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    period: Mapped[date] = mapped_column(Date, nullable=False)  # first day of the month
+    path: Mapped[str] = mapped_column(String(255), nullable=False)  # relative to ARCHIVE_URI
+    row_groups: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+
+    # Rollup of the segment's rows
+    row_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    first_occurred_at: Mapped[datetime] = mapped_column(nullable=False)
+    last_occurred_at: Mapped[datetime] = mapped_column(nullable=False)
+    severity_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    severity_max: Mapped[int] = mapped_column(Integer, nullable=False)
+    behavior_counts: Mapped[dict[str, int]] = mapped_column(JSONB, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
@@ -0,0 +1,34 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import Date, Double, ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class BehaviorBaseline(Base):
+    """Streaming EWMA of a pet's daily count for one behavior category.
+
+    ``mean`` and ``variance`` summarise every day before ``through``
+    (exclusive); days are folded in as they close, so scoring a new log is
+    O(1) in the pet's history. Maintained by ``app.services.anomaly`` and
+    rebuilt from ``pet_daily_stats`` by its backfill.
+    """
+
+    __tablename__ = "behavior_baselines"
+
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    behavior_category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    mean: Mapped[float] = mapped_column(Double, nullable=False)
+    variance: Mapped[float] = mapped_column(Double, nullable=False)
+    days_seen: Mapped[int] = mapped_column(Integer, nullable=False)
+    through: Mapped[date] = mapped_column(Date, nullable=False)
+    # Last day an anomaly insight was raised, so a day alerts at most once
+    last_alert_day: Mapped[date | None] = mapped_column(Date)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, ForeignKey, Index, String, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+
+
+class BehaviorPlan(Base):
+    """A Behavior Intervention Plan (BIP) generated for a pet."""
+
+    __tablename__ = "bips"
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('active', 'paused', 'completed', 'archived')", name="ck_bips_status"
+        ),
+        CheckConstraint(
+            "function IS NULL OR function IN ('attention', 'escape', 'tangible', 'sensory')",
+            name="ck_bips_function",
+        ),
+        Index("idx_bips_pet_status", "pet_id", "status"),
+        # One plan per pet per batch, however many times its results are processed
+        UniqueConstraint("batch_run_id", "pet_id", name="uq_bips_batch_run_pet"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    batch_run_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("bip_batch_runs.id", ondelete="SET NULL"),
+        index=True,
+    )
+    target_behavior: Mapped[str] = mapped_column(String(50), nullable=False)
+    function: Mapped[str | None] = mapped_column(String(20))
+    plan_data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    model: Mapped[str | None] = mapped_column(String(50))
+    status: Mapped[str] = mapped_column(String(20), nullable=False, server_default=text("'active'"))
+    started_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
+    completed_at: Mapped[datetime | None] = mapped_column()
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
+
+    # Relationships
+    pet: Mapped["Pet"] = relationship(back_populates="bips")  # noqa: F821
+
+
+class BipBatchRun(Base):
+    """Checkpoint for one Message Batches submission of BIP requests.
+
+    Lets a restarted worker resume polling an in-flight batch instead of
+    resubmitting the pets it contains.
+    """
+
+    __tablename__ = "bip_batch_runs"
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'submitted', 'completed', 'failed')",
+            name="ck_bip_batch_runs_status",
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    provider_batch_id: Mapped[str | None] = mapped_column(String(100), unique=True)
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, server_default=text("'pending'")
+    )
+    pet_ids: Mapped[list[uuid.UUID]] = mapped_column(ARRAY(UUID(as_uuid=True)), nullable=False)
+    succeeded: Mapped[int] = mapped_column(server_default=text("0"))
+    errored: Mapped[int] = mapped_column(server_default=text("0"))
+    created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
+    completed_at: Mapped[datetime | None] = mapped_column()
+    # The poll chain currently responsible for the run, and until when
+    poll_token: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    poll_lease_until: Mapped[datetime | None] = mapped_column()
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey, String, Text, text
+from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,7 @@ from app.db.base import Base
 
 class CoachingSession(Base):
     __tablename__ = "coaching_sessions"
+    __table_args__ = (Index("idx_coaching_sessions_pet_created", "pet_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     pet_id: Mapped[uuid.UUID] = mapped_column(
@@ -25,6 +26,7 @@ class CoachingSession(Base):
         index=True,
     )
     title: Mapped[str] = mapped_column(String(200), nullable=False)
+    message_count: Mapped[int] = mapped_column(Integer, server_default=text("0"))
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
     updated_at: Mapped[datetime] = mapped_column(
         nullable=False, server_default=text("NOW()"), onupdate=datetime.now
@@ -41,6 +43,7 @@ class CoachingMessage(Base):
     __tablename__ = "coaching_messages"
     __table_args__ = (
         CheckConstraint("role IN ('user', 'assistant')", name="ck_coaching_messages_role"),
+        Index("idx_coaching_messages_session_created", "session_id", "created_at"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -48,11 +51,20 @@ class CoachingMessage(Base):
         UUID(as_uuid=True),
         ForeignKey("coaching_sessions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     role: Mapped[str] = mapped_column(String(10), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     model: Mapped[str | None] = mapped_column(String(50))
+
+    # Telemetry (assistant messages only)
+    latency_ms: Mapped[int | None] = mapped_column(Integer)
+    ttft_ms: Mapped[int | None] = mapped_column(Integer)
+    input_tokens: Mapped[int | None] = mapped_column(Integer)
+    output_tokens: Mapped[int | None] = mapped_column(Integer)
+    cached_tokens: Mapped[int | None] = mapped_column(Integer)
+    fallback_reason: Mapped[str | None] = mapped_column(String(50))
+    cache_hit: Mapped[bool] = mapped_column(server_default=text("false"))
+
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
 
     # Relationships
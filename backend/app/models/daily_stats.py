@@ -0,0 +1,65 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import CheckConstraint, Date, ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PetDailyStats(Base):
+    """Per-pet, per-day rollup of ``abc_logs`` for the progress endpoints.
+
+    Maintained by statement-level triggers on ``abc_logs`` (see the
+    migration) in the same transaction as the write, so it also covers bulk
+    imports and cascades; never written by application code outside
+    ``app.services.daily_stats``. Days in archived months are left in place
+    when their partition is dropped.
+    """
+
+    __tablename__ = "pet_daily_stats"
+
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    log_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    severity_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    severity_max: Mapped[int] = mapped_column(Integer, nullable=False)
+    # category -> count
+    behavior_counts: Mapped[dict[str, int]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    antecedent_counts: Mapped[dict[str, int]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    consequence_counts: Mapped[dict[str, int]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+
+
+class PetPeriodStats(Base):
+    """Weekly and monthly rollups of ``pet_daily_stats``, for long-range charts.
+
+    Maintained from the daily rows by a trigger on ``pet_daily_stats`` (see
+    the migration). Weeks start on Monday; periods are keyed by first day.
+    """
+
+    __tablename__ = "pet_period_stats"
+    __table_args__ = (
+        CheckConstraint("resolution IN ('week', 'month')", name="ck_pet_period_stats_resolution"),
+    )
+
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    resolution: Mapped[str] = mapped_column(String(5), primary_key=True)
+    period_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    log_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    severity_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    severity_max: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, ForeignKey, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PetDataVersion(Base):
+    """Counter bumped whenever any of a pet's logs, insights or profile change.
+
+    Bumped by statement-level triggers on ``abc_logs``, ``insights`` and
+    ``pets`` (see the migrations), so derived per-pet results can be cached
+    and checked for staleness -- and served as ETags -- with a single
+    primary-key lookup. A pet without a row is at version 0.
+    """
+
+    __tablename__ = "pet_data_versions"
+
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
@@ -0,0 +1,34 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import BigInteger, Date, Double, ForeignKey, Integer, String, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PetForecast(Base):
+    """A pet's latest daily behavior-count forecast, from ``app.services.forecast``.
+
+    Valid while the pet's data version is still ``data_version`` and the
+    forecast still starts today; otherwise it is refitted on request.
+    """
+
+    __tablename__ = "pet_forecasts"
+
+    pet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("pets.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    data_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    start_day: Mapped[date] = mapped_column(Date, nullable=False)
+    # One entry per forecast day, from start_day on
+    expected: Mapped[list[float]] = mapped_column(ARRAY(Double), nullable=False)
+    lower: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    upper: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    weekly_change_pct: Mapped[float] = mapped_column(Double, nullable=False)
+    # improving | worsening | stable
+    trend: Mapped[str] = mapped_column(String(10), nullable=False)
+    fitted_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
@@ -1,11 +1,20 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey, Index, Numeric, String, text
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base import Base
+from app.db.base import CHANGE_SEQ_DEFAULT, CHANGE_XID_DEFAULT, Base
 
 
 class Insight(Base):
@@ -21,6 +30,7 @@ class Insight(Base):
         ),
         CheckConstraint("confidence BETWEEN 0 AND 1", name="ck_insights_confidence"),
         Index("idx_insights_pet_unread", "pet_id", "is_read"),
+        Index("idx_insights_user_change", "user_id", "change_xid", "change_seq"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -44,5 +54,13 @@ class Insight(Base):
     is_read: Mapped[bool] = mapped_column(server_default=text("false"))
     created_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
 
+    # Change-feed position: assigned on insert, bumped by trigger on update
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_SEQ_DEFAULT, server_onupdate=FetchedValue()
+    )
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_XID_DEFAULT, server_onupdate=FetchedValue()
+    )
+
     # Relationships
     pet: Mapped["Pet"] = relationship(back_populates="insights")  # noqa: F821
@@ -1,11 +1,20 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, ForeignKey, Numeric, String, text
+from sqlalchemy import (
+    BigInteger,
+    CheckConstraint,
+    FetchedValue,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.db.base import Base
+from app.db.base import CHANGE_SEQ_DEFAULT, CHANGE_XID_DEFAULT, Base
 
 
 class Pet(Base):
@@ -13,6 +22,7 @@ class Pet(Base):
     __table_args__ = (
         CheckConstraint("species IN ('cat', 'dog')", name="ck_pets_species"),
         CheckConstraint("sex IN ('male', 'female', 'unknown')", name="ck_pets_sex"),
+        Index("idx_pets_user_change", "user_id", "change_xid", "change_seq"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -38,6 +48,14 @@ class Pet(Base):
         nullable=False, server_default=text("NOW()"), onupdate=datetime.now
     )
 
+    # Change-feed position: assigned on insert, bumped by trigger on update
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_SEQ_DEFAULT, server_onupdate=FetchedValue()
+    )
+    change_xid: Mapped[int] = mapped_column(
+        BigInteger, server_default=CHANGE_XID_DEFAULT, server_onupdate=FetchedValue()
+    )
+
     # Relationships
     owner: Mapped["User"] = relationship(back_populates="pets")  # noqa: F821
     abc_logs: Mapped[list["ABCLog"]] = relationship(  # noqa: F821
@@ -49,3 +67,6 @@ class Pet(Base):
     coaching_sessions: Mapped[list["CoachingSession"]] = relationship(  # noqa: F821
         back_populates="pet", cascade="all, delete-orphan"
     )
+    bips: Mapped[list["BehaviorPlan"]] = relationship(  # noqa: F821
+        back_populates="pet", cascade="all, delete-orphan"
+    )
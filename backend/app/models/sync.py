@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, CheckConstraint, Index, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import CHANGE_SEQ_DEFAULT, CHANGE_XID_DEFAULT, Base
+
+
+class SyncTombstone(Base):
+    """Record of a deleted synced row, so the change feed can report deletes.
+
+    Written by an AFTER DELETE trigger on pets, abc_logs and insights (see
+    the migration); never written by application code.
+    """
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("idx_sync_tombstones_user_change", "user_id", "change_xid", "change_seq"),
+        Index("idx_sync_tombstones_deleted_at", "deleted_at"),
+    )
+
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, primary_key=True, server_default=CHANGE_SEQ_DEFAULT
+    )
+    change_xid: Mapped[int] = mapped_column(BigInteger, server_default=CHANGE_XID_DEFAULT)
+    table_name: Mapped[str] = mapped_column(String(30), nullable=False)
+    row_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    # No FK: tombstones are written while a user's rows are being cascade-deleted
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
+
+
+class SyncTombstoneHorizon(Base):
+    """The highest ``(change_xid, change_seq)`` of any pruned tombstone.
+
+    A single row, advanced by ``prune_tombstones``. A cursor behind it may
+    have missed a deletion, so the change feed tells its client to resync.
+    """
+
+    __tablename__ = "sync_tombstone_horizon"
+    __table_args__ = (CheckConstraint("id", name="ck_sync_tombstone_horizon_single_row"),)
+
+    id: Mapped[bool] = mapped_column(Boolean, primary_key=True, server_default=text("true"))
+    change_xid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    pruned_at: Mapped[datetime] = mapped_column(nullable=False, server_default=text("NOW()"))
@@ -2,9 +2,13 @@
 
 import uuid
 from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
+# Upper bound on logs per batch upload (offline sync backlog)
+MAX_BATCH_LOGS = 500
+
 
 class ABCLogCreate(BaseModel):
     pet_id: uuid.UUID
@@ -41,6 +45,24 @@ class ABCLogUpdate(BaseModel):
     other_pets_present: list[uuid.UUID] | None = None
 
 
+class ABCLogFilters(BaseModel):
+    """Optional filters for listing a pet's logs (query parameters)."""
+
+    antecedent_category: str | None = None
+    behavior_category: str | None = None
+    consequence_category: str | None = None
+    antecedent_tags: list[str] | None = None
+    behavior_tags: list[str] | None = None
+    consequence_tags: list[str] | None = None
+    # "any": log has at least one of the given tags; "all": it has every one
+    tag_match: Literal["any", "all"] = "any"
+    severity_min: int | None = Field(None, ge=1, le=5)
+    severity_max: int | None = Field(None, ge=1, le=5)
+    location: str | None = Field(None, max_length=100)
+    occurred_after: datetime | None = None
+    occurred_before: datetime | None = None
+
+
 class ABCLogResponse(BaseModel):
     id: uuid.UUID
     pet_id: uuid.UUID
@@ -64,6 +86,13 @@ class ABCLogResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ABCLogSearchHit(BaseModel):
+    log: ABCLogResponse
+    rank: float
+    # Matching note fragments, with matched terms wrapped in <mark></mark>
+    snippet: str
+
+
 class ABCLogSummary(BaseModel):
     total_logs: int
     earliest_log: datetime | None
@@ -71,3 +100,39 @@ class ABCLogSummary(BaseModel):
     severity_avg: float | None
     top_behaviors: list[dict]
     top_antecedents: list[dict]
+
+
+class ABCLogBatchCreate(BaseModel):
+    # Items are validated one by one against ABCLogCreate so that a bad item
+    # is reported in its result instead of rejecting the whole batch.
+    logs: list[dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_LOGS)
+
+
+class ABCLogBatchItemResult(BaseModel):
+    index: int
+    status: Literal["created", "error"]
+    log: ABCLogResponse | None = None
+    error: str | None = None
+
+
+class ABCLogBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[ABCLogBatchItemResult]
+
+
+class ABCLogImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class ABCLogImportReport(BaseModel):
+    model_config = {"from_attributes": True}
+
+    received: int
+    imported: int
+    duplicates: int
+    failed: int
+    errors: list[ABCLogImportRowError]
+    # Only the first MAX_REPORTED_ERRORS rejected rows are listed
+    errors_truncated: bool
@@ -29,5 +29,6 @@ class CoachingSessionDetail(BaseModel):
     pet_id: uuid.UUID
     title: str
     messages: list[CoachingMessageResponse]
+    next_cursor: str | None = None
     created_at: datetime
     updated_at: datetime
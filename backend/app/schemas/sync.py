@@ -0,0 +1,26 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.abc_log import ABCLogResponse
+from app.schemas.insight import InsightResponse
+from app.schemas.pet import PetResponse
+
+
+class SyncDeletion(BaseModel):
+    table: str
+    id: uuid.UUID
+    deleted_at: datetime
+
+
+class SyncChanges(BaseModel):
+    pets: list[PetResponse]
+    abc_logs: list[ABCLogResponse]
+    insights: list[InsightResponse]
+    deleted: list[SyncDeletion]
+    next_cursor: str
+    has_more: bool
+    # The cursor was older than the tombstone retention window: this is a
+    # full sync from the start, to replace (not merge into) the client's data
+    reset: bool = False
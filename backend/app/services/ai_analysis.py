@@ -5,18 +5,29 @@ BIP (Behavior Intervention Plan) foundations.
 """
 
 import logging
+import time
 import uuid
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core.text import tokenize
 from app.models.abc_log import ABCLog
 from app.models.insight import Insight
 from app.models.pet import Pet
+from app.services.coaching_cache import coaching_cache, dominant_behaviors
+from app.services.coaching_context import CoachingContext, load_coaching_context
+from app.services.history_index import SearchHit, history_index, log_payload
 
 logger = logging.getLogger("pawlogic.ai")
 
+# Prompt context sizes: the most recent logs plus the past logs and coaching
+# messages that best match the owner's question.
+RECENT_LOG_CONTEXT = 10
+RELEVANT_LOG_CONTEXT = 10
+RELEVANT_MESSAGE_CONTEXT = 3
+MESSAGE_EXCERPT_CHARS = 300
+
 SYSTEM_PROMPT = """You are PawLogic's behavior coach — a knowledgeable, friendly expert in Applied Behavior Analysis (ABA) for pets. You provide science-backed advice in plain English.
 
 Key principles:
@@ -34,22 +45,63 @@ Behavior function framework (ABA):
 - Sensory: behavior that is self-reinforcing through physical sensation"""
 
 
+def _format_log_line(log: dict, date_format: str = "%m/%d") -> str:
+    return (
+        f"- [{log['occurred_at'].strftime(date_format)}] "
+        f"A: {log['antecedent_category']} ({', '.join(log['antecedent_tags'])}) | "
+        f"B: {log['behavior_category']} ({', '.join(log['behavior_tags'])}, severity {log['behavior_severity']}/5) | "
+        f"C: {log['consequence_category']} ({', '.join(log['consequence_tags'])})"
+    )
+
+
 def _format_log_summary(logs: list[ABCLog]) -> str:
     """Format recent ABC logs into a concise context block for the AI."""
     if not logs:
         return "No behavior logs recorded yet."
 
-    lines = [f"Recent ABC logs ({len(logs)} entries):"]
-    for log in logs[:20]:  # Cap at 20 most recent
-        lines.append(
-            f"- [{log.occurred_at.strftime('%m/%d')}] "
-            f"A: {log.antecedent_category} ({', '.join(log.antecedent_tags)}) | "
-            f"B: {log.behavior_category} ({', '.join(log.behavior_tags)}, severity {log.behavior_severity}/5) | "
-            f"C: {log.consequence_category} ({', '.join(log.consequence_tags)})"
-        )
+    recent = logs[:RECENT_LOG_CONTEXT]
+    lines = [f"Recent ABC logs ({len(recent)} entries):"]
+    lines.extend(_format_log_line(log_payload(log)) for log in recent)
+    return "\n".join(lines)
+
+
+def _format_relevant_history(log_hits: list[SearchHit], message_hits: list[SearchHit]) -> str:
+    """Format retrieved past logs and coaching exchanges related to the question."""
+    lines = []
+    if log_hits:
+        lines.append(f"Past logs most relevant to this question ({len(log_hits)} entries):")
+        lines.extend(_format_log_line(hit.doc.payload, "%Y-%m-%d") for hit in log_hits)
+    if message_hits:
+        if lines:
+            lines.append("")
+        lines.append("Related past coaching messages:")
+        for hit in message_hits:
+            payload = hit.doc.payload
+            excerpt = payload["content"][:MESSAGE_EXCERPT_CHARS].replace("\n", " ")
+            speaker = "Owner" if payload["role"] == "user" else "Coach"
+            lines.append(f"- [{payload['created_at'].strftime('%Y-%m-%d')}] {speaker}: {excerpt}")
     return "\n".join(lines)
 
 
+def _telemetry(
+    started: float,
+    first_token_at: float | None = None,
+    usage: object | None = None,
+    fallback_reason: str | None = None,
+    cache_hit: bool = False,
+) -> dict:
+    """Per-call latency and token usage, persisted on the assistant message."""
+    return {
+        "latency_ms": round((time.perf_counter() - started) * 1000),
+        "ttft_ms": round((first_token_at - started) * 1000) if first_token_at else None,
+        "input_tokens": getattr(usage, "input_tokens", None),
+        "output_tokens": getattr(usage, "output_tokens", None),
+        "cached_tokens": getattr(usage, "cache_read_input_tokens", None),
+        "fallback_reason": fallback_reason,
+        "cache_hit": cache_hit,
+    }
+
+
 def _format_insights(insights: list[Insight]) -> str:
     """Format existing insights into context for the AI."""
     if not insights:
@@ -68,37 +120,79 @@ async def coaching_response(
     user_id: uuid.UUID,
     question: str,
     conversation_history: list[dict] | None = None,
+    context: CoachingContext | None = None,
 ) -> dict:
     """Generate an AI coaching response about a pet's behavior.
 
-    Uses the pet's ABC log history and existing insights as context.
-    Falls back to a helpful message if Claude API is not configured.
+    Uses the pet's ABC log history and existing insights as context: the
+    most recent logs plus the past logs and coaching messages that best match
+    the question (BM25 over the pet's history index). Falls back to a helpful
+    message if Claude API is not configured.
+
+    First-turn questions are checked against the coaching answer cache
+    (keyed by species and dominant behaviors) before calling Claude; model
+    answers are stored back into the cache on a miss, scoped to this user
+    and pet.
 
     If conversation_history is provided, builds a multi-turn messages array
     for the Claude API call. Each entry should have 'role' and 'content'.
+
+    Pass ``context`` when the caller already ran ``load_coaching_context``;
+    otherwise it is loaded here.
+
+    The returned dict carries a ``telemetry`` entry (latency, time to first
+    token, token usage, fallback reason) for the caller to persist.
     """
-    # Fetch pet info
-    pet_result = await db.execute(select(Pet).where(Pet.id == pet_id, Pet.user_id == user_id))
-    pet = pet_result.scalar_one_or_none()
+    started = time.perf_counter()
+
+    if context is None:
+        context = await load_coaching_context(db, pet_id, user_id)
+    pet = context.pet
     if pet is None:
         from app.core.exceptions import NotFoundException
 
         raise NotFoundException(f"Pet {pet_id}")
-
-    # Fetch recent logs
-    logs_result = await db.execute(
-        select(ABCLog).where(ABCLog.pet_id == pet_id).order_by(ABCLog.occurred_at.desc()).limit(20)
-    )
-    logs = list(logs_result.scalars().all())
-
-    # Fetch existing insights
-    insights_result = await db.execute(
-        select(Insight)
-        .where(Insight.pet_id == pet_id)
-        .order_by(Insight.created_at.desc())
-        .limit(10)
-    )
-    insights = list(insights_result.scalars().all())
+    logs = context.logs
+    insights = context.insights
+
+    # First turns of a conversation can be answered from the answer cache;
+    # follow-ups depend on the conversation so they always go to the model.
+    behaviors = dominant_behaviors(log.behavior_category for log in logs)
+    use_cache = settings.COACHING_CACHE_ENABLED and not conversation_history
+    # Generated answers draw on this pet's logs; they are never served to other pets
+    cache_scope = f"{user_id}:{pet_id}"
+    if use_cache:
+        cached = coaching_cache.get(
+            pet.species, behaviors, question, pet_name=pet.name, scope=cache_scope
+        )
+        if cached is not None:
+            return {
+                "pet_id": str(pet_id),
+                "question": question,
+                "response": cached.answer,
+                "model": cached.model,
+                "log_count": len(logs),
+                "cached": True,
+                "telemetry": _telemetry(started, cache_hit=True),
+            }
+
+    # Retrieve past logs and coaching messages relevant to the question
+    index = await history_index.get(db, pet_id, delta=context.index_delta)
+    terms = tokenize(question)
+    recent_ids = {log.id for log in logs[:RECENT_LOG_CONTEXT]}
+    log_hits = [
+        hit
+        for hit in index.search(terms, k=RELEVANT_LOG_CONTEXT + len(recent_ids), kind="log")
+        if hit.doc.payload["id"] not in recent_ids
+    ][:RELEVANT_LOG_CONTEXT]
+    in_conversation = {msg["content"] for msg in conversation_history or []}
+    message_hits = [
+        hit
+        for hit in index.search(
+            terms, k=RELEVANT_MESSAGE_CONTEXT + len(in_conversation), kind="message"
+        )
+        if hit.doc.payload["content"] not in in_conversation
+    ][:RELEVANT_MESSAGE_CONTEXT]
 
     # Build context
     pet_context = (
@@ -106,9 +200,12 @@ async def coaching_response(
         f"age {pet.age_years or 'unknown'}y, {pet.sex})"
     )
     log_context = _format_log_summary(logs)
+    history_context = _format_relevant_history(log_hits, message_hits)
     insight_context = _format_insights(insights)
 
-    context_block = f"{pet_context}\n\n{log_context}\n\n{insight_context}"
+    context_block = "\n\n".join(
+        part for part in (pet_context, log_context, history_context, insight_context) if part
+    )
 
     # Build messages array for Claude
     if conversation_history:
@@ -144,27 +241,45 @@ async def coaching_response(
             "response": _fallback_response(pet, question, logs),
             "model": "fallback",
             "log_count": len(logs),
+            "telemetry": _telemetry(started, fallback_reason="not_configured"),
         }
 
-    # Call Claude API
+    # Call Claude API, streaming so time-to-first-token can be measured
+    first_token_at: float | None = None
     try:
         import anthropic
 
-        client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
-        message = client.messages.create(
+        client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        async with client.messages.stream(
             model="claude-haiku-4-5-20251001",
             max_tokens=800,
             system=SYSTEM_PROMPT,
             messages=messages,
-        )
+        ) as stream:
+            async for _ in stream.text_stream:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+            message = await stream.get_final_message()
         response_text = message.content[0].text
 
+        if use_cache:
+            coaching_cache.put(
+                pet.species,
+                behaviors,
+                question,
+                response_text,
+                model=message.model,
+                pet_name=pet.name,
+                scope=cache_scope,
+            )
+
         return {
             "pet_id": str(pet_id),
             "question": question,
             "response": response_text,
             "model": message.model,
             "log_count": len(logs),
+            "telemetry": _telemetry(started, first_token_at, message.usage),
         }
     except Exception as exc:
         logger.error("Claude API error: %s", exc)
@@ -175,6 +290,9 @@ async def coaching_response(
             "model": "fallback",
             "log_count": len(logs),
             "error": str(exc),
+            "telemetry": _telemetry(
+                started, first_token_at, fallback_reason=type(exc).__name__[:50]
+            ),
         }
 
 
@@ -0,0 +1,273 @@
+"""Streaming anomaly detection on daily behavior counts.
+
+Each (pet, behavior category) keeps an exponentially weighted mean and
+variance of its daily count in ``behavior_baselines``. A log write folds
+any days that closed since the last update into the baseline (their counts
+come from the ``pet_daily_stats`` rollup; usually zero or one day) and
+scores the day's count so far. That is O(1) in the pet's history, and a
+batch of logs spanning many pets and days costs the same two queries. A day
+whose count is far above the baseline becomes an insight, once per
+category per day.
+
+``backfill_baselines`` recomputes the state for every pet (or one)
+vectorised in NumPy: one array row per (pet, category), stepped through the
+last ``BACKFILL_DAYS`` days together. It runs nightly, which also
+reconciles late, edited, deleted and imported logs that the streaming path
+does not revisit.
+"""
+
+import math
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.baseline import BehaviorBaseline
+from app.models.daily_stats import PetDailyStats
+from app.models.insight import Insight
+
+SPAN_DAYS = 28
+ALPHA = 2 / (SPAN_DAYS + 1)
+Z_THRESHOLD = 3.0
+# A baseline needs this many days behind it before it can flag anything
+MIN_HISTORY_DAYS = 14
+MIN_ANOMALY_COUNT = 3
+# Floor on the standard deviation, so a behavior that is usually absent
+# doesn't flag a single occurrence
+MIN_STD = 0.5
+# Beyond this, the weight left on older days is negligible (< 1e-5)
+BACKFILL_DAYS = 365
+_UPSERT_CHUNK = 1000
+
+
+@dataclass
+class EWMAState:
+    mean: float = 0.0
+    variance: float = 0.0
+    days_seen: int = 0
+
+    def update(self, count: float) -> None:
+        diff = count - self.mean
+        incr = ALPHA * diff
+        self.mean += incr
+        self.variance = (1 - ALPHA) * (self.variance + diff * incr)
+        self.days_seen += 1
+
+    def zscore(self, count: float) -> float:
+        return (count - self.mean) / max(math.sqrt(self.variance), MIN_STD)
+
+    def is_anomalous(self, count: int) -> bool:
+        return (
+            self.days_seen >= MIN_HISTORY_DAYS
+            and count >= MIN_ANOMALY_COUNT
+            and self.zscore(count) >= Z_THRESHOLD
+        )
+
+
+def _humanize(category: str) -> str:
+    return category.replace("_", " ")
+
+
+def _anomaly_insight(
+    pet_id: uuid.UUID, user_id: uuid.UUID, category: str, day: date, count: int, state: EWMAState
+) -> Insight:
+    z = state.zscore(count)
+    return Insight(
+        pet_id=pet_id,
+        user_id=user_id,
+        insight_type="pattern",
+        title=f"Unusual day: {count} {_humanize(category)} incidents on {day:%b} {day.day}",
+        body=(
+            f"{count} {_humanize(category)} incidents were logged on {day:%B} {day.day}, against "
+            f"a typical {state.mean:.1f} per day over recent weeks. A sudden change like "
+            "this often follows a change in routine, environment or health -- worth "
+            "checking what was different that day."
+        ),
+        # Chebyshev: at most 1/z^2 of days sit this far from the mean by chance
+        confidence=Decimal(str(round(min(0.99, 1 - 1 / z**2), 2))),
+    )
+
+
+async def observe_days(
+    db: AsyncSession, user_id: uuid.UUID, pet_days: Iterable[tuple[uuid.UUID, date]]
+) -> list[Insight]:
+    """Update the baselines for the categories logged on each (pet, day) and
+    raise insights for anomalous counts. Call after the log writes are flushed.
+
+    Two queries however many pets and days: one for the pets' baselines and
+    one for the rollup rows they need. Each pet's days are taken oldest
+    first. A day before a baseline's ``through`` has already been folded in;
+    late logs like that are left to the nightly backfill.
+    """
+    days_by_pet: dict[uuid.UUID, list[date]] = {}
+    for pet_id, day in sorted(set(pet_days)):
+        days_by_pet.setdefault(pet_id, []).append(day)
+    if not days_by_pet:
+        return []
+
+    result = await db.scalars(
+        select(BehaviorBaseline).where(BehaviorBaseline.pet_id.in_(days_by_pet))
+    )
+    baselines = {(b.pet_id, b.behavior_category): b for b in result.all()}
+
+    # Each pet's rollup rows from its oldest baseline (bounded by the backfill
+    # window) through its latest logged day
+    ranges = []
+    for pet_id, days in days_by_pet.items():
+        throughs = [b.through for (pet, _), b in baselines.items() if pet == pet_id]
+        start = max(min([*throughs, days[0]]), days[0] - timedelta(days=BACKFILL_DAYS))
+        ranges.append(
+            and_(
+                PetDailyStats.pet_id == pet_id,
+                PetDailyStats.day >= start,
+                PetDailyStats.day <= days[-1],
+            )
+        )
+    rows = await db.execute(
+        select(PetDailyStats.pet_id, PetDailyStats.day, PetDailyStats.behavior_counts).where(
+            or_(*ranges)
+        )
+    )
+    counts: dict[tuple[uuid.UUID, date], dict[str, int]] = {
+        (pet_id, day): day_counts for pet_id, day, day_counts in rows.all()
+    }
+
+    raised = []
+    for pet_id, days in days_by_pet.items():
+        for day in days:
+            for category, count in counts.get((pet_id, day), {}).items():
+                baseline = baselines.get((pet_id, category))
+                if baseline is None:
+                    baseline = BehaviorBaseline(
+                        pet_id=pet_id,
+                        behavior_category=category,
+                        mean=0.0,
+                        variance=0.0,
+                        days_seen=0,
+                        through=day,
+                    )
+                    baselines[pet_id, category] = baseline
+                    db.add(baseline)
+                if day < baseline.through:
+                    continue
+
+                state = EWMAState(baseline.mean, baseline.variance, baseline.days_seen)
+                gap = (day - baseline.through).days
+                for offset in range(max(0, gap - BACKFILL_DAYS), gap):
+                    closed = baseline.through + timedelta(days=offset)
+                    state.update(counts.get((pet_id, closed), {}).get(category, 0))
+                baseline.mean, baseline.variance, baseline.days_seen = (
+                    state.mean,
+                    state.variance,
+                    state.days_seen,
+                )
+                baseline.through = day
+
+                if baseline.last_alert_day != day and state.is_anomalous(count):
+                    baseline.last_alert_day = day
+                    insight = _anomaly_insight(pet_id, user_id, category, day, count, state)
+                    db.add(insight)
+                    raised.append(insight)
+
+    await db.flush()
+    return raised
+
+
+async def observe_day(
+    db: AsyncSession, pet_id: uuid.UUID, user_id: uuid.UUID, day: date
+) -> list[Insight]:
+    """``observe_days`` for a single pet and day."""
+    return await observe_days(db, user_id, [(pet_id, day)])
+
+
+def ewma_matrix(counts: np.ndarray, active: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Run ``EWMAState.update`` over every row of ``counts`` at once.
+
+    ``counts`` is (series, days); ``active`` masks the days each series
+    counts (from its pet's first log on). Returns mean, variance and days
+    seen per series.
+    """
+    n = counts.shape[0]
+    mean, variance, seen = np.zeros(n), np.zeros(n), np.zeros(n, dtype=np.int64)
+    for t in range(counts.shape[1]):
+        on = active[:, t]
+        diff = counts[:, t] - mean
+        incr = ALPHA * diff
+        mean = np.where(on, mean + incr, mean)
+        variance = np.where(on, (1 - ALPHA) * (variance + diff * incr), variance)
+        seen += on
+    return mean, variance, seen
+
+
+async def backfill_baselines(db: AsyncSession, today: date, pet_id: uuid.UUID | None = None) -> int:
+    """Recompute baselines through yesterday from the rollup; returns how many.
+
+    ``last_alert_day`` is kept, so a rebuilt baseline doesn't alert twice.
+    """
+    since = today - timedelta(days=BACKFILL_DAYS)
+    query = select(PetDailyStats.pet_id, PetDailyStats.day, PetDailyStats.behavior_counts).where(
+        PetDailyStats.day >= since, PetDailyStats.day < today
+    )
+    if pet_id is not None:
+        query = query.where(PetDailyStats.pet_id == pet_id)
+    rows = (await db.execute(query)).all()
+
+    records = [
+        (pet, (day - since).days, category, count)
+        for pet, day, counts in rows
+        for category, count in counts.items()
+    ]
+    written = 0
+    if records:
+        df = pd.DataFrame(records, columns=["pet_id", "t", "category", "count"])
+        series, keys = pd.factorize(pd.MultiIndex.from_frame(df[["pet_id", "category"]]))
+        counts = np.zeros((len(keys), BACKFILL_DAYS))
+        counts[series, df["t"].to_numpy()] = df["count"].to_numpy()
+        # Each series is live from its pet's first logged day in the window
+        first_day = df.groupby("pet_id")["t"].min()
+        starts = first_day.reindex(keys.get_level_values(0)).to_numpy()
+        active = np.arange(BACKFILL_DAYS) >= starts[:, None]
+        mean, variance, seen = ewma_matrix(counts, active)
+
+        values = [
+            {
+                "pet_id": pet,
+                "behavior_category": category,
+                "mean": float(mean[i]),
+                "variance": float(variance[i]),
+                "days_seen": int(seen[i]),
+                "through": today,
+            }
+            for i, (pet, category) in enumerate(keys)
+        ]
+        for chunk_start in range(0, len(values), _UPSERT_CHUNK):
+            stmt = insert(BehaviorBaseline).values(
+                values[chunk_start : chunk_start + _UPSERT_CHUNK]
+            )
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["pet_id", "behavior_category"],
+                    set_={
+                        "mean": stmt.excluded.mean,
+                        "variance": stmt.excluded.variance,
+                        "days_seen": stmt.excluded.days_seen,
+                        "through": stmt.excluded.through,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        written = len(values)
+
+    # Categories with no logs in the window have nothing left to compare against
+    stale = delete(BehaviorBaseline).where(BehaviorBaseline.through < today)
+    if pet_id is not None:
+        stale = stale.where(BehaviorBaseline.pet_id == pet_id)
+    await db.execute(stale)
+    return written
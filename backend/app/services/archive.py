@@ -0,0 +1,437 @@
+"""Cold-tier archive of old ABC logs.
+
+Months older than ``ARCHIVE_AFTER_MONTHS`` are copied out of their
+``abc_logs`` partition into a zstd-compressed Parquet file under
+``ARCHIVE_URI`` (a local path, or any URI ``pyarrow.fs`` understands, e.g.
+``s3://bucket/prefix``), and the partition is dropped. Dropping a partition
+fires no row triggers, so archived logs are not reported to sync clients as
+deletions.
+
+A month is first detached from ``abc_logs`` and renamed
+``abc_logs_pYYYYMM_archiving`` in a transaction of its own, then copied out
+and dropped. Detaching locks the parent before the partition, the order
+writes take them in; locking the partition first and dropping it while
+holding that lock deadlocks against an UPDATE or DELETE by id. (``DETACH
+... CONCURRENTLY`` is not available while ``abc_logs_default`` exists.)
+Between the two commits the month's rows are in neither the live table
+nor the archive. A table left detached by an interrupted run is picked up
+by the next one.
+
+Rows are written sorted by pet, ``ARCHIVE_ROW_GROUP_ROWS`` to a row group.
+Each (pet, file) pair gets an ``ABCLogArchiveSegment`` listing the row
+groups holding the pet's rows and a rollup of them: reading one pet's
+history opens only those row groups, and all-time totals never open a file.
+
+Exports and pattern detection read archived rows back through this module.
+A month written to again after it was archived (e.g. a backdated import)
+gets a fresh partition, and the next run archives it to a second file.
+
+Deleting a pet must also remove its archived rows: ``purge_archived_pets``
+rewrites each file holding them without those rows, repoints the other
+pets' segments at the new file and unlinks the old one after commit.
+"""
+
+import asyncio
+import logging
+import re
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from sqlalchemy import column, distinct, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.partitions import add_months, month_start, partition_name
+from app.db.session import after_commit, bound_bulk_write
+from app.models.abc_log import ABCLog
+from app.models.archive import ABCLogArchiveSegment
+
+logger = logging.getLogger("pawlogic.archive")
+
+ARCHIVE_ROW_GROUP_ROWS = 10_000
+ARCHIVE_FETCH_ROWS = 5_000
+
+ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("pet_id", pa.string()),
+        ("user_id", pa.string()),
+        ("occurred_at", pa.timestamp("us")),
+        ("antecedent_category", pa.string()),
+        ("antecedent_tags", pa.list_(pa.string())),
+        ("antecedent_notes", pa.string()),
+        ("behavior_category", pa.string()),
+        ("behavior_tags", pa.list_(pa.string())),
+        ("behavior_severity", pa.int16()),
+        ("behavior_notes", pa.string()),
+        ("consequence_category", pa.string()),
+        ("consequence_tags", pa.list_(pa.string())),
+        ("consequence_notes", pa.string()),
+        ("location", pa.string()),
+        ("duration_seconds", pa.int32()),
+        ("other_pets_present", pa.list_(pa.string())),
+        ("created_at", pa.timestamp("us")),
+    ]
+)
+
+_UUID_COLUMNS = ("id", "pet_id", "user_id")
+_PARTITION_NAME = re.compile(r"abc_logs_p(\d{4})(\d{2})(?:_archiving)?")
+
+
+@dataclass
+class SegmentStats:
+    """Where one pet's rows went in a file being written, and their rollup."""
+
+    user_id: str
+    row_groups: list[int] = field(default_factory=list)
+    row_count: int = 0
+    first_occurred_at: datetime | None = None
+    last_occurred_at: datetime | None = None
+    severity_sum: int = 0
+    severity_max: int = 0
+    behavior_counts: Counter[str] = field(default_factory=Counter)
+
+
+class ArchiveWriter:
+    """Write archive rows, ordered by pet, to one Parquet file.
+
+    Tracks which row groups each pet's rows land in; ``segments`` is the
+    manifest for the file once it is closed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        filesystem: pafs.FileSystem,
+        row_group_rows: int = ARCHIVE_ROW_GROUP_ROWS,
+    ) -> None:
+        self.row_group_rows = row_group_rows
+        self.segments: dict[str, SegmentStats] = {}
+        self.rows = 0
+        self.row_groups = 0
+        self._buffer: list[dict] = []
+        self._writer = pq.ParquetWriter(
+            path, ARCHIVE_SCHEMA, filesystem=filesystem, compression="zstd"
+        )
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            stats = self.segments.get(row["pet_id"])
+            if stats is None:
+                stats = self.segments[row["pet_id"]] = SegmentStats(user_id=row["user_id"])
+            if not stats.row_groups or stats.row_groups[-1] != self.row_groups:
+                stats.row_groups.append(self.row_groups)
+            stats.row_count += 1
+            occurred_at = row["occurred_at"]
+            if stats.first_occurred_at is None or occurred_at < stats.first_occurred_at:
+                stats.first_occurred_at = occurred_at
+            if stats.last_occurred_at is None or occurred_at > stats.last_occurred_at:
+                stats.last_occurred_at = occurred_at
+            stats.severity_sum += row["behavior_severity"]
+            stats.severity_max = max(stats.severity_max, row["behavior_severity"])
+            stats.behavior_counts[row["behavior_category"]] += 1
+
+            self._buffer.append(row)
+            self.rows += 1
+            if len(self._buffer) >= self.row_group_rows:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        batch = pa.Table.from_pylist(self._buffer, schema=ARCHIVE_SCHEMA)
+        self._writer.write_table(batch, row_group_size=len(self._buffer))
+        self.row_groups += 1
+        self._buffer.clear()
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def read_pet_rows(
+    path: str, filesystem: pafs.FileSystem, row_groups: list[int], pet_id: str
+) -> list[dict]:
+    """One pet's rows from an archive file, reading only the given row groups."""
+    with filesystem.open_input_file(path) as source:
+        batch = pq.ParquetFile(source).read_row_groups(row_groups)
+    return batch.filter(pc.field("pet_id") == pet_id).to_pylist()
+
+
+def archive_filesystem() -> tuple[pafs.FileSystem, str]:
+    """The archive's filesystem and base path, from ``ARCHIVE_URI``."""
+    if not settings.ARCHIVE_URI:
+        raise RuntimeError("ARCHIVE_URI is not configured")
+    return pafs.FileSystem.from_uri(settings.ARCHIVE_URI)
+
+
+def _archive_row(row: Mapping) -> dict:
+    record = dict(row)
+    for key in _UUID_COLUMNS:
+        record[key] = str(record[key])
+    if record["other_pets_present"] is not None:
+        record["other_pets_present"] = [str(pet) for pet in record["other_pets_present"]]
+    return record
+
+
+def _open_writer(path: str, filesystem: pafs.FileSystem) -> ArchiveWriter:
+    if isinstance(filesystem, pafs.LocalFileSystem):
+        filesystem.create_dir(path.rsplit("/", 1)[0], recursive=True)
+    return ArchiveWriter(path, filesystem)
+
+
+def _stored_rows(path: str, filesystem: pafs.FileSystem) -> int:
+    with filesystem.open_input_file(path) as source:
+        return pq.read_metadata(source).num_rows
+
+
+def _month_path(month: date) -> str:
+    return f"{month:%Y}/{month:%Y-%m}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def _rewrite_without(
+    source_path: str, target_path: str, filesystem: pafs.FileSystem, pet_ids: set[str]
+) -> ArchiveWriter | None:
+    """Copy an archive file, a row group at a time, leaving out ``pet_ids``'
+    rows; ``None`` (and no file) if nothing is left."""
+    writer: ArchiveWriter | None = None
+    with filesystem.open_input_file(source_path) as source:
+        parquet = pq.ParquetFile(source)
+        for index in range(parquet.num_row_groups):
+            rows = parquet.read_row_group(index)
+            kept = rows.filter(~pc.field("pet_id").isin(list(pet_ids))).to_pylist()
+            if kept:
+                if writer is None:
+                    writer = _open_writer(target_path, filesystem)
+                writer.add_rows(kept)
+    if writer is not None:
+        writer.close()
+        stored = _stored_rows(target_path, filesystem)
+        if stored != writer.rows:
+            raise RuntimeError(f"Archive {target_path} holds {stored} rows, expected {writer.rows}")
+    return writer
+
+
+async def archivable_months(db: AsyncSession, before: date | None = None) -> list[date]:
+    """Months with their own partition, or a table left detached by an
+    interrupted run, that started before ``before``.
+
+    Defaults to ``ARCHIVE_AFTER_MONTHS`` before the current month.
+    """
+    if before is None:
+        before = add_months(month_start(datetime.now(UTC).date()), -settings.ARCHIVE_AFTER_MONTHS)
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'abc_logs'::regclass "
+            "UNION SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND relname ~ '^abc_logs_p[0-9]{6}_archiving$' "
+            "AND pg_table_is_visible(oid)"
+        )
+    )
+    months = set()
+    for name in result.scalars():
+        match = _PARTITION_NAME.fullmatch(name)
+        if match is not None:
+            month = date(int(match[1]), int(match[2]), 1)
+            if month < before:
+                months.add(month)
+    return sorted(months)
+
+
+def _detached_name(month: date) -> str:
+    return f"{partition_name(month)}_archiving"
+
+
+async def detach_month(db: AsyncSession, month: date) -> None:
+    """Detach one month's partition from ``abc_logs`` ahead of archiving it.
+
+    The caller commits before calling ``archive_month``, so the exclusive
+    lock on ``abc_logs`` is held only for the detach. A no-op if an earlier
+    run already detached the month.
+    """
+    await bound_bulk_write(db)
+    detached = _detached_name(month)
+    if await db.scalar(text("SELECT to_regclass(:name)"), {"name": detached}) is not None:
+        return
+    name = partition_name(month)
+    await db.execute(text(f"ALTER TABLE abc_logs DETACH PARTITION {name}"))
+    # Frees the name, so a backdated write to the month gets a fresh partition
+    await db.execute(text(f"ALTER TABLE {name} RENAME TO {detached}"))
+
+
+async def archive_month(db: AsyncSession, month: date) -> int:
+    """Move a month detached by ``detach_month`` to the archive; returns the
+    rows archived.
+
+    The caller commits. Until it does, the detached table is still in place
+    and the manifest rows are not visible, so a failure at any point leaves
+    at worst an unreferenced file that the next run replaces with a new one.
+    The copy only reads, so the transaction takes no xid (and does not hold
+    back the sync feed) until the manifest rows and the drop at the end.
+    """
+    await bound_bulk_write(db)
+    name = _detached_name(month)
+
+    filesystem, base = archive_filesystem()
+    relative = _month_path(month)
+    path = f"{base.rstrip('/')}/{relative}"
+    source = table(name, *(column(key) for key in ARCHIVE_SCHEMA.names))
+    query = select(source).order_by(source.c.pet_id, source.c.occurred_at, source.c.id)
+
+    writer: ArchiveWriter | None = None
+    result = await db.stream(query.execution_options(yield_per=ARCHIVE_FETCH_ROWS))
+    async for rows in result.partitions():
+        if writer is None:
+            writer = await asyncio.to_thread(_open_writer, path, filesystem)
+        records = [_archive_row(row._mapping) for row in rows]
+        await asyncio.to_thread(writer.add_rows, records)
+
+    if writer is not None:
+        await asyncio.to_thread(writer.close)
+        stored = await asyncio.to_thread(_stored_rows, path, filesystem)
+        if stored != writer.rows:
+            raise RuntimeError(f"Archive {relative} holds {stored} rows, expected {writer.rows}")
+        db.add_all(
+            ABCLogArchiveSegment(
+                pet_id=uuid.UUID(pet_id),
+                user_id=uuid.UUID(stats.user_id),
+                period=month,
+                path=relative,
+                row_groups=stats.row_groups,
+                row_count=stats.row_count,
+                first_occurred_at=stats.first_occurred_at,
+                last_occurred_at=stats.last_occurred_at,
+                severity_sum=stats.severity_sum,
+                severity_max=stats.severity_max,
+                behavior_counts=dict(stats.behavior_counts),
+            )
+            for pet_id, stats in writer.segments.items()
+        )
+        await db.flush()
+
+    await db.execute(text(f"DROP TABLE {name}"))
+    return writer.rows if writer is not None else 0
+
+
+def _unlinker(filesystem: pafs.FileSystem, path: str) -> Callable[[], Awaitable[None]]:
+    async def unlink() -> None:
+        try:
+            await asyncio.to_thread(filesystem.delete_file, path)
+        except OSError:
+            # The manifest no longer points at it; a retry can only come from ops
+            logger.exception("Could not delete replaced archive file %s", path)
+
+    return unlink
+
+
+async def purge_archived_pets(db: AsyncSession, pet_ids: Collection[uuid.UUID]) -> int:
+    """Remove the pets' rows from every archive file; returns the files rewritten.
+
+    Call before deleting the pets (their segments go with them). The caller
+    commits; replaced files are unlinked only once it has, so a rollback
+    leaves the archive as it was, plus at worst an unreferenced new file.
+    """
+    # One rewrite of a file at a time, or two purges would each drop the other's repointing
+    await db.execute(text("SELECT pg_advisory_xact_lock(hashtext('abc_log_archive_rewrite'))"))
+    paths = (
+        await db.scalars(
+            select(distinct(ABCLogArchiveSegment.path)).where(
+                ABCLogArchiveSegment.pet_id.in_(pet_ids)
+            )
+        )
+    ).all()
+    if not paths:
+        return 0
+
+    filesystem, base = archive_filesystem()
+    base = base.rstrip("/")
+    segments = (
+        await db.scalars(select(ABCLogArchiveSegment).where(ABCLogArchiveSegment.path.in_(paths)))
+    ).all()
+    by_path: dict[str, list[ABCLogArchiveSegment]] = {}
+    for segment in segments:
+        by_path.setdefault(segment.path, []).append(segment)
+
+    purged = {str(pet_id) for pet_id in pet_ids}
+    for path, file_segments in by_path.items():
+        relative = _month_path(file_segments[0].period)
+        writer = await asyncio.to_thread(
+            _rewrite_without, f"{base}/{path}", f"{base}/{relative}", filesystem, purged
+        )
+        for segment in file_segments:
+            if str(segment.pet_id) in purged:
+                await db.delete(segment)
+            else:
+                segment.path = relative
+                segment.row_groups = writer.segments[str(segment.pet_id)].row_groups
+        after_commit(db, _unlinker(filesystem, f"{base}/{path}"))
+    await db.flush()
+    return len(by_path)
+
+
+async def archived_totals(db: AsyncSession, pet_id: uuid.UUID) -> tuple[int, int]:
+    """(row count, severity sum) of a pet's archived logs, from the manifest."""
+    result = await db.execute(
+        select(
+            func.coalesce(func.sum(ABCLogArchiveSegment.row_count), 0),
+            func.coalesce(func.sum(ABCLogArchiveSegment.severity_sum), 0),
+        ).where(ABCLogArchiveSegment.pet_id == pet_id)
+    )
+    count, severity_sum = result.one()
+    return int(count), int(severity_sum)
+
+
+async def read_archived_rows(
+    db: AsyncSession, user_id: uuid.UUID, pet_id: uuid.UUID | None = None
+) -> AsyncIterator[list[dict]]:
+    """Yield a user's (or one pet's) archived rows, one segment at a time.
+
+    Segments come in pet then month order, each sorted by ``occurred_at``.
+    """
+    query = (
+        select(ABCLogArchiveSegment)
+        .where(ABCLogArchiveSegment.user_id == user_id)
+        .order_by(
+            ABCLogArchiveSegment.pet_id,
+            ABCLogArchiveSegment.period,
+            ABCLogArchiveSegment.created_at,
+        )
+    )
+    if pet_id is not None:
+        query = query.where(ABCLogArchiveSegment.pet_id == pet_id)
+    segments = list((await db.execute(query)).scalars().all())
+    if not segments:
+        return
+
+    filesystem, base = archive_filesystem()
+    for segment in segments:
+        yield await asyncio.to_thread(
+            read_pet_rows,
+            f"{base.rstrip('/')}/{segment.path}",
+            filesystem,
+            segment.row_groups,
+            str(segment.pet_id),
+        )
+
+
+async def load_archived_logs(
+    db: AsyncSession, user_id: uuid.UUID, pet_id: uuid.UUID
+) -> list[ABCLog]:
+    """A pet's archived logs as detached ``ABCLog`` objects, oldest first."""
+    logs = []
+    async for rows in read_archived_rows(db, user_id, pet_id):
+        for row in rows:
+            for key in _UUID_COLUMNS:
+                row[key] = uuid.UUID(row[key])
+            if row["other_pets_present"] is not None:
+                row["other_pets_present"] = [uuid.UUID(p) for p in row["other_pets_present"]]
+            logs.append(ABCLog(**row))
+    return logs
@@ -0,0 +1,373 @@
+"""Batch generation of Behavior Intervention Plans (BIPs) via Message Batches.
+
+Pipeline:
+1. Collect eligible pets (enough logs, no active BIP, not already in flight).
+2. Precompute each pet's context from set-based aggregates -- one GROUPING
+   SETS scan over the pets' logs instead of loading every log.
+3. Submit all requests as a single Message Batch and record a checkpoint
+   (``bip_batch_runs``) so a restarted worker resumes instead of resubmitting.
+4. Poll until the batch ends (driven by the Celery task, not a blocking loop).
+   One poll chain owns a run at a time: it holds a lease (``claim_polling``)
+   that it renews on every poll, so resuming a run that is already being
+   polled doesn't start a second chain.
+5. Stream the results and bulk-insert plans, skipping pets already persisted;
+   ``(batch_run_id, pet_id)`` is unique, so a plan is never inserted twice.
+"""
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.taxonomy import BEHAVIOR_FUNCTIONS
+from app.models.abc_log import ABCLog
+from app.models.bip import BehaviorPlan, BipBatchRun
+from app.models.insight import Insight
+from app.models.pet import Pet
+from app.services.ai_analysis import SYSTEM_PROMPT
+from app.services.pattern_detection import MIN_LOGS_FOR_PATTERNS
+
+logger = logging.getLogger("pawlogic.ai")
+
+BIP_MODEL = "claude-sonnet-4-5-20250929"
+BIP_MAX_TOKENS = 1500
+TOP_N = 3
+PERSIST_CHUNK_SIZE = 100
+PENDING_TIMEOUT_SECONDS = 15 * 60
+# A poll chain's lease outlasts its countdown by this much, covering queue
+# delays and persisting the results
+POLL_LEASE_GRACE_SECONDS = 10 * 60
+
+BIP_INSTRUCTIONS = """Write a Behavior Intervention Plan for the pet described below.
+
+Respond with a single JSON object and nothing else, using these keys:
+- "target_behavior": the behavior category the plan targets
+- "function": one of "attention", "escape", "tangible", "sensory", or null if unclear
+- "summary": two or three plain-English sentences for the owner
+- "antecedent_strategies": list of ways to change the situations that trigger the behavior
+- "replacement_behaviors": list of behaviors to teach instead
+- "consequence_strategies": list of ways to respond so the behavior is not reinforced
+- "milestones": list of measurable goals for the next 4 weeks"""
+
+
+@dataclass
+class PetContext:
+    pet_id: uuid.UUID
+    user_id: uuid.UUID
+    name: str
+    species: str
+    breed: str | None
+    total_logs: int = 0
+    avg_severity: float | None = None
+    behaviors: list[tuple[str, int]] = field(default_factory=list)
+    antecedents: list[tuple[str, int]] = field(default_factory=list)
+    consequences: list[tuple[str, int]] = field(default_factory=list)
+    pairs: list[tuple[str, str, int]] = field(default_factory=list)
+    functions: list[str] = field(default_factory=list)
+
+    def render(self) -> str:
+        def fmt(items: list[tuple[str, int]]) -> str:
+            return ", ".join(f"{cat} ({n})" for cat, n in items) or "none"
+
+        incidents = f"Logged incidents: {self.total_logs}"
+        if self.avg_severity:
+            incidents += f", average severity {self.avg_severity:.1f}/5"
+        lines = [
+            f"Pet: {self.name} ({self.species}, {self.breed or 'unknown breed'})",
+            incidents,
+            f"Most frequent behaviors: {fmt(self.behaviors)}",
+            f"Most frequent antecedents: {fmt(self.antecedents)}",
+            f"Most frequent consequences: {fmt(self.consequences)}",
+            "Most frequent antecedent -> behavior pairs: "
+            + (", ".join(f"{a} -> {b} ({n})" for a, b, n in self.pairs) or "none"),
+        ]
+        if self.functions:
+            lines.append(f"Behavior functions identified so far: {', '.join(self.functions)}")
+        return "\n".join(lines)
+
+
+def anthropic_client():
+    """Async Anthropic client, honouring ``ANTHROPIC_BASE_URL`` for stub servers."""
+    import anthropic
+
+    return anthropic.AsyncAnthropic(
+        api_key=settings.ANTHROPIC_API_KEY, base_url=settings.ANTHROPIC_BASE_URL or None
+    )
+
+
+async def collect_eligible_pets(
+    db: AsyncSession, pet_ids: list[uuid.UUID] | None = None
+) -> list[Pet]:
+    """Pets with enough logs, no active BIP, and not part of an unfinished batch."""
+    in_flight = select(func.unnest(BipBatchRun.pet_ids)).where(
+        BipBatchRun.status.in_(("pending", "submitted"))
+    )
+    has_active_plan = (
+        select(BehaviorPlan.id)
+        .where(BehaviorPlan.pet_id == Pet.id, BehaviorPlan.status == "active")
+        .exists()
+    )
+    log_counts = (
+        select(ABCLog.pet_id).group_by(ABCLog.pet_id).having(func.count() >= MIN_LOGS_FOR_PATTERNS)
+    )
+    query = select(Pet).where(Pet.id.in_(log_counts), Pet.id.not_in(in_flight), ~has_active_plan)
+    if pet_ids:
+        query = query.where(Pet.id.in_(pet_ids))
+    result = await db.execute(query.order_by(Pet.id))
+    return list(result.scalars().all())
+
+
+async def build_contexts(db: AsyncSession, pets: list[Pet]) -> dict[uuid.UUID, PetContext]:
+    """Precompute prompt context for many pets from aggregate queries."""
+    contexts = {
+        pet.id: PetContext(
+            pet_id=pet.id, user_id=pet.user_id, name=pet.name, species=pet.species, breed=pet.breed
+        )
+        for pet in pets
+    }
+    if not contexts:
+        return contexts
+    ids = list(contexts)
+
+    # One scan: per-pet totals plus per-category and A->B pair counts.
+    grouped = await db.execute(
+        select(
+            ABCLog.pet_id,
+            ABCLog.antecedent_category,
+            ABCLog.behavior_category,
+            ABCLog.consequence_category,
+            func.count().label("n"),
+            func.avg(ABCLog.behavior_severity).label("avg_severity"),
+        )
+        .where(ABCLog.pet_id.in_(ids))
+        .group_by(
+            func.grouping_sets(
+                tuple_(ABCLog.pet_id),
+                tuple_(ABCLog.pet_id, ABCLog.behavior_category),
+                tuple_(ABCLog.pet_id, ABCLog.antecedent_category),
+                tuple_(ABCLog.pet_id, ABCLog.consequence_category),
+                tuple_(ABCLog.pet_id, ABCLog.antecedent_category, ABCLog.behavior_category),
+            )
+        )
+    )
+    for row in grouped.all():
+        ctx = contexts[row.pet_id]
+        a, b, c = row.antecedent_category, row.behavior_category, row.consequence_category
+        if a is None and b is None and c is None:
+            ctx.total_logs = row.n
+            ctx.avg_severity = float(row.avg_severity) if row.avg_severity else None
+        elif a is not None and b is not None:
+            ctx.pairs.append((a, b, row.n))
+        elif b is not None:
+            ctx.behaviors.append((b, row.n))
+        elif a is not None:
+            ctx.antecedents.append((a, row.n))
+        else:
+            ctx.consequences.append((c, row.n))
+
+    for ctx in contexts.values():
+        for attr in ("behaviors", "antecedents", "consequences", "pairs"):
+            items = sorted(getattr(ctx, attr), key=lambda item: -item[-1])
+            setattr(ctx, attr, items[:TOP_N])
+
+    functions = await db.execute(
+        select(Insight.pet_id, Insight.behavior_function)
+        .where(
+            Insight.pet_id.in_(ids),
+            Insight.insight_type == "function",
+            Insight.behavior_function.is_not(None),
+        )
+        .distinct()
+    )
+    for pet_id, fn in functions.all():
+        contexts[pet_id].functions.append(fn)
+
+    return contexts
+
+
+def build_request(ctx: PetContext) -> dict:
+    """One Message Batches request; ``custom_id`` is the pet ID."""
+    return {
+        "custom_id": str(ctx.pet_id),
+        "params": {
+            "model": BIP_MODEL,
+            "max_tokens": BIP_MAX_TOKENS,
+            "system": SYSTEM_PROMPT,
+            "messages": [{"role": "user", "content": f"{BIP_INSTRUCTIONS}\n\n{ctx.render()}"}],
+        },
+    }
+
+
+def parse_plan(text: str, fallback_behavior: str | None) -> dict:
+    """Parse the model's JSON plan, keeping the raw text if it is not valid JSON."""
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        plan = json.loads(text[start : end + 1]) if start != -1 else None
+    except json.JSONDecodeError:
+        plan = None
+    if not isinstance(plan, dict):
+        plan = {"summary": text.strip(), "unstructured": True}
+
+    if plan.get("function") not in BEHAVIOR_FUNCTIONS:
+        plan["function"] = None
+    target = str(plan.get("target_behavior") or fallback_behavior or "unspecified")
+    plan["target_behavior"] = target[:50]
+    return plan
+
+
+async def submit(db: AsyncSession, client, pets: list[Pet]) -> BipBatchRun | None:
+    """Build contexts for ``pets``, submit one batch and checkpoint it."""
+    contexts = await build_contexts(db, pets)
+    if not contexts:
+        return None
+
+    run = BipBatchRun(pet_ids=list(contexts), status="pending")
+    db.add(run)
+    await db.commit()
+
+    try:
+        batch = await client.messages.batches.create(
+            requests=[build_request(ctx) for ctx in contexts.values()]
+        )
+    except Exception:
+        run.status = "failed"
+        await db.commit()
+        raise
+    run.provider_batch_id = batch.id
+    run.status = "submitted"
+    await db.commit()
+    logger.info("Submitted BIP batch %s for %d pets", batch.id, len(contexts))
+    return run
+
+
+async def expire_pending(db: AsyncSession) -> int:
+    """Fail runs that never got a provider batch ID (worker died mid-submit).
+
+    Their pets become eligible again on the next run.
+    """
+    cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=PENDING_TIMEOUT_SECONDS)
+    result = await db.execute(
+        update(BipBatchRun)
+        .where(BipBatchRun.status == "pending", BipBatchRun.created_at < cutoff)
+        .values(status="failed", completed_at=func.now())
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def open_runs(db: AsyncSession) -> list[BipBatchRun]:
+    """Submitted-but-unfinished runs, oldest first, for a worker to resume."""
+    result = await db.execute(
+        select(BipBatchRun)
+        .where(BipBatchRun.status == "submitted")
+        .order_by(BipBatchRun.created_at)
+    )
+    return list(result.scalars().all())
+
+
+async def claim_polling(
+    db: AsyncSession, run_id: uuid.UUID, token: uuid.UUID | None = None
+) -> uuid.UUID | None:
+    """Take the lease on polling a submitted run, or renew it with ``token``.
+
+    Without a token this succeeds only if no poll chain holds an unexpired
+    lease; with one, only if the lease is still that chain's. Returns the
+    token to poll with, or ``None`` if another chain owns the run or it is
+    no longer submitted.
+    """
+    if token is None:
+        new_token = uuid.uuid4()
+        holder = or_(
+            BipBatchRun.poll_lease_until.is_(None), BipBatchRun.poll_lease_until < func.now()
+        )
+    else:
+        new_token, holder = token, BipBatchRun.poll_token == token
+    lease = timedelta(seconds=settings.BIP_BATCH_POLL_SECONDS + POLL_LEASE_GRACE_SECONDS)
+    result = await db.execute(
+        update(BipBatchRun)
+        .where(BipBatchRun.id == run_id, BipBatchRun.status == "submitted", holder)
+        .values(poll_token=new_token, poll_lease_until=func.now() + lease)
+        .returning(BipBatchRun.id)
+    )
+    claimed = result.scalar_one_or_none() is not None
+    await db.commit()
+    return new_token if claimed else None
+
+
+async def batch_ended(client, run: BipBatchRun) -> bool:
+    batch = await client.messages.batches.retrieve(run.provider_batch_id)
+    return batch.processing_status == "ended"
+
+
+async def persist_results(db: AsyncSession, client, run: BipBatchRun) -> dict:
+    """Stream batch results and bulk-insert plans for pets not yet persisted."""
+    done = await db.execute(select(BehaviorPlan.pet_id).where(BehaviorPlan.batch_run_id == run.id))
+    persisted = set(done.scalars().all())
+
+    pets = await db.execute(select(Pet.id, Pet.user_id).where(Pet.id.in_(run.pet_ids)))
+    owners = dict(pets.all())
+    behavior_counts = await db.execute(
+        select(ABCLog.pet_id, ABCLog.behavior_category, func.count())
+        .where(ABCLog.pet_id.in_(run.pet_ids))
+        .group_by(ABCLog.pet_id, ABCLog.behavior_category)
+    )
+    fallback_behavior: dict[uuid.UUID, str] = {}
+    top_counts: dict[uuid.UUID, int] = {}
+    for pet_id, behavior, n in behavior_counts.all():
+        if n > top_counts.get(pet_id, 0):
+            top_counts[pet_id] = n
+            fallback_behavior[pet_id] = behavior
+
+    rows: list[dict] = []
+    succeeded = errored = 0
+
+    async def flush() -> None:
+        if rows:
+            await db.execute(
+                insert(BehaviorPlan)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["batch_run_id", "pet_id"])
+            )
+            await db.commit()
+            rows.clear()
+
+    async for item in await client.messages.batches.results(run.provider_batch_id):
+        pet_id = uuid.UUID(item.custom_id)
+        if item.result.type != "succeeded":
+            errored += 1
+            logger.warning("BIP request for pet %s %s", pet_id, item.result.type)
+            continue
+        succeeded += 1
+        if pet_id in persisted or pet_id not in owners:
+            continue
+
+        message = item.result.message
+        plan = parse_plan(message.content[0].text, fallback_behavior.get(pet_id))
+        rows.append(
+            {
+                "pet_id": pet_id,
+                "user_id": owners[pet_id],
+                "batch_run_id": run.id,
+                "target_behavior": plan["target_behavior"],
+                "function": plan["function"],
+                "plan_data": plan,
+                "model": message.model,
+            }
+        )
+        if len(rows) >= PERSIST_CHUNK_SIZE:
+            await flush()
+    await flush()
+
+    run.status = "completed"
+    run.succeeded = succeeded
+    run.errored = errored
+    run.completed_at = datetime.now(UTC).replace(tzinfo=None)
+    await db.commit()
+    logger.info("BIP batch %s: %d succeeded, %d errored", run.provider_batch_id, succeeded, errored)
+    return {"run_id": str(run.id), "succeeded": succeeded, "errored": errored}
@@ -0,0 +1,330 @@
+"""Answer cache that sits in front of the coaching LLM call.
+
+Many coaching questions are near-duplicates per species ("why does my cat
+pee outside the box"). Answers are bucketed by a pet profile (species plus
+dominant behavior categories) and matched in two tiers:
+
+1. Exact match on the normalized question.
+2. Lexical similarity -- TF-IDF vectors over unigrams and bigrams, scored
+   with NumPy cosine similarity against the entries in the same bucket.
+
+Entries come from a precomputed FAQ file (``COACHING_FAQ_PATH``) or from
+previously generated LLM answers. FAQ answers are generic and shared by
+every pet of the species. A generated answer draws on one pet's logs and
+history, so it is stored under a scope (the user and pet it was generated
+for) and only served back within it. The cache is process-local and bounded:
+entries expire after a TTL and the least recently used entry is evicted
+once ``max_entries`` is reached.
+"""
+
+import json
+import logging
+import math
+import re
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.config import settings
+from app.core.text import tokenize
+
+logger = logging.getLogger("pawlogic.ai")
+
+# Placeholder stored in cached answers in place of the pet's name, so an
+# answer still reads right after the pet is renamed.
+PET_NAME_PLACEHOLDER = "[[pet_name]]"
+
+# Number of dominant behavior categories that make up a profile.
+PROFILE_BEHAVIOR_COUNT = 2
+
+
+def _terms(tokens: list[str]) -> list[str]:
+    """Unigrams plus adjacent bigrams for a token list."""
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False)]
+
+
+def profile_key(species: str, behavior_categories: Iterable[str] = ()) -> str:
+    """Build the bucket key for a species and its dominant behavior categories."""
+    behaviors = sorted(set(behavior_categories))[:PROFILE_BEHAVIOR_COUNT]
+    return "|".join([species, *behaviors])
+
+
+def _scoped(profile: str, scope: str | None) -> str:
+    return f"{scope}#{profile}" if scope else profile
+
+
+def dominant_behaviors(categories: Iterable[str]) -> list[str]:
+    """Return the most frequent behavior categories from a pet's recent logs."""
+    counts = Counter(categories)
+    return [cat for cat, _ in counts.most_common(PROFILE_BEHAVIOR_COUNT)]
+
+
+@dataclass
+class CachedAnswer:
+    profile: str
+    question: str
+    answer: str
+    model: str
+    terms: list[str]
+    created_at: float = field(default_factory=time.monotonic)
+    hits: int = 0
+    # Precomputed FAQ answers are exempt from TTL and LRU eviction.
+    pinned: bool = False
+
+
+class _Bucket:
+    """Entries sharing a profile key, with a lazily built TF-IDF matrix."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, CachedAnswer] = {}
+        self._matrix: np.ndarray | None = None
+        self._vocab: dict[str, int] = {}
+        self._idf: np.ndarray | None = None
+        self._keys: list[str] = []
+
+    def add(self, key: str, entry: CachedAnswer) -> None:
+        self.entries[key] = entry
+        self._matrix = None
+
+    def remove(self, key: str) -> None:
+        if self.entries.pop(key, None) is not None:
+            self._matrix = None
+
+    def _build(self) -> None:
+        self._keys = list(self.entries)
+        vocab: dict[str, int] = {}
+        for key in self._keys:
+            for term in set(self.entries[key].terms):
+                vocab.setdefault(term, len(vocab))
+
+        df = np.zeros(len(vocab))
+        rows = np.zeros((len(self._keys), len(vocab)))
+        for i, key in enumerate(self._keys):
+            for term, count in Counter(self.entries[key].terms).items():
+                j = vocab[term]
+                rows[i, j] = count
+                df[j] += 1
+
+        n_docs = len(self._keys)
+        self._idf = np.log((1 + n_docs) / (1 + df)) + 1
+        rows *= self._idf
+        norms = np.linalg.norm(rows, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._matrix = rows / norms
+        self._vocab = vocab
+
+    def best_match(self, terms: list[str]) -> tuple[str, float] | None:
+        """Return the key and cosine similarity of the closest entry."""
+        if not self.entries or not terms:
+            return None
+        if self._matrix is None:
+            self._build()
+
+        n_docs = len(self._keys)
+        unseen_idf = math.log(1 + n_docs) + 1
+        query = np.zeros(len(self._vocab))
+        unseen_weight = 0.0
+        for term, count in Counter(terms).items():
+            j = self._vocab.get(term)
+            if j is None:
+                # Terms the bucket has never seen still count toward the
+                # query norm, so rare words lower the similarity.
+                unseen_weight += (count * unseen_idf) ** 2
+            else:
+                query[j] = count * self._idf[j]
+
+        norm = math.sqrt(float(query @ query) + unseen_weight)
+        if norm == 0:
+            return None
+        scores = self._matrix @ (query / norm)
+        best = int(np.argmax(scores))
+        return self._keys[best], float(scores[best])
+
+
+class CoachingAnswerCache:
+    """Process-local TTL + LRU cache of coaching answers keyed by pet profile."""
+
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        min_similarity: float = 0.7,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.min_similarity = min_similarity
+        self._lru: OrderedDict[str, CachedAnswer] = OrderedDict()
+        self._buckets: dict[str, _Bucket] = {}
+        self.stats = {"exact_hits": 0, "similar_hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @staticmethod
+    def _key(profile: str, terms: list[str]) -> str:
+        return f"{profile}::{' '.join(terms)}"
+
+    def _drop(self, key: str) -> None:
+        entry = self._lru.pop(key, None)
+        if entry is None:
+            return
+        bucket = self._buckets.get(entry.profile)
+        if bucket is not None:
+            bucket.remove(key)
+            if not bucket.entries:
+                del self._buckets[entry.profile]
+
+    def _expired(self, entry: CachedAnswer, now: float) -> bool:
+        return not entry.pinned and now - entry.created_at > self.ttl_seconds
+
+    def _purge_expired(self, profile: str, now: float) -> None:
+        bucket = self._buckets.get(profile)
+        if bucket is None:
+            return
+        for key in [k for k, e in bucket.entries.items() if self._expired(e, now)]:
+            self._drop(key)
+
+    def put(
+        self,
+        species: str,
+        behaviors: Iterable[str],
+        question: str,
+        answer: str,
+        model: str,
+        pet_name: str | None = None,
+        pinned: bool = False,
+        scope: str | None = None,
+    ) -> None:
+        """Store an answer, replacing the pet's name with a placeholder.
+
+        Only pinned (FAQ) answers may be stored unscoped, i.e. shared.
+        """
+        if not pinned and scope is None:
+            raise ValueError("Generated coaching answers must be scoped to a pet")
+        profile = _scoped(profile_key(species, behaviors), scope)
+        terms = _terms(tokenize(question, pet_name))
+        if not terms:
+            return
+        if pet_name:
+            answer = re.sub(rf"\b{re.escape(pet_name)}\b", PET_NAME_PLACEHOLDER, answer)
+
+        key = self._key(profile, terms)
+        self._drop(key)
+        entry = CachedAnswer(
+            profile=profile,
+            question=question,
+            answer=answer,
+            model=model,
+            terms=terms,
+            pinned=pinned,
+        )
+        self._lru[key] = entry
+        self._buckets.setdefault(profile, _Bucket()).add(key, entry)
+
+        while len(self._lru) > self.max_entries:
+            oldest = next((k for k, e in self._lru.items() if not e.pinned), None)
+            if oldest is None:
+                break
+            self._drop(oldest)
+            self.stats["evictions"] += 1
+
+    def get(
+        self,
+        species: str,
+        behaviors: Iterable[str],
+        question: str,
+        pet_name: str | None = None,
+        scope: str | None = None,
+    ) -> CachedAnswer | None:
+        """Look up an answer for the profile, falling back to the species-wide FAQ.
+
+        Answers generated within ``scope`` are checked first, then the shared
+        FAQ answers. Returns a copy of the entry with the pet's name
+        substituted back in, or ``None`` on a miss.
+        """
+        terms = _terms(tokenize(question, pet_name))
+        now = time.monotonic()
+        behaviors = list(behaviors)
+        shared = [profile_key(species, behaviors)]
+        if behaviors:
+            shared.append(profile_key(species))
+        profiles = [_scoped(profile, scope) for profile in shared] if scope else []
+        profiles += shared
+
+        for profile in profiles:
+            self._purge_expired(profile, now)
+            entry = self._lookup(profile, terms)
+            if entry is not None:
+                entry.hits += 1
+                answer = entry.answer.replace(PET_NAME_PLACEHOLDER, pet_name or "your pet")
+                return CachedAnswer(
+                    profile=entry.profile,
+                    question=entry.question,
+                    answer=answer,
+                    model=entry.model,
+                    terms=entry.terms,
+                    created_at=entry.created_at,
+                    hits=entry.hits,
+                    pinned=entry.pinned,
+                )
+
+        self.stats["misses"] += 1
+        return None
+
+    def _lookup(self, profile: str, terms: list[str]) -> CachedAnswer | None:
+        key = self._key(profile, terms)
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.stats["exact_hits"] += 1
+            return self._lru[key]
+
+        bucket = self._buckets.get(profile)
+        if bucket is None:
+            return None
+        match = bucket.best_match(terms)
+        if match is None or match[1] < self.min_similarity:
+            return None
+        self._lru.move_to_end(match[0])
+        self.stats["similar_hits"] += 1
+        return self._lru[match[0]]
+
+    def load_faq(self, path: str) -> int:
+        """Seed precomputed answers from a JSON file.
+
+        The file holds a list of objects with ``species``, ``question`` and
+        ``answer`` keys and an optional ``behaviors`` list. Returns the number
+        of entries loaded.
+        """
+        with open(path, encoding="utf-8") as fh:
+            items = json.load(fh)
+        for item in items:
+            self.put(
+                item["species"],
+                item.get("behaviors", []),
+                item["question"],
+                item["answer"],
+                model="faq",
+                pinned=True,
+            )
+        return len(items)
+
+    def clear(self) -> None:
+        self._lru.clear()
+        self._buckets.clear()
+
+
+coaching_cache = CoachingAnswerCache(
+    max_entries=settings.COACHING_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.COACHING_CACHE_TTL_SECONDS,
+    min_similarity=settings.COACHING_CACHE_MIN_SIMILARITY,
+)
+
+if settings.COACHING_FAQ_PATH:
+    try:
+        loaded = coaching_cache.load_faq(settings.COACHING_FAQ_PATH)
+        logger.info("Loaded %d precomputed coaching answers", loaded)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.error("Failed to load coaching FAQ from %s: %s", settings.COACHING_FAQ_PATH, exc)
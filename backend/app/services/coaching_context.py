@@ -0,0 +1,288 @@
+"""Single round-trip reads and writes for a coaching turn.
+
+A turn needs the pet, its recent logs and insights, and (when resuming) the
+tail of the session. ``load_coaching_context`` fetches all of it in one
+statement: CTEs for the owned pet and session, with ``json_agg`` LATERAL
+subqueries for the row sets. The same statement returns the logs and
+messages past the pet's history-index watermarks and its log count, so the
+index refresh needs no query of its own. ``record_coaching_turn`` writes the
+session insert/update and both messages as a single multi-row INSERT.
+"""
+
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import JSON, bindparam, insert, text, update
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.abc_log import ABCLog
+from app.models.coaching_session import CoachingMessage, CoachingSession
+from app.models.insight import Insight
+from app.models.pet import Pet
+from app.services.history_index import IndexDelta, history_index
+
+CONTEXT_LOG_LIMIT = 20
+CONTEXT_INSIGHT_LIMIT = 10
+HISTORY_MESSAGE_LIMIT = 20
+
+_CONTEXT_SQL = (
+    text(
+        """
+        WITH pet AS (
+            SELECT id, name, species, breed, age_years, sex
+            FROM pets
+            WHERE id = :pet_id AND user_id = :user_id
+        ),
+        sess AS (
+            SELECT id, pet_id, message_count
+            FROM coaching_sessions
+            WHERE id = :session_id AND user_id = :user_id
+        )
+        SELECT
+            (SELECT row_to_json(pet) FROM pet) AS pet,
+            (SELECT row_to_json(sess) FROM sess) AS session,
+            logs.items AS logs,
+            insights.items AS insights,
+            history.items AS history,
+            new_logs.items AS new_logs,
+            new_messages.items AS new_messages,
+            (SELECT count(*) FROM abc_logs WHERE pet_id = (SELECT id FROM pet)) AS log_count
+        FROM (SELECT 1) AS one
+        CROSS JOIN LATERAL (
+            SELECT coalesce(json_agg(l ORDER BY l.occurred_at DESC), '[]'::json) AS items
+            FROM (
+                SELECT id, occurred_at, antecedent_category, antecedent_tags,
+                       behavior_category, behavior_tags, behavior_severity,
+                       consequence_category, consequence_tags
+                FROM abc_logs
+                WHERE pet_id = (SELECT id FROM pet)
+                ORDER BY occurred_at DESC
+                LIMIT :log_limit
+            ) l
+        ) logs
+        CROSS JOIN LATERAL (
+            SELECT coalesce(json_agg(i ORDER BY i.created_at DESC), '[]'::json) AS items
+            FROM (
+                SELECT title, behavior_function, created_at
+                FROM insights
+                WHERE pet_id = (SELECT id FROM pet)
+                ORDER BY created_at DESC
+                LIMIT :insight_limit
+            ) i
+        ) insights
+        CROSS JOIN LATERAL (
+            SELECT coalesce(json_agg(m ORDER BY m.created_at, m.id), '[]'::json) AS items
+            FROM (
+                SELECT id, role, content, created_at
+                FROM coaching_messages
+                WHERE session_id = (SELECT id FROM sess)
+                ORDER BY created_at DESC, id DESC
+                LIMIT :history_limit
+            ) m
+        ) history
+        CROSS JOIN LATERAL (
+            SELECT coalesce(json_agg(l ORDER BY l.created_at, l.id), '[]'::json) AS items
+            FROM (
+                SELECT id, created_at, occurred_at, antecedent_category, antecedent_tags,
+                       antecedent_notes, behavior_category, behavior_tags,
+                       behavior_severity, behavior_notes, consequence_category,
+                       consequence_tags, consequence_notes, location
+                FROM abc_logs
+                WHERE pet_id = (SELECT id FROM pet)
+                  AND (CAST(:log_after_ts AS timestamp) IS NULL
+                       OR (created_at, id) > (CAST(:log_after_ts AS timestamp),
+                                              CAST(:log_after_id AS uuid)))
+            ) l
+        ) new_logs
+        CROSS JOIN LATERAL (
+            SELECT coalesce(json_agg(m ORDER BY m.created_at, m.id), '[]'::json) AS items
+            FROM (
+                SELECT cm.id, cm.role, cm.content, cm.created_at
+                FROM coaching_messages cm
+                JOIN coaching_sessions cs ON cs.id = cm.session_id
+                WHERE cs.pet_id = (SELECT id FROM pet)
+                  AND (CAST(:message_after_ts AS timestamp) IS NULL
+                       OR (cm.created_at, cm.id) > (CAST(:message_after_ts AS timestamp),
+                                                    CAST(:message_after_id AS uuid)))
+            ) m
+        ) new_messages
+        """
+    )
+    .bindparams(
+        bindparam("pet_id", type_=UUID(as_uuid=True)),
+        bindparam("user_id", type_=UUID(as_uuid=True)),
+        bindparam("session_id", type_=UUID(as_uuid=True)),
+    )
+    .columns(
+        pet=JSON,
+        session=JSON,
+        logs=JSON,
+        insights=JSON,
+        history=JSON,
+        new_logs=JSON,
+        new_messages=JSON,
+    )
+)
+
+
+@dataclass
+class CoachingContext:
+    """Everything a coaching turn reads, as detached (transient) model objects."""
+
+    pet: Pet | None
+    session_found: bool = False
+    logs: list[ABCLog] = field(default_factory=list)
+    insights: list[Insight] = field(default_factory=list)
+    history: list[dict] = field(default_factory=list)
+    index_delta: IndexDelta | None = None
+
+
+def _log(row: dict) -> ABCLog:
+    values = {
+        **row,
+        "id": uuid.UUID(row["id"]),
+        "occurred_at": datetime.fromisoformat(row["occurred_at"]),
+    }
+    if "created_at" in row:
+        values["created_at"] = datetime.fromisoformat(row["created_at"])
+    return ABCLog(**values)
+
+
+def _message(row: dict) -> CoachingMessage:
+    return CoachingMessage(
+        id=uuid.UUID(row["id"]),
+        role=row["role"],
+        content=row["content"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+    )
+
+
+def _split(
+    watermark: tuple[datetime, uuid.UUID] | None,
+) -> tuple[datetime | None, uuid.UUID | None]:
+    return watermark if watermark is not None else (None, None)
+
+
+async def load_coaching_context(
+    db: AsyncSession,
+    pet_id: uuid.UUID,
+    user_id: uuid.UUID,
+    session_id: uuid.UUID | None = None,
+) -> CoachingContext:
+    """Load the pet (if owned), recent logs, insights, session tail and
+    history-index delta in one query."""
+    log_watermark, message_watermark = history_index.watermarks(pet_id)
+    log_after_ts, log_after_id = _split(log_watermark)
+    message_after_ts, message_after_id = _split(message_watermark)
+    result = await db.execute(
+        _CONTEXT_SQL,
+        {
+            "pet_id": pet_id,
+            "user_id": user_id,
+            "session_id": session_id,
+            "log_limit": CONTEXT_LOG_LIMIT,
+            "insight_limit": CONTEXT_INSIGHT_LIMIT,
+            "history_limit": HISTORY_MESSAGE_LIMIT,
+            "log_after_ts": log_after_ts,
+            "log_after_id": log_after_id,
+            "message_after_ts": message_after_ts,
+            "message_after_id": message_after_id,
+        },
+    )
+    row = result.one()
+    if row.pet is None:
+        return CoachingContext(pet=None)
+
+    return CoachingContext(
+        pet=Pet(**{**row.pet, "id": uuid.UUID(row.pet["id"]), "user_id": user_id}),
+        session_found=row.session is not None,
+        logs=[_log(log) for log in row.logs],
+        insights=[
+            Insight(title=ins["title"], behavior_function=ins["behavior_function"])
+            for ins in row.insights
+        ],
+        history=[{"role": msg["role"], "content": msg["content"]} for msg in row.history],
+        index_delta=IndexDelta(
+            log_watermark=log_watermark,
+            message_watermark=message_watermark,
+            logs=[_log(log) for log in row.new_logs],
+            messages=[_message(msg) for msg in row.new_messages],
+            log_count=row.log_count,
+        ),
+    )
+
+
+def _message_row(
+    session_id: uuid.UUID, role: str, content: str, created_at: datetime, **fields
+) -> dict:
+    # Multi-row VALUES needs the same keys in every row.
+    return {
+        "id": uuid.uuid4(),
+        "session_id": session_id,
+        "role": role,
+        "content": content,
+        "model": fields.get("model"),
+        "latency_ms": fields.get("latency_ms"),
+        "ttft_ms": fields.get("ttft_ms"),
+        "input_tokens": fields.get("input_tokens"),
+        "output_tokens": fields.get("output_tokens"),
+        "cached_tokens": fields.get("cached_tokens"),
+        "fallback_reason": fields.get("fallback_reason"),
+        "cache_hit": fields.get("cache_hit", False),
+        "created_at": created_at,
+    }
+
+
+async def record_coaching_turn(
+    db: AsyncSession,
+    *,
+    session_id: uuid.UUID | None,
+    pet_id: uuid.UUID,
+    user_id: uuid.UUID,
+    question: str,
+    asked_at: datetime,
+    answer: str,
+    answered_at: datetime,
+    model: str | None,
+    telemetry: dict,
+) -> uuid.UUID:
+    """Persist one question/answer exchange; returns the session ID.
+
+    Creates the session (new conversation) or bumps its timestamp and
+    message count in a data-modifying CTE of the same INSERT that writes
+    both messages. Explicit timestamps keep the question ordered before the
+    answer within the session.
+    """
+    if session_id is None:
+        session_id = uuid.uuid4()
+        session_write = insert(CoachingSession.__table__).values(
+            id=session_id,
+            pet_id=pet_id,
+            user_id=user_id,
+            title=question[:100].strip(),
+            message_count=2,
+            created_at=asked_at,
+            updated_at=answered_at,
+        )
+    else:
+        session_write = (
+            update(CoachingSession.__table__)
+            .where(CoachingSession.id == session_id)
+            .values(updated_at=answered_at, message_count=CoachingSession.message_count + 2)
+        )
+
+    await db.execute(
+        insert(CoachingMessage.__table__)
+        .values(
+            [
+                _message_row(session_id, "user", question, asked_at),
+                _message_row(
+                    session_id, "assistant", answer, answered_at, model=model, **telemetry
+                ),
+            ]
+        )
+        .add_cte(session_write.cte("session_write"))
+    )
+    return session_id
@@ -0,0 +1,125 @@
+"""Rebuild and consistency checks for the ``pet_daily_stats`` rollup.
+
+The rollup is kept current by triggers on ``abc_logs``; this module is for
+repairing it. Months that have been archived are skipped by both the
+rebuild and the check: their raw rows are gone from ``abc_logs``, and their
+rollup rows are the only per-day record left.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ROLLUP_COLUMNS = (
+    "log_count",
+    "severity_sum",
+    "severity_max",
+    "behavior_counts",
+    "antecedent_counts",
+    "consequence_counts",
+)
+
+_RAW_DAILY = """
+    SELECT pet_id, occurred_at::date AS day, count(*) AS log_count,
+        sum(behavior_severity) AS severity_sum, max(behavior_severity) AS severity_max,
+        jsonb_count_agg(behavior_category) AS behavior_counts,
+        jsonb_count_agg(antecedent_category) AS antecedent_counts,
+        jsonb_count_agg(consequence_category) AS consequence_counts
+    FROM abc_logs
+    WHERE :pet_id IS NULL OR pet_id = :pet_id
+    GROUP BY 1, 2
+"""
+
+_NOT_ARCHIVED = """
+    NOT EXISTS (
+        SELECT 1 FROM abc_log_archive_segments a
+        WHERE a.pet_id = {alias}.pet_id AND a.period = date_trunc('month', {alias}.day)::date
+    )
+"""
+
+_PET_ID = bindparam("pet_id", type_=UUID(as_uuid=True))
+
+_DELETE_SQL = text(
+    f"""
+    DELETE FROM pet_daily_stats s
+    WHERE (:pet_id IS NULL OR s.pet_id = :pet_id) AND {_NOT_ARCHIVED.format(alias="s")}
+    """
+).bindparams(_PET_ID)
+
+_INSERT_SQL = text(
+    f"""
+    INSERT INTO pet_daily_stats (pet_id, day, {", ".join(ROLLUP_COLUMNS)})
+    SELECT r.* FROM ({_RAW_DAILY}) r
+    WHERE {_NOT_ARCHIVED.format(alias="r")}
+    """
+).bindparams(_PET_ID)
+
+_BUMP_VERSIONS_SQL = text(
+    "SELECT bump_pet_data_versions("
+    "ARRAY(SELECT id FROM pets WHERE :pet_id IS NULL OR id = :pet_id))"
+).bindparams(_PET_ID)
+
+_CHECK_SQL = text(
+    f"""
+    SELECT coalesce(r.pet_id, s.pet_id) AS pet_id, coalesce(r.day, s.day) AS day,
+        {", ".join(f"r.{c} AS raw_{c}, s.{c} AS rollup_{c}" for c in ROLLUP_COLUMNS)}
+    FROM ({_RAW_DAILY}) r
+    FULL JOIN (
+        SELECT * FROM pet_daily_stats WHERE :pet_id IS NULL OR pet_id = :pet_id
+    ) s ON s.pet_id = r.pet_id AND s.day = r.day
+    WHERE ({", ".join(f"r.{c}" for c in ROLLUP_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"s.{c}" for c in ROLLUP_COLUMNS)})
+      AND NOT EXISTS (
+        SELECT 1 FROM abc_log_archive_segments a
+        WHERE a.pet_id = coalesce(r.pet_id, s.pet_id)
+          AND a.period = date_trunc('month', coalesce(r.day, s.day))::date
+      )
+    ORDER BY 1, 2
+    """
+).bindparams(_PET_ID)
+
+
+@dataclass
+class StatsMismatch:
+    pet_id: uuid.UUID
+    day: date
+    raw: dict | None  # None: rollup row with no logs behind it
+    rollup: dict | None  # None: logs with no rollup row
+
+
+async def rebuild_daily_stats(db: AsyncSession, pet_id: uuid.UUID | None = None) -> int:
+    """Recompute the rollup from ``abc_logs`` (all pets, or one); returns rows written.
+
+    Holds a SHARE lock on ``abc_logs`` until the caller commits, so log
+    writes wait rather than race the rebuild.
+    """
+    await db.execute(text("LOCK TABLE abc_logs IN SHARE MODE"))
+    await db.execute(_DELETE_SQL, {"pet_id": pet_id})
+    result = await db.execute(_INSERT_SQL, {"pet_id": pet_id})
+    # Stats cached against the old rollup are stale now
+    await db.execute(_BUMP_VERSIONS_SQL, {"pet_id": pet_id})
+    return result.rowcount
+
+
+async def check_daily_stats(
+    db: AsyncSession, pet_id: uuid.UUID | None = None
+) -> list[StatsMismatch]:
+    """Days where the rollup disagrees with the raw logs."""
+    result = await db.execute(_CHECK_SQL, {"pet_id": pet_id})
+    mismatches = []
+    for row in result.mappings():
+        raw = {c: row[f"raw_{c}"] for c in ROLLUP_COLUMNS}
+        rollup = {c: row[f"rollup_{c}"] for c in ROLLUP_COLUMNS}
+        mismatches.append(
+            StatsMismatch(
+                pet_id=row["pet_id"],
+                day=row["day"],
+                raw=raw if raw["log_count"] is not None else None,
+                rollup=rollup if rollup["log_count"] is not None else None,
+            )
+        )
+    return mismatches
@@ -0,0 +1,206 @@
+"""Streaming exports of a user's behavior history.
+
+Rows are read through a server-side cursor (``yield_per``) on a session
+owned by the stream, encoded as NDJSON or CSV one fetch batch at a time, and
+optionally gzipped on the fly -- memory use stays flat however many rows
+the export covers. ABC log exports include archived months, read back from
+the cold tier one pet-month at a time.
+"""
+
+import csv
+import io
+import json
+import uuid
+import zlib
+from collections.abc import AsyncIterator
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal
+
+from sqlalchemy import Select, select
+
+from app.db.session import async_session_factory
+from app.models.abc_log import ABCLog
+from app.models.coaching_session import CoachingMessage, CoachingSession
+from app.models.insight import Insight
+from app.services.archive import read_archived_rows
+
+# Rows fetched from the server-side cursor per round trip; each batch is
+# encoded and flushed to the client as one chunk.
+EXPORT_FETCH_ROWS = 1000
+
+ExportDataset = Literal["abc-logs", "insights", "coaching-messages"]
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_query(
+    dataset: ExportDataset, user_id: uuid.UUID, pet_id: uuid.UUID | None = None
+) -> Select:
+    """The rows of one dataset for a user (optionally one pet), in index order.
+
+    For ABC logs that is ``(pet_id, occurred_at, id)``, the order
+    ``stream_export`` keeps when it splices archived months back in.
+    """
+    if dataset == "abc-logs":
+        query = (
+            select(
+                ABCLog.id,
+                ABCLog.pet_id,
+                ABCLog.occurred_at,
+                ABCLog.antecedent_category,
+                ABCLog.antecedent_tags,
+                ABCLog.antecedent_notes,
+                ABCLog.behavior_category,
+                ABCLog.behavior_tags,
+                ABCLog.behavior_severity,
+                ABCLog.behavior_notes,
+                ABCLog.consequence_category,
+                ABCLog.consequence_tags,
+                ABCLog.consequence_notes,
+                ABCLog.location,
+                ABCLog.duration_seconds,
+                ABCLog.other_pets_present,
+                ABCLog.created_at,
+            )
+            .where(ABCLog.user_id == user_id)
+            # Walks idx_abc_logs_pet_occurred, so no sort step
+            .order_by(ABCLog.pet_id, ABCLog.occurred_at, ABCLog.id)
+        )
+        pet_column = ABCLog.pet_id
+    elif dataset == "insights":
+        query = (
+            select(
+                Insight.id,
+                Insight.pet_id,
+                Insight.insight_type,
+                Insight.title,
+                Insight.body,
+                Insight.confidence,
+                Insight.behavior_function,
+                Insight.abc_log_ids,
+                Insight.is_read,
+                Insight.created_at,
+            )
+            .where(Insight.user_id == user_id)
+            .order_by(Insight.pet_id, Insight.created_at, Insight.id)
+        )
+        pet_column = Insight.pet_id
+    else:
+        query = (
+            select(
+                CoachingMessage.id,
+                CoachingSession.pet_id,
+                CoachingMessage.session_id,
+                CoachingSession.title.label("session_title"),
+                CoachingMessage.role,
+                CoachingMessage.content,
+                CoachingMessage.model,
+                CoachingMessage.created_at,
+            )
+            .join(CoachingSession, CoachingMessage.session_id == CoachingSession.id)
+            .where(CoachingSession.user_id == user_id)
+            .order_by(
+                CoachingSession.pet_id,
+                CoachingMessage.session_id,
+                CoachingMessage.created_at,
+                CoachingMessage.id,
+            )
+        )
+        pet_column = CoachingSession.pet_id
+
+    if pet_id is not None:
+        query = query.where(pet_column == pet_id)
+    return query
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def stream_export(
+    dataset: ExportDataset,
+    fmt: ExportFormat,
+    user_id: uuid.UUID,
+    pet_id: uuid.UUID | None = None,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """Yield the encoded export in chunks of ``EXPORT_FETCH_ROWS`` rows.
+
+    The stream opens its own session: it outlives the request handler, and
+    a server-side cursor needs its transaction held for the whole read.
+    """
+    query = export_query(dataset, user_id, pet_id)
+    columns = [column.key for column in query.selected_columns]
+    encoder = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if compress else None
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(columns)
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return encoder.compress(data) if encoder is not None else data
+
+    def write(row) -> None:
+        if writer is not None:
+            writer.writerow([_csv_value(value) for value in row])
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row, strict=True)), default=_json_default))
+            buffer.write("\n")
+
+    async with async_session_factory() as session:
+        # A pet's archived months predate everything it still has in
+        # abc_logs, so each pet's segments (pet then month order, each in
+        # occurred_at order) are spliced in ahead of its first live row.
+        # Archive ids are strings; uuid text sorts the way Postgres does.
+        archived = read_archived_rows(session, user_id, pet_id) if dataset == "abc-logs" else None
+        records = await anext(archived, None) if archived is not None else None
+
+        result = await session.stream(query.execution_options(yield_per=EXPORT_FETCH_ROWS))
+        async for rows in result.partitions():
+            for row in rows:
+                while records is not None and (
+                    not records or records[0]["pet_id"] <= str(row.pet_id)
+                ):
+                    for record in records:
+                        write([record[column] for column in columns])
+                    records = await anext(archived, None)
+                write(row)
+            chunk = drain()
+            if chunk:
+                yield chunk
+
+        # Archived pets that sort after the last pet with live rows
+        while records is not None:
+            for record in records:
+                write([record[column] for column in columns])
+            chunk = drain()
+            if chunk:
+                yield chunk
+            records = await anext(archived, None)
+
+    chunk = drain()
+    if encoder is not None:
+        chunk += encoder.flush()
+    if chunk:
+        yield chunk
@@ -0,0 +1,199 @@
+"""Per-pet forecasts of daily behavior counts.
+
+Each pet's daily log counts over the last ``HISTORY_DAYS`` closed days (from
+the ``pet_daily_stats`` rollup) are fitted with a Poisson GLM with a log-
+linear trend, ``log E[count] = level + slope * weeks``, by Newton/IRLS. The
+design is shared, so every pet is fitted at once: each iteration is a few
+NumPy reductions over a (pets, days) matrix and a closed-form 2x2 solve per
+row. A small ridge on the slope keeps sparse or all-zero histories flat.
+
+The forecast for the next ``HORIZON_DAYS`` days, starting today, is the
+fitted rate, and the interval widens it twice: by the rate's own standard
+error and by Poisson noise around it. It is approximate, and conservative.
+
+Forecasts are stored in ``pet_forecasts`` with the pet's data version.
+``refresh_forecasts`` refits every pet nightly; a request serves the
+stored forecast until new data (a version bump) or a new day arrives, and
+refits just that pet then.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.daily_stats import PetDailyStats
+from app.models.data_version import PetDataVersion
+from app.models.forecast import PetForecast
+
+HISTORY_DAYS = 56
+HORIZON_DAYS = 14
+# A pet needs this many days since its first log to be forecast
+MIN_HISTORY_DAYS = 14
+# ~90% two-sided
+INTERVAL_Z = 1.645
+SLOPE_RIDGE = 1.0
+IRLS_ITERATIONS = 25
+# Bounds on the log-rate, so empty histories converge instead of diverging
+MIN_LOG_RATE, MAX_LOG_RATE = -7.0, 7.0
+# Weekly changes smaller than this, or within two standard errors of zero, are "stable"
+STABLE_WEEKLY_CHANGE = 0.05
+_UPSERT_CHUNK = 1000
+
+
+@dataclass(frozen=True)
+class PoissonTrendFit:
+    """Fits for a batch of series: ``beta`` is (series, 2) -- the log-rate on
+    the last history day and its change per week -- and ``cov`` its
+    (series, 2, 2) covariance."""
+
+    beta: np.ndarray
+    cov: np.ndarray
+
+    def weekly_change(self) -> np.ndarray:
+        return np.expm1(self.beta[:, 1])
+
+    def trend(self) -> list[str]:
+        slope, se = self.beta[:, 1], np.sqrt(self.cov[:, 1, 1])
+        stable = (np.abs(self.weekly_change()) < STABLE_WEEKLY_CHANGE) | (np.abs(slope) < 2 * se)
+        return [
+            "stable" if s else ("improving" if b < 0 else "worsening")
+            for s, b in zip(stable, slope, strict=True)
+        ]
+
+    def forecast(self, horizon: int = HORIZON_DAYS) -> tuple[np.ndarray, ...]:
+        """Expected count and interval bounds per series and future day.
+
+        Day ``h`` (1-based) is ``h`` days after the last history day.
+        """
+        weeks = np.arange(1, horizon + 1) / 7
+        eta = self.beta[:, :1] + self.beta[:, 1:] * weeks
+        var_eta = (
+            self.cov[:, :1, 0] + 2 * weeks * self.cov[:, :1, 1] + weeks**2 * self.cov[:, 1:, 1]
+        )
+        spread = INTERVAL_Z * np.sqrt(np.maximum(var_eta, 0))
+        rate_low, rate_high = np.exp(eta - spread), np.exp(eta + spread)
+        lower = np.floor(np.maximum(rate_low - INTERVAL_Z * np.sqrt(rate_low), 0))
+        upper = np.ceil(rate_high + INTERVAL_Z * np.sqrt(rate_high))
+        return np.exp(eta), lower.astype(np.int64), upper.astype(np.int64)
+
+
+def fit_poisson_trend(counts: np.ndarray, active: np.ndarray) -> PoissonTrendFit:
+    """Fit every row of ``counts`` (series, days) at once.
+
+    ``active`` masks the days each series counts (from its pet's first log
+    on); the last column is the most recent day.
+    """
+    n, days = counts.shape
+    weeks = (np.arange(days) - (days - 1)) / 7
+    w = active.astype(float)
+    y = counts * w
+    level = np.log(y.sum(axis=1) / np.maximum(w.sum(axis=1), 1) + 0.1)
+    slope = np.zeros(n)
+    for _ in range(IRLS_ITERATIONS):
+        mu = np.exp(np.clip(level[:, None] + slope[:, None] * weeks, MIN_LOG_RATE, MAX_LOG_RATE))
+        mu *= w
+        resid = y - mu
+        g0 = resid.sum(axis=1)
+        g1 = (resid * weeks).sum(axis=1) - SLOPE_RIDGE * slope
+        h00 = mu.sum(axis=1)
+        h01 = (mu * weeks).sum(axis=1)
+        h11 = (mu * weeks**2).sum(axis=1) + SLOPE_RIDGE
+        det = np.maximum(h00 * h11 - h01**2, 1e-12)
+        level = np.clip(level + (h11 * g0 - h01 * g1) / det, MIN_LOG_RATE, MAX_LOG_RATE)
+        slope = slope + (h00 * g1 - h01 * g0) / det
+
+    cov = np.empty((n, 2, 2))
+    cov[:, 0, 0], cov[:, 1, 1] = h11 / det, h00 / det
+    cov[:, 0, 1] = cov[:, 1, 0] = -h01 / det
+    return PoissonTrendFit(np.column_stack([level, slope]), cov)
+
+
+async def refresh_forecasts(db: AsyncSession, today: date, pet_id: uuid.UUID | None = None) -> int:
+    """Fit and store forecasts starting ``today`` for every pet with enough
+    history (or just ``pet_id``); returns how many were written."""
+    since = today - timedelta(days=HISTORY_DAYS)
+    first_days = select(PetDailyStats.pet_id, func.min(PetDailyStats.day)).group_by(
+        PetDailyStats.pet_id
+    )
+    if pet_id is not None:
+        first_days = first_days.where(PetDailyStats.pet_id == pet_id)
+    first_days = first_days.having(
+        func.min(PetDailyStats.day) <= today - timedelta(days=MIN_HISTORY_DAYS)
+    )
+    first_day = dict((await db.execute(first_days)).all())
+    if not first_day:
+        return 0
+
+    # Versions before counts: a write in between leaves the stored version
+    # behind the data, so the forecast is refitted rather than served stale
+    versions_query = select(PetDataVersion.pet_id, PetDataVersion.version)
+    counts_query = select(PetDailyStats.pet_id, PetDailyStats.day, PetDailyStats.log_count).where(
+        PetDailyStats.day >= since, PetDailyStats.day < today
+    )
+    if pet_id is not None:
+        versions_query = versions_query.where(PetDataVersion.pet_id == pet_id)
+        counts_query = counts_query.where(PetDailyStats.pet_id == pet_id)
+    versions = dict((await db.execute(versions_query)).all())
+    rows = (await db.execute(counts_query)).all()
+
+    pets = list(first_day)
+    index = {pet: i for i, pet in enumerate(pets)}
+    counts = np.zeros((len(pets), HISTORY_DAYS))
+    for pet, day, log_count in rows:
+        if pet in index:
+            counts[index[pet], (day - since).days] = log_count
+    starts = np.array([max((first_day[pet] - since).days, 0) for pet in pets])
+    active = np.arange(HISTORY_DAYS) >= starts[:, None]
+
+    fit = fit_poisson_trend(counts, active)
+    expected, lower, upper = fit.forecast()
+    weekly_change = fit.weekly_change()
+    values = [
+        {
+            "pet_id": pet,
+            "data_version": versions.get(pet, 0),
+            "start_day": today,
+            "expected": [round(float(x), 2) for x in expected[i]],
+            "lower": [int(x) for x in lower[i]],
+            "upper": [int(x) for x in upper[i]],
+            "weekly_change_pct": round(float(weekly_change[i]) * 100, 1),
+            "trend": trend,
+        }
+        for i, (pet, trend) in enumerate(zip(pets, fit.trend(), strict=True))
+    ]
+    for chunk_start in range(0, len(values), _UPSERT_CHUNK):
+        stmt = insert(PetForecast).values(values[chunk_start : chunk_start + _UPSERT_CHUNK])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["pet_id"],
+                set_={
+                    "data_version": stmt.excluded.data_version,
+                    "start_day": stmt.excluded.start_day,
+                    "expected": stmt.excluded.expected,
+                    "lower": stmt.excluded.lower,
+                    "upper": stmt.excluded.upper,
+                    "weekly_change_pct": stmt.excluded.weekly_change_pct,
+                    "trend": stmt.excluded.trend,
+                    "fitted_at": func.now(),
+                },
+            )
+        )
+    return len(values)
+
+
+async def get_forecast(
+    db: AsyncSession, pet_id: uuid.UUID, version: int, today: date
+) -> PetForecast | None:
+    """The pet's forecast from today, refitted if the stored one is out of
+    date; ``None`` if the pet doesn't have enough history yet."""
+    stored = await db.get(PetForecast, pet_id)
+    if stored is not None and stored.data_version == version and stored.start_day == today:
+        return stored
+    if not await refresh_forecasts(db, today, pet_id):
+        return None
+    return await db.get(PetForecast, pet_id, populate_existing=True)
@@ -0,0 +1,366 @@
+"""In-process BM25 retrieval over a pet's behavior history.
+
+Each pet gets an inverted index over its ABC logs (categories, tags, notes,
+location) and past coaching messages. Indexes are cached per pet and kept
+current incrementally: a refresh only loads rows created after the index's
+watermark. Updated or deleted logs invalidate the pet's index, which is then
+rebuilt on the next query.
+
+A caller that already queries the pet's data can fetch the rows past the
+index's ``watermarks`` in the same statement (see ``load_coaching_context``)
+and hand them to ``get`` as an ``IndexDelta``; the refresh then runs no
+query of its own.
+
+Documents carry the fields needed to render them into a prompt, so a query
+never has to go back to the database for the matched rows.
+"""
+
+import asyncio
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.text import tokenize
+from app.models.abc_log import ABCLog
+from app.models.coaching_session import CoachingMessage, CoachingSession
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+MAX_CACHED_PETS = 256
+INDEX_MAX_AGE_SECONDS = 15 * 60
+
+# Coaching messages are indexed on a prefix; long answers would otherwise
+# dominate document length normalization.
+MESSAGE_INDEX_CHARS = 1000
+
+
+@dataclass
+class HistoryDoc:
+    doc_id: str
+    kind: str  # "log" | "message"
+    created_at: datetime
+    payload: dict
+
+
+@dataclass
+class SearchHit:
+    doc: HistoryDoc
+    score: float
+
+
+class BM25Index:
+    """Append-only inverted index with tombstoned removals."""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B) -> None:
+        self.k1 = k1
+        self.b = b
+        self.docs: list[HistoryDoc | None] = []
+        self._positions: dict[str, int] = {}
+        self._postings: dict[str, tuple[list[int], list[int]]] = {}
+        self._arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._df: dict[str, int] = {}
+        self._doc_terms: list[tuple[str, ...]] = []
+        self._doc_len: list[int] = []
+        self._total_len = 0
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._positions
+
+    def add(self, doc: HistoryDoc, terms: list[str]) -> None:
+        if doc.doc_id in self._positions:
+            self.remove(doc.doc_id)
+        pos = len(self.docs)
+        self.docs.append(doc)
+        self._positions[doc.doc_id] = pos
+        self._doc_len.append(len(terms))
+        self._total_len += len(terms)
+        self._live += 1
+
+        counts: dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        self._doc_terms.append(tuple(counts))
+        for term, tf in counts.items():
+            postings = self._postings.setdefault(term, ([], []))
+            postings[0].append(pos)
+            postings[1].append(tf)
+            self._df[term] = self._df.get(term, 0) + 1
+            self._arrays.pop(term, None)
+
+    def remove(self, doc_id: str) -> None:
+        pos = self._positions.pop(doc_id, None)
+        if pos is None:
+            return
+        self.docs[pos] = None
+        self._total_len -= self._doc_len[pos]
+        self._live -= 1
+        for term in self._doc_terms[pos]:
+            self._df[term] -= 1
+
+    def _term_arrays(self, term: str) -> tuple[np.ndarray, np.ndarray] | None:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return None
+            arrays = (np.asarray(postings[0]), np.asarray(postings[1], dtype=np.float64))
+            self._arrays[term] = arrays
+        return arrays
+
+    def search(self, terms: list[str], k: int = 10, kind: str | None = None) -> list[SearchHit]:
+        if not terms or not self._live:
+            return []
+
+        n_docs = len(self.docs)
+        doc_len = np.asarray(self._doc_len, dtype=np.float64)
+        avgdl = self._total_len / self._live or 1.0
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avgdl)
+        scores = np.zeros(n_docs)
+
+        for term in set(terms):
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            idx, tf = arrays
+            df = self._df[term]
+            if not df:
+                continue
+            idf = math.log(1 + (self._live - df + 0.5) / (df + 0.5))
+            scores[idx] += idf * tf * (self.k1 + 1) / (tf + norm[idx])
+
+        candidates = np.flatnonzero(scores > 0)
+        if kind is not None or len(self.docs) != self._live:
+            candidates = [
+                i
+                for i in candidates
+                if self.docs[i] is not None and (kind is None or self.docs[i].kind == kind)
+            ]
+        if not len(candidates):
+            return []
+
+        candidates = np.asarray(candidates)
+        top = candidates[np.argsort(-scores[candidates], kind="stable")[:k]]
+        return [SearchHit(doc=self.docs[i], score=float(scores[i])) for i in top]
+
+
+def _log_terms(log: ABCLog) -> list[str]:
+    parts = [
+        log.antecedent_category.replace("_", " "),
+        " ".join(log.antecedent_tags),
+        log.antecedent_notes or "",
+        log.behavior_category.replace("_", " "),
+        " ".join(log.behavior_tags),
+        log.behavior_notes or "",
+        log.consequence_category.replace("_", " "),
+        " ".join(log.consequence_tags),
+        log.consequence_notes or "",
+        log.location or "",
+    ]
+    return tokenize(" ".join(parts))
+
+
+def log_payload(log: ABCLog) -> dict:
+    """The fields of a log needed to render it into a coaching prompt."""
+    return {
+        "id": log.id,
+        "occurred_at": log.occurred_at,
+        "antecedent_category": log.antecedent_category,
+        "antecedent_tags": list(log.antecedent_tags),
+        "behavior_category": log.behavior_category,
+        "behavior_tags": list(log.behavior_tags),
+        "behavior_severity": log.behavior_severity,
+        "consequence_category": log.consequence_category,
+        "consequence_tags": list(log.consequence_tags),
+    }
+
+
+def _log_doc(log: ABCLog) -> HistoryDoc:
+    return HistoryDoc(
+        doc_id=f"log:{log.id}", kind="log", created_at=log.created_at, payload=log_payload(log)
+    )
+
+
+def _message_doc(msg: CoachingMessage) -> tuple[HistoryDoc, list[str]]:
+    doc = HistoryDoc(
+        doc_id=f"msg:{msg.id}",
+        kind="message",
+        created_at=msg.created_at,
+        payload={"role": msg.role, "content": msg.content, "created_at": msg.created_at},
+    )
+    return doc, tokenize(msg.content[:MESSAGE_INDEX_CHARS])
+
+
+@dataclass
+class PetIndex:
+    index: BM25Index = field(default_factory=BM25Index)
+    log_watermark: tuple[datetime, uuid.UUID] | None = None
+    message_watermark: tuple[datetime, uuid.UUID] | None = None
+    log_count: int = 0
+    built_at: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def reset(self) -> None:
+        self.index = BM25Index()
+        self.log_watermark = None
+        self.message_watermark = None
+        self.log_count = 0
+        self.built_at = time.monotonic()
+
+
+@dataclass
+class IndexDelta:
+    """Rows created after the given watermarks, and the pet's log count, as
+    read by the caller in one snapshot."""
+
+    log_watermark: tuple[datetime, uuid.UUID] | None
+    message_watermark: tuple[datetime, uuid.UUID] | None
+    logs: list[ABCLog]
+    messages: list[CoachingMessage]
+    log_count: int
+
+
+def _after(column_ts, column_id, watermark: tuple[datetime, uuid.UUID] | None):
+    if watermark is None:
+        return None
+    ts, last_id = watermark
+    return or_(column_ts > ts, and_(column_ts == ts, column_id > last_id))
+
+
+class HistoryIndexCache:
+    """LRU of per-pet BM25 indexes, refreshed incrementally on access."""
+
+    def __init__(self, max_pets: int = MAX_CACHED_PETS) -> None:
+        self.max_pets = max_pets
+        self._pets: OrderedDict[uuid.UUID, PetIndex] = OrderedDict()
+
+    def invalidate(self, pet_id: uuid.UUID) -> None:
+        """Drop a pet's index; call after a log is updated or deleted."""
+        self._pets.pop(pet_id, None)
+
+    def _entry(self, pet_id: uuid.UUID) -> PetIndex:
+        entry = self._pets.get(pet_id)
+        if entry is None or time.monotonic() - entry.built_at > INDEX_MAX_AGE_SECONDS:
+            entry = PetIndex()
+            self._pets[pet_id] = entry
+        self._pets.move_to_end(pet_id)
+        while len(self._pets) > self.max_pets:
+            self._pets.popitem(last=False)
+        return entry
+
+    def watermarks(
+        self, pet_id: uuid.UUID
+    ) -> tuple[tuple[datetime, uuid.UUID] | None, tuple[datetime, uuid.UUID] | None]:
+        """The (log, message) watermarks to load an ``IndexDelta`` after."""
+        entry = self._entry(pet_id)
+        return entry.log_watermark, entry.message_watermark
+
+    async def get(
+        self, db: AsyncSession, pet_id: uuid.UUID, delta: IndexDelta | None = None
+    ) -> BM25Index:
+        """Return the pet's index, loading anything created since the last refresh.
+
+        With a ``delta`` loaded after the index's current watermarks, no query
+        runs; otherwise (or if the delta's log count shows rows were removed)
+        the index refreshes itself.
+        """
+        entry = self._entry(pet_id)
+        async with entry.lock:
+            if delta is not None and self._apply(entry, delta):
+                return entry.index
+            if not await self._refresh(db, pet_id, entry):
+                # Logs were deleted by another process; rebuild from scratch.
+                entry.reset()
+                await self._refresh(db, pet_id, entry)
+        return entry.index
+
+    @staticmethod
+    def _add_logs(entry: PetIndex, logs: list[ABCLog]) -> None:
+        for log in logs:
+            entry.index.add(_log_doc(log), _log_terms(log))
+            entry.log_count += 1
+        if logs:
+            entry.log_watermark = (logs[-1].created_at, logs[-1].id)
+
+    @staticmethod
+    def _add_messages(entry: PetIndex, messages: list[CoachingMessage]) -> None:
+        for msg in messages:
+            doc, terms = _message_doc(msg)
+            entry.index.add(doc, terms)
+        if messages:
+            entry.message_watermark = (messages[-1].created_at, messages[-1].id)
+
+    def _apply(self, entry: PetIndex, delta: IndexDelta) -> bool:
+        """Add a delta's rows; False if the index must refresh itself instead."""
+        if (delta.log_watermark, delta.message_watermark) != (
+            entry.log_watermark,
+            entry.message_watermark,
+        ):
+            # Another request moved the index on (or it expired) since the load
+            return False
+        self._add_logs(entry, delta.logs)
+        self._add_messages(entry, delta.messages)
+        if delta.log_count != entry.log_count:
+            entry.reset()
+            return False
+        return True
+
+    async def _refresh(self, db: AsyncSession, pet_id: uuid.UUID, entry: PetIndex) -> bool:
+        """Add rows created since the watermarks.
+
+        Returns False if the pet's log count no longer matches the index --
+        rows were removed, or committed behind the watermark -- and the index
+        must be rebuilt.
+        """
+        log_query = (
+            select(ABCLog).where(ABCLog.pet_id == pet_id).order_by(ABCLog.created_at, ABCLog.id)
+        )
+        after = _after(ABCLog.created_at, ABCLog.id, entry.log_watermark)
+        if after is not None:
+            log_query = log_query.where(after)
+        self._add_logs(entry, list((await db.execute(log_query)).scalars().all()))
+
+        if after is not None:
+            total = await db.execute(
+                select(func.count()).select_from(ABCLog).where(ABCLog.pet_id == pet_id)
+            )
+            if total.scalar() != entry.log_count:
+                return False
+
+        msg_query = (
+            select(CoachingMessage)
+            .join(CoachingSession)
+            .where(CoachingSession.pet_id == pet_id)
+            .order_by(CoachingMessage.created_at, CoachingMessage.id)
+        )
+        after = _after(CoachingMessage.created_at, CoachingMessage.id, entry.message_watermark)
+        if after is not None:
+            msg_query = msg_query.where(after)
+        self._add_messages(entry, list((await db.execute(msg_query)).scalars().all()))
+        return True
+
+    async def search(
+        self,
+        db: AsyncSession,
+        pet_id: uuid.UUID,
+        query: str,
+        k: int = 10,
+        kind: str | None = None,
+    ) -> list[SearchHit]:
+        index = await self.get(db, pet_id)
+        return index.search(tokenize(query), k=k, kind=kind)
+
+
+history_index = HistoryIndexCache()
@@ -0,0 +1,119 @@
+"""Dashboard figures for every pet a user owns, in one statement.
+
+The home screen shows a card per pet; rather than one dashboard request
+(and one ownership check and stats statement) per pet, a single grouped
+query over ``pet_daily_stats`` and ``insights`` for the user's pets returns
+each pet's headline stats, a daily-count sparkline and its unread insight
+count. The cost is one round trip however many pets the household has.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import Date, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.pet_stats import trend_pct
+
+SPARKLINE_DAYS = 14
+
+_HOUSEHOLD_SQL = text(
+    """
+    WITH owned AS (
+        SELECT id, name, species, created_at FROM pets WHERE user_id = :user_id
+    ),
+    totals AS (
+        SELECT pet_id,
+            sum(log_count) AS total_logs,
+            sum(severity_sum) AS severity_sum,
+            sum(log_count) FILTER (WHERE day > :week_ago) AS recent_7d,
+            sum(log_count) FILTER (WHERE day > :two_weeks_ago AND day <= :week_ago)
+                AS previous_7d
+        FROM pet_daily_stats
+        WHERE pet_id IN (SELECT id FROM owned)
+        GROUP BY pet_id
+    ),
+    sparklines AS (
+        SELECT o.id AS pet_id,
+            array_agg(coalesce(s.log_count, 0) ORDER BY b.day) AS sparkline
+        FROM owned o
+        CROSS JOIN generate_series(
+            CAST(:sparkline_start AS timestamp), CAST(:today AS timestamp), interval '1 day'
+        ) AS b(day)
+        LEFT JOIN pet_daily_stats s ON s.pet_id = o.id AND s.day = b.day::date
+        GROUP BY o.id
+    ),
+    unread AS (
+        SELECT pet_id, count(*) AS unread_insights
+        FROM insights
+        WHERE pet_id IN (SELECT id FROM owned) AND NOT is_read
+        GROUP BY pet_id
+    )
+    SELECT o.id AS pet_id, o.name, o.species,
+        coalesce(t.total_logs, 0) AS total_logs,
+        coalesce(t.severity_sum, 0) AS severity_sum,
+        coalesce(t.recent_7d, 0) AS recent_7d,
+        coalesce(t.previous_7d, 0) AS previous_7d,
+        sp.sparkline,
+        coalesce(u.unread_insights, 0) AS unread_insights
+    FROM owned o
+    LEFT JOIN totals t ON t.pet_id = o.id
+    LEFT JOIN sparklines sp ON sp.pet_id = o.id
+    LEFT JOIN unread u ON u.pet_id = o.id
+    ORDER BY o.created_at DESC
+    """
+).bindparams(
+    bindparam("user_id", type_=UUID(as_uuid=True)),
+    bindparam("week_ago", type_=Date),
+    bindparam("two_weeks_ago", type_=Date),
+    bindparam("sparkline_start", type_=Date),
+    bindparam("today", type_=Date),
+)
+
+
+@dataclass(frozen=True)
+class HouseholdPet:
+    pet_id: uuid.UUID
+    name: str
+    species: str
+    total_logs: int
+    severity_avg: float | None
+    recent_7d: int
+    previous_7d: int
+    # Daily log counts, oldest first, ending today
+    sparkline: list[int]
+    unread_insights: int
+
+    @property
+    def trend_pct(self) -> float:
+        return trend_pct(self.recent_7d, self.previous_7d)
+
+
+async def load_household(db: AsyncSession, user_id: uuid.UUID, today: date) -> list[HouseholdPet]:
+    """Stats for each of the user's pets, newest pet first."""
+    result = await db.execute(
+        _HOUSEHOLD_SQL,
+        {
+            "user_id": user_id,
+            "week_ago": today - timedelta(days=7),
+            "two_weeks_ago": today - timedelta(days=14),
+            "sparkline_start": today - timedelta(days=SPARKLINE_DAYS - 1),
+            "today": today,
+        },
+    )
+    return [
+        HouseholdPet(
+            pet_id=row.pet_id,
+            name=row.name,
+            species=row.species,
+            total_logs=row.total_logs,
+            severity_avg=row.severity_sum / row.total_logs if row.total_logs else None,
+            recent_7d=row.recent_7d,
+            previous_7d=row.previous_7d,
+            sparkline=row.sparkline,
+            unread_insights=row.unread_insights,
+        )
+        for row in result.all()
+    ]
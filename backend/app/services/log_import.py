@@ -0,0 +1,334 @@
+"""Bulk import of ABC logs from CSV or NDJSON files.
+
+The file is parsed in chunks with pandas, and each chunk is validated
+against the taxonomy column-wise -- set membership on ``species|category``
+and ``species|category|tag`` keys -- rather than row by row. Valid rows are
+COPYed into a staging table that lives for the transaction, then merged into
+``abc_logs`` by a single INSERT ... SELECT that skips rows already present,
+so re-running an import does not duplicate history.
+
+The CSV layout matches the ``/exports/abc-logs`` output: tags are
+``;``-separated, and unknown columns (``id``, ``created_at``) are ignored.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import BinaryIO, Literal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+from app.core.taxonomy import ANTECEDENT_CATEGORIES, BEHAVIOR_CATEGORIES, CONSEQUENCE_CATEGORIES
+from app.db.partitions import ensure_partitions
+from app.db.session import bound_bulk_write
+from app.models.pet import Pet
+
+ImportFormat = Literal["csv", "ndjson"]
+
+IMPORT_CHUNK_ROWS = 10_000
+MAX_REPORTED_ERRORS = 1000
+MAX_LOCATION_LENGTH = 100
+
+STAGING_TABLE = "abc_log_import"
+STAGING_COLUMNS = (
+    "pet_id",
+    "antecedent_category",
+    "antecedent_tags",
+    "antecedent_notes",
+    "behavior_category",
+    "behavior_tags",
+    "behavior_severity",
+    "behavior_notes",
+    "consequence_category",
+    "consequence_tags",
+    "consequence_notes",
+    "occurred_at",
+    "location",
+    "duration_seconds",
+)
+REQUIRED_COLUMNS = (
+    "antecedent_category",
+    "antecedent_tags",
+    "behavior_category",
+    "behavior_tags",
+    "behavior_severity",
+    "consequence_category",
+    "consequence_tags",
+    "occurred_at",
+)
+
+
+def _category_keys(categories: dict[str, dict[str, list[str]]]) -> tuple[set[str], set[str]]:
+    return (
+        {f"{species}|{cat}" for species, cats in categories.items() for cat in cats},
+        {
+            f"{species}|{cat}|{tag}"
+            for species, cats in categories.items()
+            for cat, tags in cats.items()
+            for tag in tags
+        },
+    )
+
+
+ANTECEDENT_KEYS, ANTECEDENT_TAG_KEYS = _category_keys(ANTECEDENT_CATEGORIES)
+BEHAVIOR_KEYS, BEHAVIOR_TAG_KEYS = _category_keys(BEHAVIOR_CATEGORIES)
+CONSEQUENCE_KEYS = set(CONSEQUENCE_CATEGORIES)
+CONSEQUENCE_TAG_KEYS = {
+    f"{cat}|{tag}" for cat, tags in CONSEQUENCE_CATEGORIES.items() for tag in tags
+}
+
+_CREATE_STAGING_SQL = text(
+    f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+    f"SELECT {', '.join(STAGING_COLUMNS)} FROM abc_logs WITH NO DATA"
+)
+
+# A log is a duplicate if the pet already has the same behavior at the same
+# instant; the NOT EXISTS probe uses idx_abc_logs_pet_behavior.
+_MERGE_SQL = text(
+    f"""
+    INSERT INTO abc_logs (id, user_id, {", ".join(STAGING_COLUMNS)})
+    SELECT DISTINCT ON (s.pet_id, s.behavior_category, s.occurred_at)
+        gen_random_uuid(), :user_id, {", ".join(f"s.{column}" for column in STAGING_COLUMNS)}
+    FROM {STAGING_TABLE} s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM abc_logs l
+        WHERE l.pet_id = s.pet_id
+          AND l.behavior_category = s.behavior_category
+          AND l.occurred_at = s.occurred_at
+    )
+    ORDER BY s.pet_id, s.behavior_category, s.occurred_at
+    """
+).bindparams(bindparam("user_id", type_=UUID(as_uuid=True)))
+
+
+@dataclass
+class RowError:
+    row: int  # 1-based data row (CSV header and NDJSON blank lines not counted)
+    errors: list[str]
+
+
+@dataclass
+class ImportReport:
+    received: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[RowError] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_errors(self, errors: list[RowError]) -> None:
+        self.failed += len(errors)
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        self.errors.extend(errors[:room])
+        self.errors_truncated = self.errors_truncated or len(errors) > room
+
+
+def read_chunks(file: BinaryIO, fmt: ImportFormat) -> Iterator[pd.DataFrame]:
+    """Lazily parse ``file`` into DataFrames of ``IMPORT_CHUNK_ROWS`` rows."""
+    try:
+        if fmt == "csv":
+            return pd.read_csv(file, dtype=str, keep_default_na=False, chunksize=IMPORT_CHUNK_ROWS)
+        return pd.read_json(
+            file, lines=True, dtype=False, convert_dates=False, chunksize=IMPORT_CHUNK_ROWS
+        )
+    except pd.errors.EmptyDataError as exc:
+        raise ValidationException("Import file is empty") from exc
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df:
+        return pd.Series("", index=df.index, dtype=str)
+    return df[column].fillna("").astype(str).str.strip()
+
+
+def _tags(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df:
+        return pd.Series([[]] * len(df), index=df.index, dtype=object)
+    # Tag cells repeat heavily; split each distinct value once. Rows share
+    # the resulting lists, which are only ever read.
+    try:
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+    except TypeError:  # NDJSON arrays are unhashable
+        return df[column].map(_split_tags)
+    split = [_split_tags(value) for value in uniques]
+    return pd.Series([split[code] for code in codes], index=df.index, dtype=object)
+
+
+def _split_tags(value) -> list[str]:
+    if isinstance(value, list):
+        items = value
+    elif isinstance(value, str):
+        items = value.replace(",", ";").split(";")
+    else:
+        return []
+    return [tag for tag in (str(item).strip() for item in items) if tag]
+
+
+def _bad_tags(keys: pd.Series, tags: pd.Series, valid: set[str]) -> pd.Series:
+    """Rows with no tags, or any tag outside ``valid`` for the row's key."""
+    exploded = tags.explode()
+    bad = ~(keys.reindex(exploded.index) + "|" + exploded.fillna("")).isin(valid)
+    return bad.groupby(level=0).any()
+
+
+def _optional(values: pd.Series) -> list[str | None]:
+    return [value or None for value in values.tolist()]
+
+
+def validate_chunk(
+    df: pd.DataFrame, pets: dict[str, str], pet_id: str | None = None
+) -> tuple[list[tuple], list[RowError]]:
+    """Split a chunk into COPY records (``STAGING_COLUMNS`` order) and row errors.
+
+    ``pets`` maps the user's pet IDs to species; ``pet_id`` assigns every
+    row to one pet instead of reading a ``pet_id`` column.
+    """
+    pet_ids = {value: uuid.UUID(value) for value in pets}
+    pet = pd.Series(pet_id, index=df.index) if pet_id else _text(df, "pet_id").str.lower()
+    species = pet.map(pets)
+    checks = {"unknown pet_id": species.isna()}
+    species = species.fillna("")
+
+    antecedent = _text(df, "antecedent_category")
+    antecedent_tags = _tags(df, "antecedent_tags")
+    behavior = _text(df, "behavior_category")
+    behavior_tags = _tags(df, "behavior_tags")
+    consequence = _text(df, "consequence_category")
+    consequence_tags = _tags(df, "consequence_tags")
+
+    antecedent_key = species + "|" + antecedent
+    behavior_key = species + "|" + behavior
+    checks["invalid antecedent_category"] = ~antecedent_key.isin(ANTECEDENT_KEYS)
+    checks["invalid antecedent_tags"] = _bad_tags(
+        antecedent_key, antecedent_tags, ANTECEDENT_TAG_KEYS
+    )
+    checks["invalid behavior_category"] = ~behavior_key.isin(BEHAVIOR_KEYS)
+    checks["invalid behavior_tags"] = _bad_tags(behavior_key, behavior_tags, BEHAVIOR_TAG_KEYS)
+    checks["invalid consequence_category"] = ~consequence.isin(CONSEQUENCE_KEYS)
+    checks["invalid consequence_tags"] = _bad_tags(
+        consequence, consequence_tags, CONSEQUENCE_TAG_KEYS
+    )
+
+    severity = pd.to_numeric(_text(df, "behavior_severity"), errors="coerce")
+    checks["behavior_severity must be an integer from 1 to 5"] = ~(
+        severity.between(1, 5) & (severity % 1 == 0)
+    )
+    occurred = pd.to_datetime(_text(df, "occurred_at"), utc=True, errors="coerce", format="ISO8601")
+    checks["occurred_at must be an ISO 8601 timestamp"] = occurred.isna()
+    duration_text = _text(df, "duration_seconds")
+    duration = pd.to_numeric(duration_text, errors="coerce")
+    checks["duration_seconds must be a non-negative integer"] = (duration_text != "") & ~(
+        (duration >= 0) & (duration % 1 == 0)
+    )
+    location = _text(df, "location")
+    checks[f"location exceeds {MAX_LOCATION_LENGTH} characters"] = (
+        location.str.len() > MAX_LOCATION_LENGTH
+    )
+
+    bad = pd.DataFrame(checks)
+    row_bad = bad.any(axis=1)
+    messages = np.array(list(checks))
+    failed = bad[row_bad]
+    errors = [
+        RowError(row=int(index) + 1, errors=messages[flags].tolist())
+        for index, flags in zip(failed.index, failed.to_numpy(), strict=True)
+    ]
+
+    ok = ~row_bad
+    count = int(ok.sum())
+    if not count:
+        return [], errors
+    records = list(
+        zip(
+            [pet_ids[value] for value in pet[ok].tolist()],
+            antecedent[ok].tolist(),
+            antecedent_tags[ok].tolist(),
+            _optional(_text(df, "antecedent_notes")[ok]),
+            behavior[ok].tolist(),
+            behavior_tags[ok].tolist(),
+            severity[ok].astype(int).tolist(),
+            _optional(_text(df, "behavior_notes")[ok]),
+            consequence[ok].tolist(),
+            consequence_tags[ok].tolist(),
+            _optional(_text(df, "consequence_notes")[ok]),
+            occurred[ok].dt.tz_convert(None).dt.to_pydatetime().tolist(),
+            _optional(location[ok]),
+            [
+                int(value) if given else None
+                for value, given in zip(duration[ok], duration_text[ok] != "", strict=True)
+            ],
+            strict=True,
+        )
+    )
+    return records, errors
+
+
+def _check_columns(df: pd.DataFrame, pet_id: str | None) -> None:
+    required = REQUIRED_COLUMNS if pet_id else ("pet_id", *REQUIRED_COLUMNS)
+    missing = [column for column in required if column not in df]
+    if missing:
+        raise ValidationException(f"Import file is missing columns: {', '.join(missing)}")
+
+
+async def import_abc_logs(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    file: BinaryIO,
+    fmt: ImportFormat,
+    pet_id: uuid.UUID | None = None,
+) -> ImportReport:
+    """Validate, stage and merge every row of ``file``; the caller commits.
+
+    Parsing runs in a worker thread a chunk at a time, so memory is bounded
+    by the chunk size and the event loop stays responsive. The transaction
+    is bounded by ``bound_bulk_write``: a chunk that takes longer than the
+    idle timeout to parse aborts the import.
+    """
+    await bound_bulk_write(db)
+    result = await db.execute(select(Pet.id, Pet.species).where(Pet.user_id == user_id))
+    pets = {str(pid): species for pid, species in result.all()}
+    default_pet = str(pet_id) if pet_id else None
+
+    await db.execute(_CREATE_STAGING_SQL)
+    connection = await (await db.connection()).get_raw_connection()
+    driver = connection.driver_connection
+
+    report = ImportReport()
+    staged = 0
+    chunks = await asyncio.to_thread(read_chunks, file, fmt)
+    while True:
+        try:
+            chunk = await asyncio.to_thread(next, chunks, None)
+        except (ValueError, UnicodeDecodeError) as exc:
+            # pandas parser errors subclass ValueError
+            raise ValidationException(f"Could not parse import file: {exc}") from exc
+        if chunk is None:
+            break
+        if not report.received:
+            _check_columns(chunk, default_pet)
+
+        records, errors = validate_chunk(chunk, pets, default_pet)
+        report.received += len(chunk)
+        report.add_errors(errors)
+        if records:
+            await driver.copy_records_to_table(
+                STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+            )
+            staged += len(records)
+
+    if staged:
+        # Old histories get their own monthly partitions, not the default one
+        months = await db.scalars(
+            text(f"SELECT DISTINCT date_trunc('month', occurred_at)::date FROM {STAGING_TABLE}")
+        )
+        await ensure_partitions(db, list(months))
+        merged = await db.execute(_MERGE_SQL, {"user_id": user_id})
+        report.imported = merged.rowcount
+    report.duplicates = staged - report.imported
+    return report
@@ -8,12 +8,13 @@ import uuid
 from collections import Counter
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.taxonomy import BEHAVIOR_FUNCTIONS, SEVERITY_LABELS
 from app.models.abc_log import ABCLog
 from app.models.insight import Insight
+from app.services.archive import load_archived_logs
 
 MIN_LOGS_FOR_PATTERNS = 10
 MIN_PAIR_FREQUENCY = 3  # Minimum A-B or B-C pair occurrences to flag as pattern
@@ -32,12 +33,19 @@ async def detect_patterns(
     """Run pattern detection on a pet's ABC logs and create insight records.
 
     Returns a list of detected patterns (dicts with type, title, body, confidence).
+    Runs for one pet are serialized until the caller commits, on any replica
+    or worker, so a second run sees the first one's insights and skips them.
     """
-    # Fetch all logs for this pet
+    await db.execute(
+        text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+        {"key": f"detect_patterns:{pet_id}"},
+    )
+
+    # Fetch all logs for this pet: archived months first, then the live table
     result = await db.execute(
         select(ABCLog).where(ABCLog.pet_id == pet_id).order_by(ABCLog.occurred_at.asc())
     )
-    logs = list(result.scalars().all())
+    logs = await load_archived_logs(db, user_id, pet_id) + list(result.scalars().all())
 
     if len(logs) < MIN_LOGS_FOR_PATTERNS:
         return []
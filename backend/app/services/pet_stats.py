@@ -0,0 +1,169 @@
+"""Per-pet headline stats for the dashboard and the log summary.
+
+Everything both endpoints show -- all-time totals, the 7-day windows, first
+and last log, and the top categories of each kind -- comes from one
+statement over the ``pet_daily_stats`` rollup. Results are cached in
+process, keyed by the pet's data version (``pet_data_versions``, bumped by
+triggers on every log write): a request costs one round trip that checks
+ownership and reads the version, plus the stats statement only when the
+version or the day has moved on. The version lookup doubles as the ETag
+check (``app.core.etag``).
+"""
+
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+
+from sqlalchemy import Date, Integer, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TOP_CATEGORIES = 5
+MAX_CACHED_PETS = 1024
+
+_CATEGORY_KINDS = ("behavior", "antecedent", "consequence")
+
+_CATEGORY_ENTRIES = " UNION ALL ".join(
+    f"SELECT '{kind}' AS kind, c.key AS category, c.value::int AS n "
+    f"FROM days, jsonb_each_text(days.{kind}_counts) c"
+    for kind in _CATEGORY_KINDS
+)
+_TOP_COLUMNS = ", ".join(
+    f"coalesce(jsonb_agg(jsonb_build_object('category', category, 'count', n) "
+    f"ORDER BY position) FILTER (WHERE kind = '{kind}'), '[]') AS top_{kind}"
+    for kind in _CATEGORY_KINDS
+)
+
+_STATS_SQL = text(
+    f"""
+    WITH days AS (
+        SELECT * FROM pet_daily_stats WHERE pet_id = :pet_id
+    ),
+    totals AS (
+        SELECT
+            coalesce(sum(log_count), 0) AS total_logs,
+            coalesce(sum(severity_sum), 0) AS severity_sum,
+            coalesce(sum(log_count) FILTER (WHERE day > :week_ago), 0) AS recent_7d,
+            coalesce(
+                sum(log_count) FILTER (WHERE day > :two_weeks_ago AND day <= :week_ago), 0
+            ) AS previous_7d
+        FROM days
+    ),
+    categories AS (
+        SELECT kind, category, sum(n) AS n,
+            row_number() OVER (PARTITION BY kind ORDER BY sum(n) DESC, category) AS position
+        FROM ({_CATEGORY_ENTRIES}) entries
+        GROUP BY kind, category
+    ),
+    top AS (
+        SELECT {_TOP_COLUMNS} FROM categories WHERE position <= :top_n
+    )
+    SELECT totals.*, top.*,
+        least(
+            (SELECT min(occurred_at) FROM abc_logs WHERE pet_id = :pet_id),
+            (SELECT min(first_occurred_at) FROM abc_log_archive_segments WHERE pet_id = :pet_id)
+        ) AS earliest,
+        greatest(
+            (SELECT max(occurred_at) FROM abc_logs WHERE pet_id = :pet_id),
+            (SELECT max(last_occurred_at) FROM abc_log_archive_segments WHERE pet_id = :pet_id)
+        ) AS latest
+    FROM totals, top
+    """
+).bindparams(
+    bindparam("pet_id", type_=UUID(as_uuid=True)),
+    bindparam("week_ago", type_=Date),
+    bindparam("two_weeks_ago", type_=Date),
+    bindparam("top_n", type_=Integer),
+)
+
+
+def trend_pct(recent: int, previous: int) -> float:
+    """Change of the last 7 days over the 7 before, as a percentage."""
+    if previous > 0:
+        return round(((recent - previous) / previous) * 100, 1)
+    return 100.0 if recent > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class PetStats:
+    total_logs: int
+    severity_avg: float | None
+    recent_7d: int
+    previous_7d: int
+    earliest: datetime | None
+    latest: datetime | None
+    top_behaviors: list[dict]
+    top_antecedents: list[dict]
+    top_consequences: list[dict]
+
+    @property
+    def trend_pct(self) -> float:
+        return trend_pct(self.recent_7d, self.previous_7d)
+
+
+async def load_pet_stats(db: AsyncSession, pet_id: uuid.UUID, today: date) -> PetStats:
+    """Compute a pet's stats in one statement (no ownership check, no cache)."""
+    result = await db.execute(
+        _STATS_SQL,
+        {
+            "pet_id": pet_id,
+            "week_ago": today - timedelta(days=7),
+            "two_weeks_ago": today - timedelta(days=14),
+            "top_n": TOP_CATEGORIES,
+        },
+    )
+    row = result.mappings().one()
+    total = row["total_logs"]
+    return PetStats(
+        total_logs=total,
+        severity_avg=row["severity_sum"] / total if total else None,
+        recent_7d=row["recent_7d"],
+        previous_7d=row["previous_7d"],
+        earliest=row["earliest"],
+        latest=row["latest"],
+        top_behaviors=row["top_behavior"],
+        top_antecedents=row["top_antecedent"],
+        top_consequences=row["top_consequence"],
+    )
+
+
+class PetStatsCache:
+    """LRU of computed stats, each valid for one (data version, day)."""
+
+    def __init__(self, max_pets: int = MAX_CACHED_PETS) -> None:
+        self.max_pets = max_pets
+        self._entries: OrderedDict[uuid.UUID, tuple[int, date, PetStats]] = OrderedDict()
+
+    def get(self, pet_id: uuid.UUID, version: int, today: date) -> PetStats | None:
+        entry = self._entries.get(pet_id)
+        if entry is None or entry[:2] != (version, today):
+            return None
+        self._entries.move_to_end(pet_id)
+        return entry[2]
+
+    def put(self, pet_id: uuid.UUID, version: int, today: date, stats: PetStats) -> None:
+        self._entries[pet_id] = (version, today, stats)
+        self._entries.move_to_end(pet_id)
+        while len(self._entries) > self.max_pets:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+pet_stats_cache = PetStatsCache()
+
+
+async def get_pet_stats(db: AsyncSession, pet_id: uuid.UUID, version: int) -> PetStats:
+    """A pet's stats at data ``version``, from cache when already computed.
+
+    Ownership is the caller's job; endpoints get both it and the version
+    from ``app.core.etag.pet_data_version``.
+    """
+    today = datetime.now(UTC).date()
+    stats = pet_stats_cache.get(pet_id, version, today)
+    if stats is None:
+        stats = await load_pet_stats(db, pet_id, today)
+        pet_stats_cache.put(pet_id, version, today, stats)
+    return stats
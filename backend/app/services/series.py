@@ -0,0 +1,124 @@
+"""Gap-filled behavior time series at day, week or month resolution.
+
+Days come from ``pet_daily_stats``, weeks and months from
+``pet_period_stats``. The bucket series is generated in SQL and left-joined
+to the rollup, so empty buckets come back as zero-count rows and a range of
+several years at month resolution is a few dozen primary-key lookups.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Literal
+
+from sqlalchemy import Date, String, bindparam, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import ValidationException
+
+Resolution = Literal["day", "week", "month"]
+
+# Longest range served at each resolution when it is chosen automatically
+AUTO_RESOLUTION_DAYS: tuple[tuple[int, Resolution], ...] = ((92, "day"), (731, "week"))
+MAX_SERIES_POINTS = 400
+
+_BUCKETS = """
+    SELECT b.bucket::date AS bucket
+    FROM generate_series(
+        date_trunc(:resolution, CAST(:start AS timestamp)), CAST(:end AS timestamp),
+        ('1 ' || :resolution)::interval
+    ) AS b(bucket)
+"""
+
+_SERIES_PARAMS = (
+    bindparam("pet_id", type_=UUID(as_uuid=True)),
+    bindparam("resolution", type_=String),
+    bindparam("start", type_=Date),
+    bindparam("end", type_=Date),
+)
+
+
+_DAY_SERIES_SQL = text(
+    f"""
+    SELECT b.bucket, coalesce(s.log_count, 0) AS log_count, s.severity_sum, s.severity_max
+    FROM ({_BUCKETS}) b
+    LEFT JOIN pet_daily_stats s ON s.pet_id = :pet_id AND s.day = b.bucket
+    ORDER BY b.bucket
+    """
+).bindparams(*_SERIES_PARAMS)
+
+_PERIOD_SERIES_SQL = text(
+    f"""
+    SELECT b.bucket, coalesce(s.log_count, 0) AS log_count, s.severity_sum, s.severity_max
+    FROM ({_BUCKETS}) b
+    LEFT JOIN pet_period_stats s
+        ON s.pet_id = :pet_id AND s.resolution = :resolution AND s.period_start = b.bucket
+    ORDER BY b.bucket
+    """
+).bindparams(*_SERIES_PARAMS)
+
+
+@dataclass(frozen=True)
+class SeriesPoint:
+    bucket: date
+    log_count: int
+    severity_avg: float | None
+    severity_max: int | None
+
+
+def choose_resolution(days: int) -> Resolution:
+    for max_days, resolution in AUTO_RESOLUTION_DAYS:
+        if days <= max_days:
+            return resolution
+    return "month"
+
+
+def bucket_count(days: int, resolution: Resolution) -> int:
+    if resolution == "day":
+        return days + 1
+    if resolution == "week":
+        return days // 7 + 2
+    return days // 28 + 2
+
+
+async def load_series(
+    db: AsyncSession,
+    pet_id: uuid.UUID,
+    today: date,
+    days: int,
+    resolution: Resolution | Literal["auto"] = "auto",
+) -> tuple[Resolution, list[SeriesPoint]]:
+    """Every bucket from ``days`` ago through today, oldest first.
+
+    Week and month buckets are aligned to their period start, so the first
+    bucket may begin before the requested range.
+    """
+    if resolution == "auto":
+        resolution = choose_resolution(days)
+    elif bucket_count(days, resolution) > MAX_SERIES_POINTS:
+        raise ValidationException(
+            f"{days} days at {resolution} resolution exceeds {MAX_SERIES_POINTS} points; "
+            "use a coarser resolution"
+        )
+
+    query = _DAY_SERIES_SQL if resolution == "day" else _PERIOD_SERIES_SQL
+    result = await db.execute(
+        query,
+        {
+            "pet_id": pet_id,
+            "resolution": resolution,
+            "start": today - timedelta(days=days),
+            "end": today,
+        },
+    )
+    points = [
+        SeriesPoint(
+            bucket=r.bucket,
+            log_count=r.log_count,
+            severity_avg=round(r.severity_sum / r.log_count, 1) if r.log_count else None,
+            severity_max=r.severity_max,
+        )
+        for r in result.all()
+    ]
+    return resolution, points
@@ -0,0 +1,52 @@
+"""Retention of the sync feed's deletion tombstones.
+
+Tombstones older than ``SYNC_TOMBSTONE_RETENTION_DAYS`` are deleted in
+batches by a nightly task. Each batch also advances the single-row
+``sync_tombstone_horizon`` to the highest change key it removed, in the same
+statement; the change feed compares cursors against it, and a client whose
+cursor is behind the horizon may have missed a deletion and must resync.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+PRUNE_BATCH_ROWS = 10_000
+
+_PRUNE_SQL = text(
+    """
+    WITH pruned AS (
+        DELETE FROM sync_tombstones
+        WHERE ctid IN (
+            SELECT ctid FROM sync_tombstones WHERE deleted_at < :before LIMIT :batch
+        )
+        RETURNING change_xid, change_seq
+    ),
+    newest AS (
+        SELECT change_xid, change_seq FROM pruned
+        ORDER BY change_xid DESC, change_seq DESC
+        LIMIT 1
+    ),
+    horizon AS (
+        INSERT INTO sync_tombstone_horizon (id, change_xid, change_seq)
+        SELECT true, change_xid, change_seq FROM newest
+        ON CONFLICT (id) DO UPDATE
+        SET change_xid = excluded.change_xid,
+            change_seq = excluded.change_seq,
+            pruned_at = NOW()
+        WHERE (sync_tombstone_horizon.change_xid, sync_tombstone_horizon.change_seq)
+            < (excluded.change_xid, excluded.change_seq)
+    )
+    SELECT count(*) FROM pruned
+    """
+)
+
+
+async def prune_tombstones(
+    db: AsyncSession, before: datetime, batch: int = PRUNE_BATCH_ROWS
+) -> int:
+    """Delete up to ``batch`` tombstones recorded before ``before`` and move
+    the horizon past them; returns how many went. The caller commits."""
+    result = await db.execute(_PRUNE_SQL, {"before": before, "batch": batch})
+    return result.scalar_one()
@@ -1,6 +1,7 @@
 """Celery application configuration."""
 
 from celery import Celery
+from celery.schedules import crontab
 
 from app.config import settings
 
@@ -21,5 +22,34 @@ celery_app.conf.update(
     task_soft_time_limit=240,  # 4 minute soft limit
 )
 
+# Sent by the single beat process (the compose ``beat`` service), never by workers
+celery_app.conf.beat_schedule = {
+    # Keep the next months' abc_logs partitions in place before rows arrive
+    "ensure-abc-log-partitions": {
+        "task": "pawlogic.ensure_abc_log_partitions",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    # Rebuild anomaly baselines once the UTC day has closed
+    "backfill-behavior-baselines": {
+        "task": "pawlogic.backfill_behavior_baselines",
+        "schedule": crontab(hour=0, minute=20),
+    },
+    # Refit behavior forecasts for the new UTC day
+    "forecast-all-pets": {
+        "task": "pawlogic.forecast_all_pets",
+        "schedule": crontab(hour=0, minute=40),
+    },
+    # Drop deletion tombstones past SYNC_TOMBSTONE_RETENTION_DAYS
+    "prune-sync-tombstones": {
+        "task": "pawlogic.prune_sync_tombstones",
+        "schedule": crontab(hour=3, minute=45),
+    },
+    # Move months past ARCHIVE_AFTER_MONTHS to the cold tier
+    "archive-abc-logs": {
+        "task": "pawlogic.archive_abc_logs",
+        "schedule": crontab(day_of_month=2, hour=4, minute=0),
+    },
+}
+
 # Auto-discover tasks in the workers package
 celery_app.autodiscover_tasks(["app.workers"])
@@ -41,20 +41,221 @@ def analyze_patterns(pet_id: str, user_id: str) -> dict:
 
 
 @celery_app.task(name="pawlogic.generate_bip")
-def generate_bip(pet_id: str, user_id: str) -> dict:
-    """Generate a Behavior Intervention Plan using Claude AI.
+def generate_bip(pet_id: str | None = None, user_id: str | None = None) -> dict:
+    """Generate Behavior Intervention Plans through the Message Batches API.
 
-    Stub for Phase 2. Will call Anthropic Claude API to generate
-    species-appropriate BIPs based on accumulated ABC logs and insights.
+    Collects every eligible pet (or just ``pet_id``), submits one batch and
+    hands off to ``poll_bip_batch``. Submitted runs that no poll chain owns
+    -- e.g. after a worker restart -- get polling resumed; their pets are
+    in flight, so they aren't collected and resubmitted.
     """
-    logger.info("BIP generation requested for pet %s (stub)", pet_id)
+    from app.config import settings
+    from app.db.session import async_session_factory
+    from app.services import bip_batch
+
+    async def _run():
+        async with async_session_factory() as session:
+            await bip_batch.expire_pending(session)
+            polls = []
+            for open_run in await bip_batch.open_runs(session):
+                token = await bip_batch.claim_polling(session, open_run.id)
+                if token is not None:
+                    polls.append((open_run.id, token))
+            resumed = [str(run_id) for run_id, _ in polls]
+
+            pets = await bip_batch.collect_eligible_pets(
+                session, [uuid.UUID(pet_id)] if pet_id else None
+            )
+            if user_id:
+                pets = [p for p in pets if p.user_id == uuid.UUID(user_id)]
+            run = await bip_batch.submit(session, bip_batch.anthropic_client(), pets)
+            if run is not None:
+                polls.append((run.id, await bip_batch.claim_polling(session, run.id)))
+            return run, resumed, polls
+
+    loop = asyncio.new_event_loop()
+    try:
+        run, resumed, polls = loop.run_until_complete(_run())
+    finally:
+        loop.close()
+
+    for run_id, token in polls:
+        poll_bip_batch.apply_async(
+            args=[str(run_id), str(token)], countdown=settings.BIP_BATCH_POLL_SECONDS
+        )
+    if run is None:
+        logger.info("No pets eligible for BIP generation")
+        return {"status": "no_eligible_pets", "pets": 0, "resumed_runs": resumed}
     return {
-        "pet_id": pet_id,
-        "status": "not_implemented",
-        "message": "BIP generation will be available in Phase 2",
+        "status": "submitted",
+        "run_id": str(run.id),
+        "batch_id": run.provider_batch_id,
+        "pets": len(run.pet_ids),
+        "resumed_runs": resumed,
     }
 
 
+@celery_app.task(name="pawlogic.poll_bip_batch")
+def poll_bip_batch(run_id: str, poll_token: str | None = None) -> dict:
+    """Check a BIP batch; persist its results once ended, otherwise re-schedule.
+
+    Polling re-enqueues itself with a countdown rather than sleeping, so no
+    worker is held while the batch is processing. Each poll renews the
+    chain's lease on the run (``poll_token``) and stops if another chain
+    has taken it over.
+    """
+    from app.config import settings
+    from app.db.session import async_session_factory
+    from app.models.bip import BipBatchRun
+    from app.services import bip_batch
+
+    async def _run():
+        async with async_session_factory() as session:
+            run = await session.get(BipBatchRun, uuid.UUID(run_id))
+            if run is None or run.status != "submitted":
+                return {"run_id": run_id, "status": run.status if run else "missing"}, None
+            token = await bip_batch.claim_polling(
+                session, run.id, uuid.UUID(poll_token) if poll_token else None
+            )
+            if token is None:
+                return {"run_id": run_id, "status": "superseded"}, None
+            client = bip_batch.anthropic_client()
+            if not await bip_batch.batch_ended(client, run):
+                return None, token
+            return await bip_batch.persist_results(session, client, run), None
+
+    loop = asyncio.new_event_loop()
+    try:
+        result, token = loop.run_until_complete(_run())
+    finally:
+        loop.close()
+
+    if result is None:
+        poll_bip_batch.apply_async(
+            args=[run_id, str(token)], countdown=settings.BIP_BATCH_POLL_SECONDS
+        )
+        return {"run_id": run_id, "status": "in_progress"}
+    return result
+
+
+@celery_app.task(name="pawlogic.ensure_abc_log_partitions")
+def ensure_abc_log_partitions() -> dict:
+    """Create any missing monthly abc_logs partitions for the months ahead.
+
+    Runs daily from Celery beat; creating a partition that already exists is
+    a no-op, so missed or repeated runs are harmless.
+    """
+    from app.db.partitions import PARTITION_MONTHS_AHEAD, ensure_future_partitions
+    from app.db.session import async_session_factory
+
+    async def _run():
+        async with async_session_factory() as session:
+            created = await ensure_future_partitions(session)
+            await session.commit()
+            return created
+
+    loop = asyncio.new_event_loop()
+    try:
+        created = loop.run_until_complete(_run())
+        logger.info("abc_logs partitions: %d created", created)
+        return {"created": created, "months_ahead": PARTITION_MONTHS_AHEAD}
+    finally:
+        loop.close()
+
+
+@celery_app.task(name="pawlogic.archive_abc_logs", soft_time_limit=3300, time_limit=3600)
+def archive_abc_logs() -> dict:
+    """Archive every abc_logs month older than ARCHIVE_AFTER_MONTHS.
+
+    Runs monthly from Celery beat. Each month is detached, then archived, and
+    committed on its own, so an interrupted run resumes with the months it
+    did not reach.
+    """
+    from app.config import settings
+    from app.db.session import async_session_factory
+    from app.services.archive import archivable_months, archive_month, detach_month
+
+    if not settings.ARCHIVE_URI:
+        logger.info("ARCHIVE_URI not set; skipping abc_logs archival")
+        return {"status": "disabled", "archived": {}}
+
+    async def _run():
+        async with async_session_factory() as session:
+            months = await archivable_months(session)
+        archived = {}
+        for month in months:
+            async with async_session_factory() as session:
+                await detach_month(session, month)
+                await session.commit()
+                archived[f"{month:%Y-%m}"] = await archive_month(session, month)
+                await session.commit()
+        return archived
+
+    loop = asyncio.new_event_loop()
+    try:
+        archived = loop.run_until_complete(_run())
+        logger.info("abc_logs archival: %d months, %d rows", len(archived), sum(archived.values()))
+        return {"status": "completed", "archived": archived}
+    finally:
+        loop.close()
+
+
+@celery_app.task(name="pawlogic.backfill_behavior_baselines", soft_time_limit=1500, time_limit=1800)
+def backfill_behavior_baselines(pet_id: str | None = None) -> dict:
+    """Recompute the behavior anomaly baselines from the daily rollup.
+
+    Runs nightly from Celery beat, just after the UTC day closes, which
+    folds in late, edited and imported logs; pass ``pet_id`` for one pet.
+    """
+    from datetime import UTC, datetime
+
+    from app.db.session import async_session_factory
+    from app.services.anomaly import backfill_baselines
+
+    async def _run():
+        async with async_session_factory() as session:
+            written = await backfill_baselines(
+                session, datetime.now(UTC).date(), uuid.UUID(pet_id) if pet_id else None
+            )
+            await session.commit()
+            return written
+
+    loop = asyncio.new_event_loop()
+    try:
+        written = loop.run_until_complete(_run())
+        logger.info("Behavior baselines: %d rebuilt", written)
+        return {"baselines": written}
+    finally:
+        loop.close()
+
+
+@celery_app.task(name="pawlogic.forecast_all_pets", soft_time_limit=1500, time_limit=1800)
+def forecast_all_pets() -> dict:
+    """Refit every pet's behavior forecast for the new UTC day.
+
+    Runs nightly from Celery beat, in one vectorised batch; requests only
+    refit a pet whose data changed since.
+    """
+    from datetime import UTC, datetime
+
+    from app.db.session import async_session_factory
+    from app.services.forecast import refresh_forecasts
+
+    async def _run():
+        async with async_session_factory() as session:
+            written = await refresh_forecasts(session, datetime.now(UTC).date())
+            await session.commit()
+            return written
+
+    loop = asyncio.new_event_loop()
+    try:
+        written = loop.run_until_complete(_run())
+        logger.info("Behavior forecasts: %d refitted", written)
+        return {"forecasts": written}
+    finally:
+        loop.close()
+
+
 @celery_app.task(name="pawlogic.send_notification")
 def send_notification(user_id: str, title: str, body: str) -> dict:
     """Send a push notification to a user.
@@ -67,3 +268,39 @@ def send_notification(user_id: str, title: str, body: str) -> dict:
         "status": "not_implemented",
         "message": "Push notifications will be available in Phase 2",
     }
+
+
+@celery_app.task(name="pawlogic.prune_sync_tombstones")
+def prune_sync_tombstones() -> dict:
+    """Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS.
+
+    Runs daily from Celery beat, a batch per transaction. Clients whose
+    cursor predates a pruned tombstone are told to resync by the feed.
+    """
+    from datetime import UTC, datetime, timedelta
+
+    from app.config import settings
+    from app.db.session import async_session_factory
+    from app.services.sync_retention import PRUNE_BATCH_ROWS, prune_tombstones
+
+    before = datetime.now(UTC).replace(tzinfo=None) - timedelta(
+        days=settings.SYNC_TOMBSTONE_RETENTION_DAYS
+    )
+
+    async def _run():
+        pruned = 0
+        while True:
+            async with async_session_factory() as session:
+                batch = await prune_tombstones(session, before)
+                await session.commit()
+            pruned += batch
+            if batch < PRUNE_BATCH_ROWS:
+                return pruned
+
+    loop = asyncio.new_event_loop()
+    try:
+        pruned = loop.run_until_complete(_run())
+        logger.info("sync tombstones: %d pruned", pruned)
+        return {"pruned": pruned, "before": before.isoformat()}
+    finally:
+        loop.close()
@@ -0,0 +1,55 @@
+"""Check or rebuild the pet_daily_stats rollup.
+
+Usage:
+    cd backend
+    python -m scripts.daily_stats check [--pet-id <uuid>]
+    python -m scripts.daily_stats rebuild [--pet-id <uuid>]
+
+``check`` exits non-zero if any day disagrees with the raw logs. ``rebuild``
+blocks log writes while it runs.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+
+from app.db.session import async_session_factory, engine
+from app.services.daily_stats import check_daily_stats, rebuild_daily_stats
+
+
+async def check(pet_id: uuid.UUID | None) -> int:
+    async with async_session_factory() as session:
+        mismatches = await check_daily_stats(session, pet_id)
+    await engine.dispose()
+
+    for m in mismatches[:50]:
+        raw = m.raw["log_count"] if m.raw else "missing"
+        rollup = m.rollup["log_count"] if m.rollup else "missing"
+        print(f"  {m.pet_id} {m.day}: raw {raw} logs, rollup {rollup}")
+    if len(mismatches) > 50:
+        print(f"  ... and {len(mismatches) - 50} more")
+    print(f"{len(mismatches)} inconsistent days")
+    return 1 if mismatches else 0
+
+
+async def rebuild(pet_id: uuid.UUID | None) -> int:
+    async with async_session_factory() as session:
+        written = await rebuild_daily_stats(session, pet_id)
+        await session.commit()
+    await engine.dispose()
+    print(f"Rebuilt {written} daily rows")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or rebuild pet_daily_stats")
+    parser.add_argument("command", choices=["check", "rebuild"])
+    parser.add_argument("--pet-id", type=uuid.UUID, help="Only this pet")
+    args = parser.parse_args()
+    command = check if args.command == "check" else rebuild
+    sys.exit(asyncio.run(command(args.pet_id)))
+
+
+if __name__ == "__main__":
+    main()
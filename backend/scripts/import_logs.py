@@ -0,0 +1,58 @@
+"""Bulk-import ABC logs from a CSV or NDJSON file.
+
+Usage:
+    cd backend
+    python -m scripts.import_logs history.csv --user-id <uuid> [--pet-id <uuid>]
+    python -m scripts.import_logs export.ndjson --user-id <uuid> --dry-run
+
+Uses the same validation and COPY/merge path as POST /api/v1/abc-logs/import.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.db.session import async_session_factory, engine
+from app.services.log_import import import_abc_logs
+
+
+async def run(
+    path: str, user_id: uuid.UUID, pet_id: uuid.UUID | None, fmt: str, dry_run: bool
+) -> None:
+    started = time.perf_counter()
+    async with async_session_factory() as session:
+        with open(path, "rb") as file:
+            report = await import_abc_logs(session, user_id, file, fmt, pet_id)
+        if dry_run:
+            await session.rollback()
+        else:
+            await session.commit()
+    await engine.dispose()
+    elapsed = time.perf_counter() - started
+
+    print(f"Rows received:  {report.received}")
+    print(f"Imported:       {report.imported}" + (" (dry run, rolled back)" if dry_run else ""))
+    print(f"Duplicates:     {report.duplicates}")
+    print(f"Failed:         {report.failed}")
+    print(f"Elapsed:        {elapsed:.2f}s ({report.received / elapsed:,.0f} rows/s)")
+    for error in report.errors[:20]:
+        print(f"  row {error.row}: {'; '.join(error.errors)}")
+    if report.failed > 20:
+        print(f"  ... and {report.failed - 20} more rejected rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import ABC logs from CSV or NDJSON")
+    parser.add_argument("path", help="File to import")
+    parser.add_argument("--user-id", type=uuid.UUID, required=True, help="Owning user")
+    parser.add_argument("--pet-id", type=uuid.UUID, help="Assign every row to this pet")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from extension")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and roll back")
+    args = parser.parse_args()
+    fmt = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    asyncio.run(run(args.path, args.user_id, args.pet_id, fmt, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
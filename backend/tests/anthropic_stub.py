@@ -0,0 +1,155 @@
+"""Minimal local stand-in for the Anthropic Message Batches API.
+
+Runs a real HTTP server on a background thread so tests exercise the SDK's
+own request/response handling. Point the client at it with
+``ANTHROPIC_BASE_URL``.
+"""
+
+import json
+import threading
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_responder(request: dict) -> str:
+    return json.dumps(
+        {
+            "target_behavior": "avoidance",
+            "function": "escape",
+            "summary": "Your pet hides when the doorbell rings.",
+            "antecedent_strategies": ["Muffle the doorbell"],
+            "replacement_behaviors": ["Go to mat"],
+            "consequence_strategies": ["Reward calm behavior"],
+            "milestones": ["Hides less than twice a week"],
+        }
+    )
+
+
+class AnthropicStub:
+    """Message Batches stub.
+
+    Batches report ``in_progress`` for ``polls_until_ended`` retrievals, then
+    ``ended``. ``responder`` maps a request to the reply text; custom IDs in
+    ``errored`` get an error result instead.
+    """
+
+    def __init__(
+        self,
+        polls_until_ended: int = 1,
+        responder: Callable[[dict], str] = default_responder,
+    ) -> None:
+        self.polls_until_ended = polls_until_ended
+        self.responder = responder
+        self.errored: set[str] = set()
+        self.batches: dict[str, dict] = {}
+        self.created: list[list[dict]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "AnthropicStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _batch_body(self, batch_id: str) -> dict:
+        batch = self.batches[batch_id]
+        ended = batch["polls"] > self.polls_until_ended
+        n = len(batch["requests"])
+        errored = sum(1 for r in batch["requests"] if r["custom_id"] in self.errored)
+        now = datetime.now(UTC)
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else n,
+                "succeeded": n - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(days=1)).isoformat(),
+            "ended_at": now.isoformat() if ended else None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch_id}/results"
+            if ended
+            else None,
+        }
+
+    def _result_line(self, request: dict) -> dict:
+        custom_id = request["custom_id"]
+        if custom_id in self.errored:
+            result = {
+                "type": "errored",
+                "error": {
+                    "type": "error",
+                    "error": {"type": "overloaded_error", "message": "Overloaded"},
+                },
+            }
+        else:
+            result = {
+                "type": "succeeded",
+                "message": {
+                    "id": f"msg_{uuid.uuid4().hex}",
+                    "type": "message",
+                    "role": "assistant",
+                    "model": request["params"]["model"],
+                    "content": [{"type": "text", "text": self.responder(request)}],
+                    "stop_reason": "end_turn",
+                    "stop_sequence": None,
+                    "usage": {"input_tokens": 100, "output_tokens": 200},
+                },
+            }
+        return {"custom_id": custom_id, "result": result}
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status: int, payload: dict) -> None:
+                self._send(status, json.dumps(payload).encode(), "application/json")
+
+            def do_POST(self) -> None:
+                if self.path.split("?")[0] != "/v1/messages/batches":
+                    return self._json(404, {"type": "error", "error": {"type": "not_found_error"}})
+                length = int(self.headers.get("Content-Length", 0))
+                requests = json.loads(self.rfile.read(length))["requests"]
+                batch_id = f"msgbatch_{uuid.uuid4().hex}"
+                stub.batches[batch_id] = {"requests": requests, "polls": 0}
+                stub.created.append(requests)
+                self._json(200, stub._batch_body(batch_id))
+
+            def do_GET(self) -> None:
+                parts = self.path.split("?")[0].strip("/").split("/")
+                if parts[:3] != ["v1", "messages", "batches"] or len(parts) < 4:
+                    return self._json(404, {"type": "error", "error": {"type": "not_found_error"}})
+                batch = stub.batches.get(parts[3])
+                if batch is None:
+                    return self._json(404, {"type": "error", "error": {"type": "not_found_error"}})
+                if len(parts) == 5 and parts[4] == "results":
+                    lines = [json.dumps(stub._result_line(r)) for r in batch["requests"]]
+                    return self._send(200, "\n".join(lines).encode(), "application/binary")
+                batch["polls"] += 1
+                self._json(200, stub._batch_body(parts[3]))
+
+        return Handler
@@ -2,13 +2,14 @@
 
 import asyncio
 import uuid
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 
+from app.core.cache import response_cache, user_tag
 from app.core.security import create_dev_token
 from app.db.session import async_session_factory, engine
 from app.main import app
@@ -28,6 +29,8 @@ def event_loop():
 @pytest_asyncio.fixture(scope="session")
 async def client() -> AsyncGenerator[AsyncClient]:
     transport = ASGITransport(app=app)
+    # Cached responses from an earlier run describe rows that no longer exist
+    await response_cache.invalidate(user_tag(TEST_USER_ID))
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
     # Session cleanup
@@ -44,6 +47,10 @@ async def client() -> AsyncGenerator[AsyncClient]:
             text("DELETE FROM pets WHERE user_id = :uid"),
             {"uid": uuid.UUID(TEST_USER_ID)},
         )
+        await session.execute(
+            text("DELETE FROM sync_tombstones WHERE user_id = :uid"),
+            {"uid": uuid.UUID(TEST_USER_ID)},
+        )
         await session.execute(
             text("DELETE FROM users WHERE id = :uid"),
             {"uid": uuid.UUID(TEST_USER_ID)},
@@ -74,3 +81,23 @@ async def test_pet(client: AsyncClient, auth_headers: dict) -> dict:
     )
     assert resp.status_code == 201
     return resp.json()
+
+
+@pytest.fixture
+def abc_log_payload() -> Callable[..., dict]:
+    """Build a valid ABC log request body for a pet; keywords override fields."""
+
+    def build(pet_id: str, **overrides) -> dict:
+        return {
+            "pet_id": pet_id,
+            "antecedent_category": "environmental_change",
+            "antecedent_tags": ["doorbell"],
+            "behavior_category": "avoidance",
+            "behavior_tags": ["hid"],
+            "behavior_severity": 3,
+            "consequence_category": "attention_given",
+            "consequence_tags": ["went_to_pet"],
+            **overrides,
+        }
+
+    return build
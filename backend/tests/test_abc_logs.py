@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 
 
@@ -119,3 +121,356 @@ async def test_get_taxonomy(client):
 async def test_taxonomy_invalid_species(client):
     resp = await client.get("/api/v1/abc-logs/taxonomy/bird")
     assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_abc_logs_batch_reports_per_item(client, auth_headers, test_pet):
+    valid = {
+        "pet_id": test_pet["id"],
+        "antecedent_category": "environmental_change",
+        "antecedent_tags": ["doorbell"],
+        "behavior_category": "avoidance",
+        "behavior_tags": ["hid"],
+        "behavior_severity": 3,
+        "consequence_category": "attention_given",
+        "consequence_tags": ["went_to_pet"],
+        "occurred_at": "2026-01-15T08:30:00",
+    }
+    resp = await client.post(
+        "/api/v1/abc-logs/batch",
+        json={
+            "logs": [
+                valid,
+                {**valid, "behavior_category": "INVALID"},
+                {**valid, "behavior_severity": 9},
+                {**valid, "pet_id": str(uuid.uuid4())},
+                {**valid, "behavior_severity": 1},
+            ]
+        },
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+    statuses = [r["status"] for r in data["results"]]
+    assert statuses == ["created", "error", "error", "error", "created"]
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3, 4]
+    assert "Invalid behavior category" in data["results"][1]["error"]
+    assert data["results"][2]["error"].startswith("behavior_severity")
+    assert "not found" in data["results"][3]["error"]
+    assert data["results"][4]["log"]["behavior_severity"] == 1
+    assert data["results"][0]["log"]["pet_id"] == test_pet["id"]
+
+
+@pytest.mark.asyncio
+async def test_create_abc_logs_batch_limits(client, auth_headers):
+    resp = await client.post("/api/v1/abc-logs/batch", json={"logs": []}, headers=auth_headers)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_abc_logs_keyset_pagination(client, auth_headers, test_pet):
+    log = {
+        "pet_id": test_pet["id"],
+        "antecedent_category": "other_animal",
+        "antecedent_tags": ["dog_nearby"],
+        "behavior_category": "aggression",
+        "behavior_tags": ["hissed"],
+        "behavior_severity": 2,
+        "consequence_category": "attention_removed",
+        "consequence_tags": ["walked_away"],
+    }
+    # Two logs share a timestamp so the id tie-breaker is exercised
+    times = ["2026-01-01T08:00:00", "2026-01-02T08:00:00", "2026-01-02T08:00:00"]
+    times += ["2026-01-03T08:00:00", "2026-01-04T08:00:00"]
+    resp = await client.post(
+        "/api/v1/abc-logs/batch",
+        json={"logs": [{**log, "occurred_at": t} for t in times]},
+        headers=auth_headers,
+    )
+    assert resp.json()["created"] == 5
+
+    seen = []
+    url = f"/api/v1/abc-logs?pet_id={test_pet['id']}&limit=2"
+    next_url = url
+    while next_url:
+        resp = await client.get(next_url, headers=auth_headers)
+        assert resp.status_code == 200
+        seen.extend(resp.json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        next_url = f"{url}&cursor={cursor}" if cursor else None
+
+    assert len(seen) == 5
+    assert len({row["id"] for row in seen}) == 5
+    assert [row["occurred_at"] for row in seen] == sorted(times, reverse=True)
+
+    resp = await client.get(f"{url}&offset=2&cursor={cursor or 'x'}", headers=auth_headers)
+    assert resp.status_code == 422
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_page_1000_of_100k_logs(client, auth_headers, test_pet):
+    import time
+
+    from sqlalchemy import text
+
+    from app.core.pagination import encode_cursor
+    from app.db.session import async_session_factory
+
+    total, limit, page = 100_000, 100, 1000
+    async with async_session_factory() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO abc_logs (pet_id, user_id, antecedent_category, antecedent_tags,
+                    behavior_category, behavior_tags, behavior_severity,
+                    consequence_category, consequence_tags, occurred_at)
+                SELECT p.id, p.user_id, 'other_animal', ARRAY['dog_nearby'],
+                    'aggression', ARRAY['hissed'], 1 + g % 5,
+                    'attention_removed', ARRAY['walked_away'],
+                    TIMESTAMP '2020-01-01' + g * INTERVAL '17 minutes'
+                FROM pets p, generate_series(1, :total) AS g
+                WHERE p.id = :pet_id
+                """
+            ),
+            {"pet_id": uuid.UUID(test_pet["id"]), "total": total},
+        )
+        await session.execute(text("ANALYZE abc_logs"))
+        # Boundary row of page ``page``: the last row of the page before it
+        boundary = await session.execute(
+            text(
+                "SELECT occurred_at, id FROM abc_logs WHERE pet_id = :pet_id "
+                "ORDER BY occurred_at DESC, id DESC OFFSET :n LIMIT 1"
+            ),
+            {"pet_id": uuid.UUID(test_pet["id"]), "n": (page - 1) * limit - 1},
+        )
+        cursor = encode_cursor(*boundary.one())
+        await session.commit()
+
+    base = f"/api/v1/abc-logs?pet_id={test_pet['id']}&limit={limit}"
+
+    async def timed(url: str) -> tuple[float, list]:
+        start = time.perf_counter()
+        for _ in range(5):
+            resp = await client.get(url, headers=auth_headers)
+        return (time.perf_counter() - start) * 200, resp.json()
+
+    offset_ms, by_offset = await timed(f"{base}&offset={(page - 1) * limit}")
+    keyset_ms, by_cursor = await timed(f"{base}&cursor={cursor}")
+
+    print(f"\npage {page} of {total} logs: offset {offset_ms:.1f}ms, keyset {keyset_ms:.1f}ms")
+    assert [row["id"] for row in by_cursor] == [row["id"] for row in by_offset]
+    assert keyset_ms < offset_ms
+
+
+@pytest.mark.asyncio
+async def test_list_abc_logs_filters(client, auth_headers, test_pet):
+    base = {
+        "pet_id": test_pet["id"],
+        "antecedent_category": "other_animal",
+        "antecedent_tags": ["dog_nearby"],
+        "behavior_category": "aggression",
+        "behavior_tags": ["hissed"],
+        "behavior_severity": 2,
+        "consequence_category": "attention_removed",
+        "consequence_tags": ["walked_away"],
+        "occurred_at": "2026-02-01T08:00:00",
+    }
+    logs = [
+        base,
+        {**base, "behavior_tags": ["hissed", "swatted"], "behavior_severity": 4},
+        {**base, "location": "Kitchen", "occurred_at": "2026-02-10T08:00:00"},
+        {
+            **base,
+            "antecedent_category": "environmental_change",
+            "antecedent_tags": ["doorbell"],
+            "behavior_category": "avoidance",
+            "behavior_tags": ["hid"],
+        },
+    ]
+    resp = await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+    assert resp.json()["created"] == 4
+
+    async def count(query: str) -> int:
+        resp = await client.get(
+            f"/api/v1/abc-logs?pet_id={test_pet['id']}&{query}", headers=auth_headers
+        )
+        assert resp.status_code == 200
+        return len(resp.json())
+
+    assert await count("behavior_category=avoidance") == 1
+    assert await count("behavior_tags=swatted&behavior_tags=hid") == 2
+    assert await count("behavior_tags=hissed&behavior_tags=swatted&tag_match=all") == 1
+    assert await count("severity_min=3&severity_max=5") == 1
+    assert await count("location=kitchen") == 1
+    assert await count("occurred_after=2026-02-05T00:00:00") == 1
+    assert await count("occurred_before=2026-02-05T00:00:00&antecedent_category=other_animal") == 2
+
+    resp = await client.get(
+        f"/api/v1/abc-logs?pet_id={test_pet['id']}&severity_min=4&severity_max=2",
+        headers=auth_headers,
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_abc_logs_filter_query_plans_use_indexes(client, auth_headers, test_pet):
+    from datetime import datetime
+
+    from sqlalchemy import select, text
+
+    from app.api.v1.endpoints.abc_logs import _apply_filters
+    from app.db.session import async_session_factory
+    from app.models.abc_log import ABCLog
+    from app.schemas.abc_log import ABCLogFilters
+
+    pet_id = uuid.UUID(test_pet["id"])
+    async with async_session_factory() as session:
+        # 5 pets x 20k logs; one behavior category and one tag are rare
+        await session.execute(
+            text(
+                """
+                INSERT INTO pets (user_id, name, species)
+                SELECT user_id, 'Planner ' || g, 'cat' FROM pets, generate_series(1, 4) AS g
+                WHERE id = :pet_id
+                """
+            ),
+            {"pet_id": pet_id},
+        )
+        await session.execute(
+            text(
+                """
+                INSERT INTO abc_logs (pet_id, user_id, antecedent_category, antecedent_tags,
+                    behavior_category, behavior_tags, behavior_severity,
+                    consequence_category, consequence_tags, occurred_at)
+                SELECT p.id, p.user_id,
+                    (ARRAY['other_animal', 'environmental_change', 'routine_change'])[1 + g % 3],
+                    ARRAY['tag_' || (g % 40)],
+                    CASE WHEN g % 200 = 0 THEN 'rare_behavior' ELSE 'behavior_' || (g % 8) END,
+                    CASE WHEN g % 2000 = 0 THEN ARRAY['rare_tag'] ELSE ARRAY['tag_' || (g % 30)] END,
+                    1 + g % 5,
+                    'attention_removed', ARRAY['walked_away'],
+                    TIMESTAMP '2024-01-01' + g * INTERVAL '30 minutes'
+                FROM pets p, generate_series(1, 20000) AS g
+                WHERE p.user_id = (SELECT user_id FROM pets WHERE id = :pet_id)
+                """
+            ),
+            {"pet_id": pet_id},
+        )
+        await session.execute(text("ANALYZE abc_logs"))
+
+        async def plan(filters: ABCLogFilters) -> str:
+            query = _apply_filters(
+                select(ABCLog)
+                .where(ABCLog.pet_id == pet_id)
+                .order_by(ABCLog.occurred_at.desc(), ABCLog.id.desc())
+                .limit(51),
+                filters,
+            )
+            sql = query.compile(
+                dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+            )
+            rows = await session.execute(text(f"EXPLAIN {sql}"))
+            return "\n".join(row[0] for row in rows)
+
+        tag_plan = await plan(ABCLogFilters(behavior_tags=["rare_tag"]))
+        category_plan = await plan(
+            ABCLogFilters(behavior_category="rare_behavior", occurred_after=datetime(2024, 3, 1))
+        )
+        await session.rollback()
+
+    assert "idx_abc_logs_behavior_tags" in tag_plan, tag_plan
+    assert "idx_abc_logs_pet_behavior" in category_plan, category_plan
+    for query_plan in (tag_plan, category_plan):
+        assert "Seq Scan on abc_logs" not in query_plan, query_plan
+
+
+@pytest.mark.asyncio
+async def test_search_abc_logs_ranks_and_highlights(client, auth_headers, test_pet):
+    base = {
+        "pet_id": test_pet["id"],
+        "antecedent_category": "environmental_change",
+        "antecedent_tags": ["doorbell"],
+        "behavior_category": "avoidance",
+        "behavior_tags": ["hid"],
+        "behavior_severity": 2,
+        "consequence_category": "attention_given",
+        "consequence_tags": ["went_to_pet"],
+    }
+    logs = [
+        {**base, "behavior_notes": "Hid under the guest bed for an hour after the plumber came"},
+        {**base, "antecedent_notes": "Plumber arrived", "behavior_notes": "Hissed at him"},
+        {**base, "behavior_notes": "Ate breakfast normally", "location": "Kitchen"},
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+
+    url = f"/api/v1/abc-logs/search?pet_id={test_pet['id']}"
+    resp = await client.get(f"{url}&q=plumber", headers=auth_headers)
+    assert resp.status_code == 200
+    hits = resp.json()
+    assert len(hits) == 2
+    # Behavior notes are weighted above antecedent notes
+    assert hits[0]["log"]["behavior_notes"].startswith("Hid under")
+    assert hits[0]["rank"] >= hits[1]["rank"]
+    assert "<mark>plumber</mark>" in hits[0]["snippet"]
+
+    resp = await client.get(f"{url}&q=plumber&limit=1", headers=auth_headers)
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = await client.get(f"{url}&q=plumber&limit=1&cursor={cursor}", headers=auth_headers)
+    assert [hit["log"]["id"] for hit in resp.json()] == [hits[1]["log"]["id"]]
+    assert "X-Next-Cursor" not in resp.headers
+
+    resp = await client.get(f"{url}&q=kitchen", headers=auth_headers)
+    assert len(resp.json()) == 1
+    resp = await client.get(f"{url}&q=%22guest bed%22 -plumber", headers=auth_headers)
+    assert resp.json() == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_search_50k_log_household(client, auth_headers, test_pet):
+    import time
+
+    from sqlalchemy import text
+
+    from app.db.session import async_session_factory
+
+    async with async_session_factory() as session:
+        await session.execute(
+            text(
+                """
+                INSERT INTO abc_logs (pet_id, user_id, antecedent_category, antecedent_tags,
+                    behavior_category, behavior_tags, behavior_severity,
+                    consequence_category, consequence_tags, occurred_at,
+                    antecedent_notes, behavior_notes, location)
+                SELECT p.id, p.user_id, 'environmental_change', ARRAY['doorbell'],
+                    'avoidance', ARRAY['hid'], 1 + g % 5,
+                    'attention_given', ARRAY['went_to_pet'],
+                    TIMESTAMP '2022-01-01' + g * INTERVAL '20 minutes',
+                    (ARRAY['Visitors arrived', 'Vacuum started', 'Thunderstorm outside',
+                           'Dinner was late', 'New cat next door'])[1 + g % 5],
+                    (ARRAY['Hid under the bed', 'Scratched the sofa arm', 'Yowled at the door',
+                           'Knocked a glass off the counter', 'Growled at the window'])[1 + g % 5]
+                        || CASE WHEN g % 997 = 0 THEN ' near the fireplace' ELSE '' END,
+                    (ARRAY['Bedroom', 'Living room', 'Kitchen', 'Hallway'])[1 + g % 4]
+                FROM pets p, generate_series(1, 50000) AS g
+                WHERE p.id = :pet_id
+                """
+            ),
+            {"pet_id": uuid.UUID(test_pet["id"])},
+        )
+        await session.execute(text("ANALYZE abc_logs"))
+        await session.commit()
+
+    timings = {}
+    for q in ("fireplace", "thunderstorm sofa", "hid under bed"):
+        start = time.perf_counter()
+        for _ in range(5):
+            resp = await client.get(f"/api/v1/abc-logs/search?q={q}&limit=20", headers=auth_headers)
+        assert resp.status_code == 200
+        timings[q] = (time.perf_counter() - start) * 200
+
+    print("\nsearch over 50k logs: " + ", ".join(f"{q!r} {ms:.1f}ms" for q, ms in timings.items()))
+    assert timings["fireplace"] < 50
@@ -0,0 +1,95 @@
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.services.anomaly import EWMAState, ewma_matrix
+
+
+def test_vectorised_backfill_matches_streaming_updates():
+    rng = np.random.default_rng(7)
+    counts = rng.poisson(2.0, size=(3, 60)).astype(float)
+    active = np.ones_like(counts, dtype=bool)
+    active[1, :20] = False  # this series' pet started logging later
+
+    mean, variance, seen = ewma_matrix(counts, active)
+    for i in range(3):
+        state = EWMAState()
+        for t in range(60):
+            if active[i, t]:
+                state.update(counts[i, t])
+        assert mean[i] == pytest.approx(state.mean)
+        assert variance[i] == pytest.approx(state.variance)
+        assert seen[i] == state.days_seen
+
+
+def test_spike_is_anomalous_only_with_enough_history():
+    state = EWMAState()
+    for _ in range(20):
+        state.update(1)
+    assert not state.is_anomalous(2)
+    assert state.is_anomalous(4)
+    assert not EWMAState(mean=1.0, variance=0.0, days_seen=5).is_anomalous(4)
+
+
+@pytest.mark.asyncio
+async def test_spike_in_daily_count_becomes_an_insight(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    pet_id = test_pet["id"]
+    now = datetime.now(UTC)
+    history = [
+        abc_log_payload(pet_id, occurred_at=(now - timedelta(days=d)).isoformat())
+        for d in range(20, 0, -1)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": history}, headers=auth_headers)
+
+    def spikes(insights: list[dict]) -> list[dict]:
+        return [i for i in insights if i["title"].startswith("Unusual day")]
+
+    for _ in range(2):
+        await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+    resp = await client.get(f"/api/v1/pets/{pet_id}/insights", headers=auth_headers)
+    assert spikes(resp.json()) == []
+
+    for _ in range(3):
+        await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+    resp = await client.get(f"/api/v1/pets/{pet_id}/insights", headers=auth_headers)
+    raised = spikes(resp.json())
+    assert len(raised) == 1  # once per category per day
+    assert "avoidance" in raised[0]["title"]
+
+
+@pytest.mark.asyncio
+async def test_batch_updates_baselines_in_two_reads(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    pet_id = test_pet["id"]
+    now = datetime.now(UTC)
+    logs = [
+        abc_log_payload(pet_id, occurred_at=(now - timedelta(days=d)).isoformat())
+        for d in range(30, 0, -1)
+    ]
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        resp = await client.post(
+            "/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    assert resp.status_code == 200
+    reads = [
+        s
+        for s in statements
+        if s.lstrip().startswith("SELECT")
+        and ("FROM behavior_baselines" in s or "FROM pet_daily_stats" in s)
+    ]
+    # One read each for the baselines and the rollup, not one per day
+    assert len(reads) == 2, reads
@@ -0,0 +1,216 @@
+import json
+import uuid
+from datetime import date, datetime, timedelta
+
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.db.partitions import ensure_partitions
+from app.db.session import async_session_factory
+from app.services.archive import (
+    ArchiveWriter,
+    _rewrite_without,
+    archivable_months,
+    archive_month,
+    detach_month,
+    read_pet_rows,
+)
+
+
+def _row(pet_id: str, n: int, severity: int = 2) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "pet_id": pet_id,
+        "user_id": "u1",
+        "occurred_at": datetime(2023, 5, 1) + timedelta(hours=n),
+        "antecedent_category": "environmental_change",
+        "antecedent_tags": ["doorbell"],
+        "antecedent_notes": None,
+        "behavior_category": "avoidance" if n % 2 else "vocalization",
+        "behavior_tags": ["hid"],
+        "behavior_severity": severity,
+        "behavior_notes": f"note {n}",
+        "consequence_category": "attention_given",
+        "consequence_tags": ["went_to_pet"],
+        "consequence_notes": None,
+        "location": None,
+        "duration_seconds": None,
+        "other_pets_present": None,
+        "created_at": datetime(2023, 5, 1) + timedelta(hours=n),
+    }
+
+
+def test_writer_manifest_points_at_each_pets_row_groups(tmp_path):
+    filesystem = pafs.LocalFileSystem()
+    path = str(tmp_path / "2023-05.parquet")
+    writer = ArchiveWriter(path, filesystem, row_group_rows=4)
+    writer.add_rows([_row("a", n) for n in range(3)])
+    writer.add_rows([_row("b", n, severity=5) for n in range(6)])
+    writer.add_rows([_row("c", n) for n in range(2)])
+    writer.close()
+
+    assert pq.ParquetFile(path).metadata.num_row_groups == 3
+    assert writer.segments["a"].row_groups == [0]
+    assert writer.segments["b"].row_groups == [0, 1, 2]
+    assert writer.segments["c"].row_groups == [2]
+
+    b = writer.segments["b"]
+    assert (b.row_count, b.severity_sum, b.severity_max) == (6, 30, 5)
+    assert b.behavior_counts == {"avoidance": 3, "vocalization": 3}
+    assert b.first_occurred_at == datetime(2023, 5, 1)
+
+    rows = read_pet_rows(path, filesystem, writer.segments["c"].row_groups, "c")
+    assert [r["behavior_notes"] for r in rows] == ["note 0", "note 1"]
+    assert rows[0]["occurred_at"] == datetime(2023, 5, 1)
+
+
+def test_rewrite_leaves_out_purged_pets(tmp_path):
+    filesystem = pafs.LocalFileSystem()
+    source = str(tmp_path / "old.parquet")
+    writer = ArchiveWriter(source, filesystem, row_group_rows=4)
+    writer.add_rows([_row(pet, n) for pet in ("a", "b", "c") for n in range(3)])
+    writer.close()
+
+    rewritten = _rewrite_without(source, str(tmp_path / "new.parquet"), filesystem, {"b"})
+    assert set(rewritten.segments) == {"a", "c"}
+    rows = pq.read_table(str(tmp_path / "new.parquet")).to_pylist()
+    assert [row["pet_id"] for row in rows] == ["a"] * 3 + ["c"] * 3
+    c = rewritten.segments["c"].row_groups
+    assert [
+        r["behavior_notes"]
+        for r in read_pet_rows(str(tmp_path / "new.parquet"), filesystem, c, "c")
+    ] == [
+        "note 0",
+        "note 1",
+        "note 2",
+    ]
+
+    assert (
+        _rewrite_without(source, str(tmp_path / "none.parquet"), filesystem, {"a", "b", "c"})
+        is None
+    )
+    assert not (tmp_path / "none.parquet").exists()
+
+
+@pytest.mark.asyncio
+async def test_archived_month_is_read_through(
+    client, auth_headers, test_pet, tmp_path, monkeypatch, abc_log_payload
+):
+    monkeypatch.setattr(settings, "ARCHIVE_URI", str(tmp_path))
+    month = date(2020, 2, 1)
+    async with async_session_factory() as session:
+        await ensure_partitions(session, [month])
+        await session.commit()
+    logs = [
+        abc_log_payload(test_pet["id"], occurred_at=f"2020-02-{day:02d}T10:00:00")
+        for day in (3, 4, 5)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+    await client.post(
+        "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+    )
+
+    async with async_session_factory() as session:
+        await detach_month(session, month)
+        await session.commit()
+        assert month in await archivable_months(session, date(2020, 3, 1))
+        assert await archive_month(session, month) == 3
+        await session.commit()
+        for name in ("abc_logs_p202002", "abc_logs_p202002_archiving"):
+            partition = await session.execute(text(f"SELECT to_regclass('{name}')"))
+            assert partition.scalar() is None
+
+    resp = await client.get(
+        f"/api/v1/exports/abc-logs?pet_id={test_pet['id']}", headers=auth_headers
+    )
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(exported) == 4
+    assert [row["occurred_at"][:10] for row in exported[:3]] == [
+        "2020-02-03",
+        "2020-02-04",
+        "2020-02-05",
+    ]
+
+    resp = await client.get(
+        f"/api/v1/progress/dashboard?pet_id={test_pet['id']}", headers=auth_headers
+    )
+    assert resp.json()["total_logs"] == 4
+    assert resp.json()["avg_severity"] == 3.0
+
+    # The sync feed does not report archived rows as deleted
+    resp = await client.get("/api/v1/sync/changes", headers=auth_headers)
+    deleted = {row["id"] for row in resp.json()["deleted"]}
+    assert not deleted & {row["id"] for row in exported}
+
+
+@pytest.mark.asyncio
+async def test_deleting_a_pet_purges_its_archived_rows(
+    client, auth_headers, test_pet, tmp_path, monkeypatch, abc_log_payload
+):
+    monkeypatch.setattr(settings, "ARCHIVE_URI", str(tmp_path))
+    month = date(2020, 3, 1)
+    async with async_session_factory() as session:
+        await ensure_partitions(session, [month])
+        await session.commit()
+    resp = await client.post(
+        "/api/v1/pets", json={"name": "Other", "species": "cat"}, headers=auth_headers
+    )
+    other = resp.json()["id"]
+    logs = [
+        abc_log_payload(pet_id, occurred_at=f"2020-03-{day:02d}T10:00:00")
+        for pet_id in (test_pet["id"], other)
+        for day in (3, 4)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+    async with async_session_factory() as session:
+        await detach_month(session, month)
+        await session.commit()
+        assert await archive_month(session, month) == 4
+        await session.commit()
+
+    resp = await client.delete(f"/api/v1/pets/{test_pet['id']}", headers=auth_headers)
+    assert resp.status_code == 204
+
+    files = list(tmp_path.rglob("*.parquet"))
+    assert len(files) == 1
+    archived = pq.read_table(str(files[0])).to_pylist()
+    assert {row["pet_id"] for row in archived} == {other}
+    resp = await client.get(f"/api/v1/exports/abc-logs?pet_id={other}", headers=auth_headers)
+    assert len(resp.text.splitlines()) == 2
+
+
+@pytest.mark.asyncio
+async def test_user_export_keeps_per_pet_order(
+    client, auth_headers, test_pet, tmp_path, monkeypatch, abc_log_payload
+):
+    monkeypatch.setattr(settings, "ARCHIVE_URI", str(tmp_path))
+    month = date(2020, 4, 1)
+    async with async_session_factory() as session:
+        await ensure_partitions(session, [month])
+        await session.commit()
+    resp = await client.post(
+        "/api/v1/pets", json={"name": "Other", "species": "cat"}, headers=auth_headers
+    )
+    other = resp.json()["id"]
+    archived = [
+        abc_log_payload(pet_id, occurred_at=f"2020-04-{day:02d}T10:00:00")
+        for pet_id in (test_pet["id"], other)
+        for day in (3, 4)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": archived}, headers=auth_headers)
+    async with async_session_factory() as session:
+        await detach_month(session, month)
+        await session.commit()
+        assert await archive_month(session, month) == 4
+        await session.commit()
+    for pet_id in (test_pet["id"], other):
+        await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+
+    resp = await client.get("/api/v1/exports/abc-logs", headers=auth_headers)
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(exported) == 6
+    keys = [(row["pet_id"], row["occurred_at"]) for row in exported]
+    assert keys == sorted(keys)
@@ -0,0 +1,163 @@
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy import delete, select
+
+from app.config import settings
+from app.db.session import async_session_factory
+from app.models.bip import BehaviorPlan, BipBatchRun
+from app.services import bip_batch
+from app.services.bip_batch import PetContext, build_request, parse_plan
+from tests.anthropic_stub import AnthropicStub
+
+
+@pytest.fixture
+def anthropic_stub(monkeypatch):
+    with AnthropicStub() as stub:
+        monkeypatch.setattr(settings, "ANTHROPIC_BASE_URL", stub.base_url)
+        monkeypatch.setattr(settings, "ANTHROPIC_API_KEY", "test-key")
+        yield stub
+
+
+def _context(**kwargs) -> PetContext:
+    return PetContext(
+        pet_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        name="Luna",
+        species="cat",
+        breed=None,
+        total_logs=12,
+        avg_severity=3.25,
+        behaviors=[("avoidance", 8), ("aggression", 4)],
+        pairs=[("environmental_change", "avoidance", 6)],
+        **kwargs,
+    )
+
+
+def test_build_request_uses_pet_id_and_aggregates():
+    ctx = _context(functions=["escape"])
+    request = build_request(ctx)
+
+    assert request["custom_id"] == str(ctx.pet_id)
+    prompt = request["params"]["messages"][0]["content"]
+    assert "Logged incidents: 12, average severity 3.2/5" in prompt
+    assert "avoidance (8), aggression (4)" in prompt
+    assert "environmental_change -> avoidance (6)" in prompt
+    assert "Behavior functions identified so far: escape" in prompt
+
+
+def test_parse_plan_handles_fenced_and_unstructured_replies():
+    plan = parse_plan(
+        '```json\n{"target_behavior": "scratching", "function": "sensory"}\n```', None
+    )
+    assert plan["target_behavior"] == "scratching"
+    assert plan["function"] == "sensory"
+
+    plan = parse_plan('{"target_behavior": "barking", "function": "boredom"}', None)
+    assert plan["function"] is None
+
+    plan = parse_plan("Keep the litter box clean.", "elimination")
+    assert plan == {
+        "summary": "Keep the litter box clean.",
+        "unstructured": True,
+        "function": None,
+        "target_behavior": "elimination",
+    }
+
+
+@pytest.mark.asyncio
+async def test_stub_batch_round_trip(anthropic_stub):
+    anthropic_stub.polls_until_ended = 2
+    ctx_ok, ctx_err = _context(), _context()
+    anthropic_stub.errored.add(str(ctx_err.pet_id))
+
+    client = bip_batch.anthropic_client()
+    batch = await client.messages.batches.create(
+        requests=[build_request(ctx_ok), build_request(ctx_err)]
+    )
+    run = BipBatchRun(provider_batch_id=batch.id, pet_ids=[ctx_ok.pet_id, ctx_err.pet_id])
+
+    assert not await bip_batch.batch_ended(client, run)
+    assert not await bip_batch.batch_ended(client, run)
+    assert await bip_batch.batch_ended(client, run)
+
+    results = {
+        item.custom_id: item.result
+        async for item in await client.messages.batches.results(batch.id)
+    }
+    assert results[str(ctx_err.pet_id)].type == "errored"
+    plan = parse_plan(results[str(ctx_ok.pet_id)].message.content[0].text, None)
+    assert plan["target_behavior"] == "avoidance"
+    assert plan["function"] == "escape"
+
+
+@pytest.mark.asyncio
+async def test_generate_bips_for_eligible_pet(client, auth_headers, test_pet, anthropic_stub):
+    for _ in range(10):
+        resp = await client.post(
+            "/api/v1/abc-logs",
+            json={
+                "pet_id": test_pet["id"],
+                "antecedent_category": "environmental_change",
+                "antecedent_tags": ["doorbell"],
+                "behavior_category": "avoidance",
+                "behavior_tags": ["hid"],
+                "behavior_severity": 3,
+                "consequence_category": "attention_given",
+                "consequence_tags": ["went_to_pet"],
+            },
+            headers=auth_headers,
+        )
+        assert resp.status_code == 201
+
+    pet_id = uuid.UUID(test_pet["id"])
+    stub_client = bip_batch.anthropic_client()
+    async with async_session_factory() as session:
+        pets = await bip_batch.collect_eligible_pets(session, [pet_id])
+        assert [p.id for p in pets] == [pet_id]
+
+        run = await bip_batch.submit(session, stub_client, pets)
+        assert run.status == "submitted"
+        assert "avoidance (10)" in anthropic_stub.created[0][0]["params"]["messages"][0]["content"]
+
+        # An in-flight pet is not collected again, and the run is resumable
+        assert await bip_batch.collect_eligible_pets(session, [pet_id]) == []
+        assert [r.id for r in await bip_batch.open_runs(session)] == [run.id]
+
+        # One poll chain at a time: a second claim fails while the lease is held
+        token = await bip_batch.claim_polling(session, run.id)
+        assert token is not None
+        assert await bip_batch.claim_polling(session, run.id) is None
+        assert await bip_batch.claim_polling(session, run.id, uuid.uuid4()) is None
+        assert await bip_batch.claim_polling(session, run.id, token) == token
+
+        assert await bip_batch.batch_ended(stub_client, run)
+
+        # Two pollers persisting the same run at once still insert one plan
+        async with async_session_factory() as other:
+            other_run = await other.get(BipBatchRun, run.id)
+            summaries = await asyncio.gather(
+                bip_batch.persist_results(session, stub_client, run),
+                bip_batch.persist_results(other, bip_batch.anthropic_client(), other_run),
+            )
+        assert [summary["succeeded"] for summary in summaries] == [1, 1]
+
+        # Re-processing the same run (e.g. after a crash) does not duplicate plans
+        run.status = "submitted"
+        await session.commit()
+        await bip_batch.persist_results(session, stub_client, run)
+        plans = (
+            (await session.execute(select(BehaviorPlan).where(BehaviorPlan.pet_id == pet_id)))
+            .scalars()
+            .all()
+        )
+        assert len(plans) == 1
+        assert plans[0].target_behavior == "avoidance"
+        assert plans[0].function == "escape"
+
+        # A pet with an active plan is no longer eligible
+        assert await bip_batch.collect_eligible_pets(session, [pet_id]) == []
+
+        await session.execute(delete(BipBatchRun).where(BipBatchRun.id == run.id))
+        await session.commit()
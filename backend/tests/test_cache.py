@@ -0,0 +1,108 @@
+import time
+import uuid
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import LocalLRU, invalidate_pet, request_key, response_cache
+from app.db.session import async_session_factory, commit
+from app.models.pet import Pet
+
+
+def test_local_lru_evicts_and_expires():
+    lru = LocalLRU(max_entries=2, ttl_seconds=60)
+    assert lru.put("a", b"1") == 0
+    assert lru.put("b", b"2") == 0
+    assert lru.get("a") == b"1"
+    assert lru.put("c", b"3") == 1  # "b" was least recently used
+    assert lru.get("b") is None
+    assert lru.get("a") == b"1"
+
+    lru.put("d", b"4", ttl_seconds=1)
+    lru._entries["d"] = (time.monotonic() - 1, b"4")
+    assert lru.get("d") is None
+
+
+def test_request_key_covers_structured_parameters():
+    class Filters(BaseModel):
+        tags: list[str]
+        severity: int | None = None
+
+    session = AsyncSession()
+    key = request_key("ns", {"pet_id": uuid.UUID(int=1), "filters": {"a": 1, "b": 2}})
+    assert key == request_key("ns", {"filters": {"b": 2, "a": 1}, "pet_id": uuid.UUID(int=1)})
+    assert key != request_key("ns", {"pet_id": uuid.UUID(int=1), "filters": {"a": 1, "b": 3}})
+    assert request_key("ns", {"f": Filters(tags=["x"]), "db": session}) != request_key(
+        "ns", {"f": Filters(tags=["y"]), "db": session}
+    )
+    assert request_key("ns", {"ids": [1, 2]}) != request_key("ns", {"ids": [2, 1]})
+    with pytest.raises(TypeError, match="'when'"):
+        request_key("ns", {"when": object()})
+
+
+@pytest.mark.asyncio
+async def test_mutations_invalidate_every_dependent_entry(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    pet_id = test_pet["id"]
+    urls = [
+        "/api/v1/pets",
+        f"/api/v1/pets/{pet_id}",
+        f"/api/v1/pets/{pet_id}/insights",
+        f"/api/v1/pets/{pet_id}/insights/summary",
+        f"/api/v1/abc-logs/summary?pet_id={pet_id}",
+        f"/api/v1/progress/frequency?pet_id={pet_id}",
+        f"/api/v1/progress/severity-trend?pet_id={pet_id}",
+        f"/api/v1/progress/category-breakdown?pet_id={pet_id}",
+        "/api/v1/progress/household",
+    ]
+
+    async def read_all() -> tuple[list[dict], int, int]:
+        before = response_cache.stats()
+        bodies = []
+        for url in urls:
+            resp = await client.get(url, headers=auth_headers)
+            assert resp.status_code == 200, url
+            bodies.append(resp.json())
+        after = response_cache.stats()
+        hits = after["local_hits"] + after["remote_hits"]
+        hits -= before["local_hits"] + before["remote_hits"]
+        return bodies, hits, after["misses"] - before["misses"]
+
+    await read_all()
+    _, hits, misses = await read_all()
+    assert (hits, misses) == (len(urls), 0)
+
+    # A profile edit touches the pet lists and the pet itself
+    await client.put(f"/api/v1/pets/{pet_id}", json={"name": "Renamed"}, headers=auth_headers)
+    bodies, hits, misses = await read_all()
+    assert (hits, misses) == (0, len(urls))
+    assert bodies[0][0]["name"] == "Renamed"
+    assert bodies[1]["name"] == "Renamed"
+
+    # A log changes everything derived from the pet's history
+    await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+    bodies, hits, misses = await read_all()
+    assert (hits, misses) == (0, len(urls))
+    assert bodies[4]["total_logs"] == 1
+    assert sum(point["count"] for point in bodies[5]["data"]) == 1
+    assert bodies[8]["pets"][0]["total_logs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_read_before_commit_is_not_served_after_it(client, auth_headers, test_pet):
+    url = f"/api/v1/pets/{test_pet['id']}"
+    async with async_session_factory() as session:
+        pet = await session.get(Pet, uuid.UUID(test_pet["id"]))
+        pet.name = "Committed"
+        await session.flush()
+        invalidate_pet(session, test_pet["user_id"], pet.id)
+
+        # A read in the gap sees (and caches) the row as it was
+        resp = await client.get(url, headers=auth_headers)
+        assert resp.json()["name"] == "TestCat"
+        await commit(session)
+
+    resp = await client.get(url, headers=auth_headers)
+    assert resp.json()["name"] == "Committed"
@@ -42,3 +42,156 @@ async def test_coaching_no_auth(client, test_pet):
         },
     )
     assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_coaching_telemetry_requires_admin(client, auth_headers):
+    resp = await client.get("/api/v1/admin/coaching-telemetry", headers=auth_headers)
+    assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_coaching_telemetry_aggregates(client, auth_headers, test_pet, monkeypatch):
+    from datetime import UTC, datetime, timedelta
+
+    from sqlalchemy import func, select
+
+    from app.config import settings
+    from app.db.session import async_session_factory
+    from app.models.coaching_session import CoachingMessage
+    from tests.conftest import TEST_USER_ID
+
+    monkeypatch.setattr(settings, "ADMIN_USER_IDS", [TEST_USER_ID])
+    await client.post(
+        "/api/v1/analysis/coaching",
+        json={"pet_id": test_pet["id"], "question": "Why does my cat knock things over?"},
+        headers=auth_headers,
+    )
+
+    resp = await client.get("/api/v1/admin/coaching-telemetry?days=1", headers=auth_headers)
+    assert resp.status_code == 200
+    rows = resp.json()["data"]
+    fallback = next(r for r in rows if r["model"] == "fallback")
+    assert fallback["calls"] >= 1
+    assert fallback["fallbacks"] == fallback["calls"]
+    assert "latency_ms_p50" in fallback
+
+    # Messages are stamped on the same (UTC) clock as the report's cutoff
+    async with async_session_factory() as session:
+        stamped = await session.scalar(select(func.max(CoachingMessage.created_at)))
+    assert abs(stamped - datetime.now(UTC).replace(tzinfo=None)) < timedelta(minutes=1)
+
+
+@pytest.mark.asyncio
+async def test_coaching_session_messages_are_paginated(client, auth_headers, test_pet):
+    resp = await client.post(
+        "/api/v1/analysis/coaching",
+        json={"pet_id": test_pet["id"], "question": "Why does my cat yowl at night?"},
+        headers=auth_headers,
+    )
+    session_id = resp.json()["session_id"]
+    for question in ("Should I feed her later?", "What about a night light?"):
+        await client.post(
+            "/api/v1/analysis/coaching",
+            json={"pet_id": test_pet["id"], "question": question, "session_id": session_id},
+            headers=auth_headers,
+        )
+
+    resp = await client.get(
+        f"/api/v1/analysis/coaching/sessions/{session_id}?limit=4", headers=auth_headers
+    )
+    assert resp.status_code == 200
+    page = resp.json()
+    assert [m["role"] for m in page["messages"]] == ["user", "assistant"] * 2
+    assert page["messages"][-1]["role"] == "assistant"
+    assert page["next_cursor"]
+
+    resp = await client.get(
+        f"/api/v1/analysis/coaching/sessions/{session_id}?limit=4&cursor={page['next_cursor']}",
+        headers=auth_headers,
+    )
+    older = resp.json()
+    assert [m["content"] for m in older["messages"]][0] == "Why does my cat yowl at night?"
+    assert len(older["messages"]) == 2
+    assert older["next_cursor"] is None
+
+    resp = await client.get(
+        f"/api/v1/analysis/coaching/sessions?pet_id={test_pet['id']}&limit=1",
+        headers=auth_headers,
+    )
+    sessions = resp.json()
+    assert sessions[0]["id"] == session_id
+    assert sessions[0]["message_count"] == 6
+
+
+@pytest.mark.asyncio
+async def test_session_list_keeps_sessions_active_while_paging(client, auth_headers, test_pet):
+    async def ask(question: str, session_id: str | None = None) -> str:
+        resp = await client.post(
+            "/api/v1/analysis/coaching",
+            json={"pet_id": test_pet["id"], "question": question, "session_id": session_id},
+            headers=auth_headers,
+        )
+        return resp.json()["session_id"]
+
+    older = await ask("Why does my cat scratch the couch?")
+    newer = await ask("Why does my cat hide from guests?")
+    url = f"/api/v1/analysis/coaching/sessions?pet_id={test_pet['id']}&limit=1"
+    resp = await client.get(url, headers=auth_headers)
+    assert [s["id"] for s in resp.json()] == [newer]
+
+    # The older session gets a new turn between pages; it must not be skipped
+    await ask("Should I get a scratching post?", older)
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = await client.get(f"{url}&cursor={cursor}", headers=auth_headers)
+    assert [s["id"] for s in resp.json()] == [older]
+
+
+@pytest.mark.asyncio
+async def test_coaching_sessions_invalid_cursor(client, auth_headers, test_pet):
+    resp = await client.get(
+        f"/api/v1/analysis/coaching/sessions?pet_id={test_pet['id']}&cursor=not-a-cursor",
+        headers=auth_headers,
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_coaching_turn_round_trips(client, auth_headers, test_pet, abc_log_payload):
+    from sqlalchemy import event
+
+    from app.db.session import engine
+
+    log = abc_log_payload(test_pet["id"])
+    await client.post("/api/v1/abc-logs/batch", json={"logs": [log] * 3}, headers=auth_headers)
+    resp = await client.post(
+        "/api/v1/analysis/coaching",
+        json={"pet_id": test_pet["id"], "question": "Why does my cat chew cables?"},
+        headers=auth_headers,
+    )
+    session_id = resp.json()["session_id"]
+    # A log written between turns reaches the index without a query of its own
+    await client.post("/api/v1/abc-logs", json=log, headers=auth_headers)
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        resp = await client.post(
+            "/api/v1/analysis/coaching",
+            json={
+                "pet_id": test_pet["id"],
+                "question": "Is it because she is bored?",
+                "session_id": session_id,
+            },
+            headers=auth_headers,
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert resp.status_code == 200
+    # user lookup, context load (including the history-index delta), write
+    assert len(statements) <= 3, statements
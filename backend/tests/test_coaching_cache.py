@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from app.core.text import tokenize
+from app.services.coaching_cache import CoachingAnswerCache, profile_key
+
+SCOPE = "user-1:pet-1"
+
+
+def test_tokenize_strips_name_and_stopwords():
+    tokens = tokenize("Why does Luna scratch the couches?", pet_name="Luna")
+    assert tokens == ["pet", "scratch", "couche"]
+
+
+def test_profile_key_is_order_independent():
+    assert profile_key("cat", ["elimination", "aggression"]) == profile_key(
+        "cat", ["aggression", "elimination"]
+    )
+    assert profile_key("cat") == "cat"
+
+
+def test_exact_and_similar_hits():
+    cache = CoachingAnswerCache(min_similarity=0.5)
+    cache.put(
+        "cat",
+        ["elimination"],
+        "Why does my cat pee outside the litter box?",
+        "Luna may dislike the litter box location.",
+        model="claude-haiku",
+        pet_name="Luna",
+        scope=SCOPE,
+    )
+
+    hit = cache.get(
+        "cat", ["elimination"], "why does my cat pee outside the litter box", scope=SCOPE
+    )
+    assert hit is not None
+    assert hit.answer == "your pet may dislike the litter box location."
+
+    # The same pet, since renamed
+    similar = cache.get(
+        "cat",
+        ["elimination"],
+        "My cat keeps peeing outside her litter box",
+        pet_name="Milo",
+        scope=SCOPE,
+    )
+    assert similar is not None
+    assert similar.answer.startswith("Milo may dislike")
+    assert cache.stats["exact_hits"] == 1
+    assert cache.stats["similar_hits"] == 1
+
+
+def test_miss_for_unrelated_question_or_other_profile():
+    cache = CoachingAnswerCache()
+    question = "Why does my cat pee outside the box?"
+    cache.put("cat", ["elimination"], question, "A", model="m", scope=SCOPE)
+
+    assert (
+        cache.get("cat", ["elimination"], "How do I stop my cat biting visitors?", scope=SCOPE)
+        is None
+    )
+    assert cache.get("dog", ["elimination"], question, scope=SCOPE) is None
+    assert cache.stats["misses"] == 2
+
+
+def test_generated_answers_are_never_shared_across_pets():
+    cache = CoachingAnswerCache()
+    question = "Why does my cat pee outside the box?"
+    with pytest.raises(ValueError):
+        cache.put("cat", ["elimination"], question, "A", model="m")
+
+    cache.put(
+        "cat", ["elimination"], question, "Since Luna's move on the 3rd...", model="m", scope=SCOPE
+    )
+    assert cache.get("cat", ["elimination"], question) is None
+    assert cache.get("cat", ["elimination"], question, scope="user-2:pet-2") is None
+    assert cache.get("cat", ["elimination"], question, scope=SCOPE) is not None
+
+
+def test_ttl_expiry():
+    cache = CoachingAnswerCache(ttl_seconds=-1)
+    cache.put("dog", [], "Why does my dog bark at the mailman?", "A", model="m", scope=SCOPE)
+    assert cache.get("dog", [], "Why does my dog bark at the mailman?", scope=SCOPE) is None
+    assert len(cache) == 0
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = CoachingAnswerCache(max_entries=2)
+    cache.put("dog", [], "Why does my dog bark at the mailman?", "bark", model="m", scope=SCOPE)
+    cache.put("dog", [], "How do I stop my dog chewing shoes?", "chew", model="m", scope=SCOPE)
+    assert cache.get("dog", [], "Why does my dog bark at the mailman?", scope=SCOPE) is not None
+
+    cache.put("dog", [], "Why does my dog jump on guests?", "jump", model="m", scope=SCOPE)
+    assert len(cache) == 2
+    assert cache.stats["evictions"] == 1
+    assert cache.get("dog", [], "How do I stop my dog chewing shoes?", scope=SCOPE) is None
+    assert cache.get("dog", [], "Why does my dog bark at the mailman?", scope=SCOPE) is not None
+
+
+def test_faq_entries_are_pinned_and_serve_any_behavior_profile(tmp_path):
+    faq = tmp_path / "faq.json"
+    faq.write_text(
+        json.dumps(
+            [
+                {
+                    "species": "cat",
+                    "question": "Why does my cat pee outside the litter box?",
+                    "answer": "Check for medical causes first.",
+                }
+            ]
+        )
+    )
+    cache = CoachingAnswerCache(max_entries=1, ttl_seconds=-1)
+    assert cache.load_faq(str(faq)) == 1
+
+    cache.put(
+        "cat", ["scratching"], "Why does my cat scratch the sofa?", "A", model="m", scope=SCOPE
+    )
+    hit = cache.get("cat", ["aggression"], "Why does my cat pee outside the litter box?")
+    assert hit is not None
+    assert hit.model == "faq"
@@ -0,0 +1,69 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+
+from app.db.session import async_session_factory
+from app.services.daily_stats import check_daily_stats, rebuild_daily_stats
+
+
+def _at(days_ago: int) -> str:
+    return (datetime.now(UTC) - timedelta(days=days_ago)).replace(tzinfo=None).isoformat()
+
+
+@pytest.mark.asyncio
+async def test_rollup_follows_log_writes(client, auth_headers, test_pet, abc_log_payload):
+    pet_id = test_pet["id"]
+    logs = [
+        abc_log_payload(pet_id, occurred_at=_at(2), behavior_severity=5),
+        abc_log_payload(pet_id, occurred_at=_at(2)),
+        abc_log_payload(
+            pet_id, occurred_at=_at(1), behavior_category="vocalization", behavior_tags=["yowling"]
+        ),
+    ]
+    resp = await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+    created = [result["log"]["id"] for result in resp.json()["results"]]
+
+    # Moving the severity-5 log to another day lowers its old day's max;
+    # deleting a day's only log removes the day.
+    await client.put(
+        f"/api/v1/abc-logs/{created[0]}", json={"occurred_at": _at(3)}, headers=auth_headers
+    )
+    await client.delete(f"/api/v1/abc-logs/{created[2]}", headers=auth_headers)
+
+    resp = await client.get(
+        f"/api/v1/progress/severity-trend?pet_id={pet_id}&days=7", headers=auth_headers
+    )
+    assert [(d["avg_severity"], d["max_severity"]) for d in resp.json()["data"]] == [
+        (5.0, 5),
+        (3.0, 3),
+    ]
+    resp = await client.get(
+        f"/api/v1/progress/category-breakdown?pet_id={pet_id}&days=7", headers=auth_headers
+    )
+    assert resp.json()["behaviors"] == [{"category": "avoidance", "count": 2}]
+
+    async with async_session_factory() as session:
+        assert await check_daily_stats(session, uuid.UUID(pet_id)) == []
+
+
+@pytest.mark.asyncio
+async def test_check_and_rebuild(client, auth_headers, test_pet, abc_log_payload):
+    pet_id = uuid.UUID(test_pet["id"])
+    await client.post(
+        "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+    )
+
+    async with async_session_factory() as session:
+        await session.execute(
+            text("UPDATE pet_daily_stats SET log_count = 99 WHERE pet_id = :pet_id"),
+            {"pet_id": pet_id},
+        )
+        await session.commit()
+        mismatches = await check_daily_stats(session, pet_id)
+        assert [(m.raw["log_count"], m.rollup["log_count"]) for m in mismatches] == [(1, 99)]
+
+        assert await rebuild_daily_stats(session, pet_id) == 1
+        await session.commit()
+        assert await check_daily_stats(session, pet_id) == []
@@ -0,0 +1,56 @@
+import pytest
+
+from app.core.etag import etag_matches, weak_etag
+
+
+def test_etag_matches_weakly():
+    etag = weak_etag("pet", 3, "20260301")
+    assert etag == 'W/"pet-3-20260301"'
+    assert etag_matches(etag, etag)
+    assert etag_matches('"pet-3-20260301"', etag)
+    assert etag_matches('W/"other", W/"pet-3-20260301"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"pet-4-20260301"', etag)
+    assert not etag_matches(None, etag)
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_until_pet_data_changes(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    pet_id = test_pet["id"]
+    url = f"/api/v1/progress/dashboard?pet_id={pet_id}"
+    resp = await client.get(url, headers=auth_headers)
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    resp = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    # Logs, profile edits and insight changes all move the version on
+    await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+    resp = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["total_logs"] == 1
+
+    etag = resp.headers["etag"]
+    await client.put(f"/api/v1/pets/{pet_id}", json={"name": "Renamed"}, headers=auth_headers)
+    resp = await client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+
+    insights_url = f"/api/v1/pets/{pet_id}/insights"
+    resp = await client.get(insights_url, headers=auth_headers)
+    resp = await client.get(
+        insights_url, headers={**auth_headers, "If-None-Match": resp.headers["etag"]}
+    )
+    assert resp.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_checks_ownership_first(client, auth_headers):
+    resp = await client.get(
+        "/api/v1/abc-logs/summary?pet_id=00000000-0000-0000-0000-000000000000",
+        headers={**auth_headers, "If-None-Match": "*"},
+    )
+    assert resp.status_code == 404
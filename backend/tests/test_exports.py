@@ -0,0 +1,72 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+NOTES = 'Hid under the bed, then "yowled"'
+
+
+@pytest.mark.asyncio
+async def test_export_abc_logs_ndjson_and_csv(client, auth_headers, test_pet, abc_log_payload):
+    logs = [
+        abc_log_payload(
+            test_pet["id"], antecedent_tags=["doorbell", "visitor_arrived"], behavior_notes=NOTES
+        )
+        for _ in range(3)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+
+    resp = await client.get(
+        f"/api/v1/exports/abc-logs?pet_id={test_pet['id']}", headers=auth_headers
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert "attachment" in resp.headers["content-disposition"]
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(rows) == 3
+    assert rows[0]["pet_id"] == test_pet["id"]
+    assert rows[0]["antecedent_tags"] == ["doorbell", "visitor_arrived"]
+
+    resp = await client.get(
+        f"/api/v1/exports/abc-logs?pet_id={test_pet['id']}&format=csv", headers=auth_headers
+    )
+    assert resp.headers["content-type"].startswith("text/csv")
+    reader = list(csv.DictReader(io.StringIO(resp.text)))
+    assert len(reader) == 3
+    assert reader[0]["antecedent_tags"] == "doorbell;visitor_arrived"
+    assert reader[0]["behavior_notes"] == NOTES
+
+
+@pytest.mark.asyncio
+async def test_export_gzip(client, auth_headers, test_pet, abc_log_payload):
+    await client.post(
+        "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+    )
+    resp = await client.get(
+        f"/api/v1/exports/abc-logs?pet_id={test_pet['id']}&gzip=true", headers=auth_headers
+    )
+    assert resp.headers["content-type"] == "application/gzip"
+    assert resp.headers["content-disposition"].endswith('.ndjson.gz"')
+    lines = gzip.decompress(resp.content).decode().splitlines()
+    assert len(lines) == 1
+
+    resp = await client.get("/api/v1/exports/insights?format=csv", headers=auth_headers)
+    assert resp.status_code == 200
+    assert resp.text.splitlines()[0].startswith("id,pet_id,insight_type")
+
+
+@pytest.mark.asyncio
+async def test_export_validation(client, auth_headers):
+    resp = await client.get(
+        "/api/v1/exports/abc-logs?pet_id=00000000-0000-0000-0000-000000000099",
+        headers=auth_headers,
+    )
+    assert resp.status_code == 404
+
+    resp = await client.get("/api/v1/exports/pets", headers=auth_headers)
+    assert resp.status_code == 422
+
+    resp = await client.get("/api/v1/exports/coaching-messages?format=xml", headers=auth_headers)
+    assert resp.status_code == 422
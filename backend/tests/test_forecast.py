@@ -0,0 +1,70 @@
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.forecast import HORIZON_DAYS, fit_poisson_trend
+
+
+def test_batch_fit_matches_single_series_fits():
+    rng = np.random.default_rng(11)
+    days = np.arange(56)
+    counts = np.vstack(
+        [
+            rng.poisson(4.0 * np.exp(-days / 30)),  # improving
+            rng.poisson(1.0 * np.exp(days / 40)),  # worsening
+            rng.poisson(2.0, size=56),  # flat
+            np.zeros(56),  # nothing logged lately
+        ]
+    ).astype(float)
+    active = np.ones_like(counts, dtype=bool)
+    active[2, :30] = False  # this pet started logging later
+
+    batch = fit_poisson_trend(counts, active)
+    for i in range(len(counts)):
+        single = fit_poisson_trend(counts[i : i + 1], active[i : i + 1])
+        assert batch.beta[i] == pytest.approx(single.beta[0])
+        assert batch.cov[i] == pytest.approx(single.cov[0])
+    assert batch.trend() == ["improving", "worsening", "stable", "stable"]
+
+    expected, lower, upper = batch.forecast()
+    assert expected.shape == lower.shape == upper.shape == (4, HORIZON_DAYS)
+    assert (lower <= expected).all() and (expected <= upper).all()
+    assert expected[3].max() < 0.01
+
+
+@pytest.mark.asyncio
+async def test_forecast_needs_history_then_refits_on_new_data(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    pet_id = test_pet["id"]
+    params = {"pet_id": pet_id}
+    resp = await client.get("/api/v1/progress/forecast", params=params, headers=auth_headers)
+    assert resp.status_code == 422
+
+    now = datetime.now(UTC)
+    history = [
+        abc_log_payload(pet_id, occurred_at=(now - timedelta(days=d)).isoformat())
+        for d in range(28, 0, -1)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": history}, headers=auth_headers)
+
+    resp = await client.get("/api/v1/progress/forecast", params=params, headers=auth_headers)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["data"]) == HORIZON_DAYS
+    assert data["data"][0]["date"] == str(now.date())
+    assert data["trend"] == "stable"
+    assert data["data"][0]["expected"] == pytest.approx(1.0, abs=0.2)
+
+    # Stored until new data arrives; the ETag moves with the refit
+    etag = resp.headers["etag"]
+    resp = await client.get(
+        "/api/v1/progress/forecast", params=params, headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+    resp = await client.get(
+        "/api/v1/progress/forecast", params=params, headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 200
@@ -0,0 +1,146 @@
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.text import tokenize
+from app.models.abc_log import ABCLog
+from app.models.coaching_session import CoachingMessage
+from app.services.history_index import BM25Index, HistoryDoc, HistoryIndexCache, IndexDelta
+
+
+def _doc(doc_id: str, kind: str = "log") -> HistoryDoc:
+    return HistoryDoc(doc_id=doc_id, kind=kind, created_at=datetime(2026, 1, 1), payload={})
+
+
+def test_bm25_ranks_matching_documents_first():
+    index = BM25Index()
+    index.add(_doc("a"), tokenize("doorbell rang, cat hid under the bed"))
+    index.add(_doc("b"), tokenize("scratched the couch after feeding time"))
+    index.add(_doc("c"), tokenize("hid under the bed during the thunderstorm, hid again later"))
+
+    hits = index.search(tokenize("why has she hid under the bed"), k=2)
+    assert [h.doc.doc_id for h in hits] == ["c", "a"]
+    assert hits[0].score > hits[1].score
+
+    assert index.search(tokenize("vet visit"), k=5) == []
+
+
+def test_bm25_kind_filter_and_removal():
+    index = BM25Index()
+    index.add(_doc("log1"), tokenize("litter box avoidance"))
+    index.add(_doc("msg1", kind="message"), tokenize("try a second litter box"))
+
+    assert [h.doc.doc_id for h in index.search(tokenize("litter box"), kind="message")] == ["msg1"]
+
+    index.remove("log1")
+    assert len(index) == 1
+    assert [h.doc.doc_id for h in index.search(tokenize("litter box"))] == ["msg1"]
+
+    # Re-adding a document replaces the old version
+    index.add(_doc("msg1", kind="message"), tokenize("scratching post placement"))
+    assert index.search(tokenize("litter box")) == []
+
+
+@pytest.mark.asyncio
+async def test_delta_refreshes_the_index_without_a_query():
+    pet_id = uuid.uuid4()
+    log = ABCLog(
+        id=uuid.uuid4(),
+        created_at=datetime(2026, 1, 1),
+        occurred_at=datetime(2026, 1, 1),
+        antecedent_category="environmental_change",
+        antecedent_tags=["doorbell"],
+        behavior_category="avoidance",
+        behavior_tags=["hid"],
+        behavior_severity=3,
+        consequence_category="attention_given",
+        consequence_tags=[],
+    )
+    message = CoachingMessage(
+        id=uuid.uuid4(), role="assistant", content="Try a hiding box", created_at=log.created_at
+    )
+    cache = HistoryIndexCache()
+    delta = IndexDelta(*cache.watermarks(pet_id), logs=[log], messages=[message], log_count=1)
+
+    # No session: a query would fail
+    index = await cache.get(None, pet_id, delta=delta)
+    assert {h.doc.doc_id for h in index.search(tokenize("doorbell hiding"))} == {
+        f"log:{log.id}",
+        f"msg:{message.id}",
+    }
+    assert cache.watermarks(pet_id) == ((log.created_at, log.id), (message.created_at, message.id))
+
+
+WORDS = [
+    "doorbell",
+    "visitor",
+    "vacuum",
+    "thunderstorm",
+    "feeding",
+    "bowl",
+    "litter",
+    "box",
+    "couch",
+    "scratch",
+    "hid",
+    "bed",
+    "hissed",
+    "growled",
+    "barked",
+    "window",
+    "squirrel",
+    "leash",
+    "walk",
+    "crate",
+    "alone",
+    "kitchen",
+    "counter",
+    "jumped",
+]
+
+
+@pytest.mark.benchmark
+def test_benchmark_index_build_and_query_10k_logs():
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    docs = [
+        (
+            HistoryDoc(
+                doc_id=f"log:{uuid.uuid4()}",
+                kind="log",
+                created_at=start + timedelta(minutes=i),
+                payload={},
+            ),
+            tokenize(" ".join(rng.choices(WORDS, k=rng.randint(6, 30)))),
+        )
+        for i in range(10_000)
+    ]
+
+    t0 = time.perf_counter()
+    index = BM25Index()
+    for doc, terms in docs:
+        index.add(doc, terms)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    queries = [tokenize(" ".join(rng.choices(WORDS, k=6))) for _ in range(100)]
+    t0 = time.perf_counter()
+    for terms in queries:
+        index.search(terms, k=10)
+    query_ms = (time.perf_counter() - t0) * 1000 / len(queries)
+
+    # Incremental add of one more log after the index is warm
+    t0 = time.perf_counter()
+    index.add(_doc("log:new"), tokenize("doorbell visitor hid under bed"))
+    index.search(queries[0], k=10)
+    incremental_ms = (time.perf_counter() - t0) * 1000
+
+    print(
+        f"\n10k logs: build {build_ms:.1f}ms, query {query_ms:.2f}ms avg, "
+        f"add+query {incremental_ms:.2f}ms"
+    )
+    assert len(index) == 10_001
+    assert build_ms < 2000
+    assert query_ms < 50
@@ -0,0 +1,108 @@
+import uuid
+
+import pytest
+
+from app.core.redis import get_redis
+from tests.conftest import TEST_USER_ID
+
+
+def _log_body(pet_id: str) -> dict:
+    return {
+        "pet_id": pet_id,
+        "antecedent_category": "environmental_change",
+        "antecedent_tags": ["doorbell"],
+        "behavior_category": "avoidance",
+        "behavior_tags": ["hid"],
+        "behavior_severity": 2,
+        "consequence_category": "attention_given",
+        "consequence_tags": ["went_to_pet"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_retried_create_is_replayed(client, auth_headers, test_pet):
+    headers = {**auth_headers, "Idempotency-Key": str(uuid.uuid4())}
+    body = _log_body(test_pet["id"])
+
+    first = await client.post("/api/v1/abc-logs", json=body, headers=headers)
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = await client.post("/api/v1/abc-logs", json=body, headers=headers)
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.json() == first.json()
+
+    resp = await client.get(f"/api/v1/abc-logs?pet_id={test_pet['id']}", headers=auth_headers)
+    assert len(resp.json()) == 1
+
+    # Same key, different request
+    resp = await client.post(
+        "/api/v1/abc-logs", json={**body, "behavior_severity": 3}, headers=headers
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_duplicate_while_in_flight_is_rejected(client, auth_headers, test_pet):
+    key = str(uuid.uuid4())
+    await get_redis().set(f"idempotency:{TEST_USER_ID}:{key}", b"in-flight", ex=5)
+
+    resp = await client.post(
+        "/api/v1/abc-logs",
+        json=_log_body(test_pet["id"]),
+        headers={**auth_headers, "Idempotency-Key": key},
+    )
+    assert resp.status_code == 409
+    assert resp.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_replayed_and_keys_validated(client, auth_headers, test_pet):
+    headers = {**auth_headers, "Idempotency-Key": str(uuid.uuid4())}
+    body = {**_log_body(test_pet["id"]), "behavior_category": "flying"}
+
+    resp = await client.post("/api/v1/abc-logs", json=body, headers=headers)
+    assert resp.status_code == 422
+    resp = await client.post("/api/v1/abc-logs", json=body, headers=headers)
+    assert resp.status_code == 422
+    assert resp.headers["Idempotent-Replayed"] == "true"
+
+    resp = await client.post(
+        "/api/v1/abc-logs",
+        json=_log_body(test_pet["id"]),
+        headers={**auth_headers, "Idempotency-Key": ""},
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_claim_is_renewed_while_a_slow_request_runs(auth_headers, monkeypatch):
+    import asyncio
+
+    from httpx import ASGITransport, AsyncClient
+    from starlette.responses import JSONResponse
+
+    from app.config import settings
+    from app.core.idempotency import IdempotencyMiddleware
+
+    monkeypatch.setattr(settings, "IDEMPOTENCY_LOCK_SECONDS", 1)
+    calls = 0
+
+    async def slow(scope, receive, send):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(2.5)
+        await JSONResponse({"ok": True}, status_code=201)(scope, receive, send)
+
+    app = IdempotencyMiddleware(slow, paths=frozenset({"/slow"}))
+    headers = {**auth_headers, "Idempotency-Key": str(uuid.uuid4())}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = asyncio.create_task(client.post("/slow", json={}, headers=headers))
+        await asyncio.sleep(1.5)
+        # Past the lock's expiry, but the first request is still running
+        duplicate = await client.post("/slow", json={}, headers=headers)
+        assert duplicate.status_code == 409
+        assert (await first).status_code == 201
+
+    assert calls == 1
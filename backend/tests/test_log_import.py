@@ -0,0 +1,176 @@
+import io
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.log_import import read_chunks, validate_chunk
+
+HEADER = (
+    "pet_id,antecedent_category,antecedent_tags,behavior_category,behavior_tags,"
+    "behavior_severity,consequence_category,consequence_tags,occurred_at,location,"
+    "duration_seconds,behavior_notes\n"
+)
+
+
+def _row(pet_id: str, minute: int = 0, **overrides) -> str:
+    values = {
+        "pet_id": pet_id,
+        "antecedent_category": "environmental_change",
+        "antecedent_tags": "doorbell;vacuum",
+        "behavior_category": "avoidance",
+        "behavior_tags": "hid",
+        "behavior_severity": "3",
+        "consequence_category": "attention_given",
+        "consequence_tags": "went_to_pet",
+        "occurred_at": f"2024-01-01T10:{minute:02d}:00+02:00",
+        "location": "kitchen",
+        "duration_seconds": "30",
+        "behavior_notes": '"Hid, then yowled"',
+        **overrides,
+    }
+    return ",".join(values.values()) + "\n"
+
+
+def test_validate_chunk_accepts_valid_rows():
+    pet_id = str(uuid.uuid4())
+    (chunk,) = read_chunks(io.BytesIO((HEADER + _row(pet_id)).encode()), "csv")
+    records, errors = validate_chunk(chunk, {pet_id: "cat"})
+
+    assert errors == []
+    (record,) = records
+    assert record[0] == uuid.UUID(pet_id)
+    assert record[2] == ["doorbell", "vacuum"]
+    assert record[6] == 3
+    assert record[7] == "Hid, then yowled"
+    assert record[11].isoformat() == "2024-01-01T08:00:00"  # naive UTC
+    assert record[13] == 30
+
+
+def test_validate_chunk_reports_every_problem_per_row():
+    pet_id = str(uuid.uuid4())
+    body = (
+        HEADER
+        + _row(pet_id)
+        + _row(str(uuid.uuid4()))
+        + _row(pet_id, behavior_tags="hid;barked", behavior_severity="9")
+        + _row(pet_id, antecedent_tags="", occurred_at="yesterday", duration_seconds="-1")
+    )
+    (chunk,) = read_chunks(io.BytesIO(body.encode()), "csv")
+    records, errors = validate_chunk(chunk, {pet_id: "cat"})
+
+    assert len(records) == 1
+    assert [(e.row, e.errors) for e in errors] == [
+        (
+            2,
+            [
+                "unknown pet_id",
+                "invalid antecedent_category",
+                "invalid antecedent_tags",
+                "invalid behavior_category",
+                "invalid behavior_tags",
+            ],
+        ),
+        (3, ["invalid behavior_tags", "behavior_severity must be an integer from 1 to 5"]),
+        (
+            4,
+            [
+                "invalid antecedent_tags",
+                "occurred_at must be an ISO 8601 timestamp",
+                "duration_seconds must be a non-negative integer",
+            ],
+        ),
+    ]
+
+
+def test_validate_chunk_ndjson_with_default_pet():
+    pet_id = str(uuid.uuid4())
+    line = (
+        '{"antecedent_category": "environmental_change", "antecedent_tags": ["doorbell"], '
+        '"behavior_category": "avoidance", "behavior_tags": ["hid"], "behavior_severity": 2, '
+        '"consequence_category": "attention_given", "consequence_tags": ["went_to_pet"], '
+        '"occurred_at": "2024-01-01T10:00:00"}\n'
+    )
+    (chunk,) = read_chunks(io.BytesIO((line * 2).encode()), "ndjson")
+    records, errors = validate_chunk(chunk, {pet_id: "dog"}, pet_id)
+    # "avoidance" is a cat category only
+    assert records == []
+    assert [e.row for e in errors] == [1, 2]
+
+    records, errors = validate_chunk(chunk, {pet_id: "cat"}, pet_id)
+    assert errors == []
+    assert records[0][2] == ["doorbell"]
+
+
+@pytest.mark.asyncio
+async def test_import_endpoint(client, auth_headers, test_pet):
+    pet_id = test_pet["id"]
+    body = HEADER + _row(pet_id, 1) + _row(pet_id, 2) + _row(pet_id, 2) + _row("nope", 3)
+    files = {"file": ("history.csv", body.encode(), "text/csv")}
+
+    resp = await client.post("/api/v1/abc-logs/import", files=files, headers=auth_headers)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["received"] == 4
+    assert report["imported"] == 2
+    assert report["duplicates"] == 1  # repeated within the file
+    assert report["failed"] == 1
+    assert report["errors"] == [{"row": 4, "errors": ["unknown pet_id"]}]
+
+    # Re-importing the same file adds nothing
+    resp = await client.post("/api/v1/abc-logs/import", files=files, headers=auth_headers)
+    assert resp.json()["imported"] == 0
+    assert resp.json()["duplicates"] == 3
+
+    resp = await client.get(f"/api/v1/abc-logs?pet_id={pet_id}", headers=auth_headers)
+    assert len(resp.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_import_endpoint_rejects_bad_files(client, auth_headers, test_pet):
+    url = f"/api/v1/abc-logs/import?pet_id={test_pet['id']}"
+    resp = await client.post(
+        url, files={"file": ("a.csv", b"behavior_category\navoidance\n")}, headers=auth_headers
+    )
+    assert resp.status_code == 422
+    assert "missing columns" in resp.json()["detail"]
+
+    resp = await client.post(url, files={"file": ("a.csv", b"")}, headers=auth_headers)
+    assert resp.status_code == 422
+
+    resp = await client.post(
+        "/api/v1/abc-logs/import?pet_id=00000000-0000-0000-0000-000000000099",
+        files={"file": ("a.csv", HEADER.encode())},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_benchmark_import_100k_rows(client, auth_headers, test_pet):
+    base = datetime(2020, 1, 1)
+    rows = "".join(
+        _row(
+            test_pet["id"],
+            behavior_severity=str(1 + i % 5),
+            occurred_at=(base + timedelta(minutes=i)).isoformat(),
+        )
+        for i in range(100_000)
+    )
+    body = (HEADER + rows).encode()
+
+    start = time.perf_counter()
+    resp = await client.post(
+        "/api/v1/abc-logs/import",
+        files={"file": ("history.csv", body, "text/csv")},
+        headers=auth_headers,
+    )
+    elapsed = time.perf_counter() - start
+
+    report = resp.json()
+    rate = report["received"] / elapsed
+    print(f"\nimported {report['imported']} of {report['received']} rows: {rate:,.0f} rows/s")
+    assert report["failed"] == 0
+    assert rate >= 50_000
@@ -0,0 +1,50 @@
+import base64
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.core.exceptions import ValidationException
+from app.core.pagination import (
+    decode_change_cursor,
+    decode_cursor,
+    decode_rank_cursor,
+    encode_change_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+
+
+def test_cursor_round_trip():
+    ts = datetime(2026, 3, 7, 15, 44, 55, 574061)
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(ts, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (ts, row_id)
+
+
+@pytest.mark.parametrize(
+    "cursor", ["not-a-cursor", "", encode_cursor(datetime.now(), uuid.uuid4())[:-4]]
+)
+def test_invalid_cursor_rejected(cursor):
+    with pytest.raises(ValidationException):
+        decode_cursor(cursor)
+
+
+def test_change_cursor_round_trip_and_rejects_keyset_cursor():
+    assert decode_change_cursor(encode_change_cursor(987, 12345)) == (987, 12345, False)
+    assert decode_change_cursor(encode_change_cursor(987, 12345, full=True)) == (987, 12345, True)
+    with pytest.raises(ValidationException):
+        decode_change_cursor(encode_cursor(datetime.now(), uuid.uuid4()))
+
+
+def test_legacy_seq_cursor_restarts_sync():
+    legacy = base64.urlsafe_b64encode(b"seq|12345").decode().rstrip("=")
+    assert decode_change_cursor(legacy) == (0, 0, True)
+
+
+def test_rank_cursor_round_trip():
+    row_id = uuid.uuid4()
+    assert decode_rank_cursor(encode_rank_cursor(0.0607927, row_id)) == (0.0607927, row_id)
+    with pytest.raises(ValidationException):
+        decode_rank_cursor(encode_change_cursor(1, 5))
@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+
+from app.db.partitions import add_months, ensure_future_partitions, month_start
+from app.db.session import async_session_factory
+
+
+def test_month_arithmetic():
+    assert month_start(date(2026, 3, 31)) == date(2026, 3, 1)
+    assert add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+async def _partition_of(log_id: str) -> str:
+    async with async_session_factory() as session:
+        result = await session.execute(
+            text("SELECT tableoid::regclass::text FROM abc_logs WHERE id = :id"), {"id": log_id}
+        )
+        return result.scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_ensure_future_partitions_is_idempotent(client):
+    async with async_session_factory() as session:
+        await ensure_future_partitions(session)
+        await session.commit()
+        assert await ensure_future_partitions(session) == 0
+
+
+@pytest.mark.asyncio
+async def test_log_moves_between_month_partitions(client, auth_headers, test_pet, abc_log_payload):
+    async with async_session_factory() as session:
+        await ensure_future_partitions(session)
+        await session.commit()
+    resp = await client.post(
+        "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+    )
+    log = resp.json()
+    this_month = month_start(date.fromisoformat(log["occurred_at"][:10]))
+    assert await _partition_of(log["id"]) == f"abc_logs_p{this_month:%Y%m}"
+
+    sync = await client.get("/api/v1/sync/changes", headers=auth_headers)
+    cursor = sync.json()["next_cursor"]
+
+    # Moving occurred_at into next month moves the row to another partition;
+    # the sync feed sees an update, not a deletion.
+    next_month = add_months(this_month, 1)
+    resp = await client.put(
+        f"/api/v1/abc-logs/{log['id']}",
+        json={"occurred_at": f"{next_month.isoformat()}T09:00:00"},
+        headers=auth_headers,
+    )
+    assert resp.status_code == 200
+    assert await _partition_of(log["id"]) == f"abc_logs_p{next_month:%Y%m}"
+
+    changes = await client.get(
+        "/api/v1/sync/changes", params={"cursor": cursor}, headers=auth_headers
+    )
+    page = changes.json()
+    assert [row["id"] for row in page["abc_logs"]] == [log["id"]]
+    assert page["deleted"] == []
+
+
+@pytest.mark.asyncio
+async def test_backdated_logs_get_their_own_partitions(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    resp = await client.post(
+        "/api/v1/abc-logs",
+        json=abc_log_payload(test_pet["id"], occurred_at="2019-06-10T09:00:00"),
+        headers=auth_headers,
+    )
+    assert await _partition_of(resp.json()["id"]) == "abc_logs_p201906"
+
+    logs = [
+        abc_log_payload(test_pet["id"], occurred_at=f"2019-{month:02d}-03T09:00:00")
+        for month in (7, 8)
+    ]
+    resp = await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+    created = [item["log"]["id"] for item in resp.json()["results"]]
+    assert [await _partition_of(log_id) for log_id in created] == [
+        "abc_logs_p201907",
+        "abc_logs_p201908",
+    ]
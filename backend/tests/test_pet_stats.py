@@ -0,0 +1,67 @@
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.services.pet_stats import PetStats, PetStatsCache
+
+
+def _stats(total: int) -> PetStats:
+    return PetStats(total, None, 0, 0, None, None, [], [], [])
+
+
+def test_cache_entries_are_valid_for_one_version_and_day():
+    cache = PetStatsCache(max_pets=2)
+    pet = uuid.uuid4()
+    today = date(2026, 3, 1)
+    cache.put(pet, 4, today, _stats(10))
+    assert cache.get(pet, 4, today).total_logs == 10
+    assert cache.get(pet, 5, today) is None
+    assert cache.get(pet, 4, date(2026, 3, 2)) is None
+
+    cache.put(uuid.uuid4(), 1, today, _stats(1))
+    cache.put(uuid.uuid4(), 1, today, _stats(1))
+    assert cache.get(pet, 4, today) is None  # least recently used, evicted
+
+
+def test_trend_pct():
+    assert PetStats(5, 2.0, 6, 4, None, None, [], [], []).trend_pct == 50.0
+    assert PetStats(5, 2.0, 3, 0, None, None, [], [], []).trend_pct == 100.0
+    assert PetStats(0, None, 0, 0, None, None, [], [], []).trend_pct == 0.0
+
+
+@pytest.mark.asyncio
+async def test_dashboard_and_summary_share_cached_stats(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    pet_id = test_pet["id"]
+    logs = [abc_log_payload(pet_id, behavior_severity=s) for s in (1, 2, 3)]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+
+    resp = await client.get(f"/api/v1/abc-logs/summary?pet_id={pet_id}", headers=auth_headers)
+    summary = resp.json()
+    assert summary["total_logs"] == 3
+    assert summary["severity_avg"] == 2.0
+    assert summary["top_behaviors"] == [{"category": "avoidance", "count": 3}]
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        resp = await client.get(f"/api/v1/progress/dashboard?pet_id={pet_id}", headers=auth_headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    assert resp.json()["total_logs"] == 3
+    assert resp.json()["recent_7d"] == 3
+    # user lookup, then ownership plus data version; the stats come from cache
+    assert len(statements) <= 2, statements
+
+    # A write bumps the pet's data version, so the next read recomputes
+    await client.post("/api/v1/abc-logs", json=abc_log_payload(pet_id), headers=auth_headers)
+    resp = await client.get(f"/api/v1/abc-logs/summary?pet_id={pet_id}", headers=auth_headers)
+    assert resp.json()["total_logs"] == 4
@@ -1,4 +1,10 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
+from sqlalchemy import event
+
+from app.db.session import engine
+from app.services.series import MAX_SERIES_POINTS, bucket_count, choose_resolution
 
 
 @pytest.mark.asyncio
@@ -58,3 +64,79 @@ async def test_pattern_detection_insufficient_logs(client, auth_headers, test_pe
     )
     assert resp.status_code == 422
     assert "Need at least" in resp.json()["detail"]
+
+
+def test_series_resolution_follows_range():
+    assert choose_resolution(30) == "day"
+    assert choose_resolution(92) == "day"
+    assert choose_resolution(365) == "week"
+    assert choose_resolution(3650) == "month"
+    assert bucket_count(3650, "month") <= MAX_SERIES_POINTS
+    assert bucket_count(3650, "day") > MAX_SERIES_POINTS
+
+
+@pytest.mark.asyncio
+async def test_weekly_frequency_is_gap_filled(client, auth_headers, test_pet, abc_log_payload):
+    pet_id = test_pet["id"]
+    now = datetime.now(UTC)
+    logs = [
+        abc_log_payload(pet_id, occurred_at=(now - timedelta(days=d)).isoformat())
+        for d in (0, 1, 120)
+    ]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+
+    resp = await client.get(
+        f"/api/v1/progress/frequency?pet_id={pet_id}&days=180", headers=auth_headers
+    )
+    body = resp.json()
+    assert body["resolution"] == "week"
+    counts = [point["count"] for point in body["data"]]
+    assert len(counts) >= 26
+    assert sum(counts) == 3
+    assert counts.count(0) >= len(counts) - 3
+
+    resp = await client.get(
+        f"/api/v1/progress/severity-trend?pet_id={pet_id}&days=180&resolution=month",
+        headers=auth_headers,
+    )
+    body = resp.json()
+    assert body["resolution"] == "month"
+    assert any(point["avg_severity"] is None for point in body["data"])
+
+    resp = await client.get(
+        f"/api/v1/progress/frequency?pet_id={pet_id}&days=3000&resolution=day",
+        headers=auth_headers,
+    )
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_household_dashboard_is_one_query(client, auth_headers, test_pet, abc_log_payload):
+    second = await client.post(
+        "/api/v1/pets", json={"name": "Rex", "species": "dog"}, headers=auth_headers
+    )
+    pet_id = test_pet["id"]
+    logs = [abc_log_payload(pet_id, behavior_severity=s) for s in (2, 4)]
+    await client.post("/api/v1/abc-logs/batch", json={"logs": logs}, headers=auth_headers)
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        resp = await client.get("/api/v1/progress/household", headers=auth_headers)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    # user lookup, then the household query
+    assert len(statements) <= 2, statements
+
+    pets = {pet["pet_id"]: pet for pet in resp.json()["pets"]}
+    assert set(pets) == {pet_id, second.json()["id"]}
+    assert pets[pet_id]["total_logs"] == 2
+    assert pets[pet_id]["avg_severity"] == 3.0
+    assert pets[pet_id]["sparkline"][-1] == 2
+    assert len(pets[pet_id]["sparkline"]) == 14
+    assert pets[second.json()["id"]]["total_logs"] == 0
+    assert pets[second.json()["id"]]["unread_insights"] == 0
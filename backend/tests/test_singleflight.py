@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = 0
+
+    async def compute() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+
+    results = await asyncio.gather(*(flight.do("k", compute) for _ in range(5)))
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    assert (flight.metrics.leaders, flight.metrics.coalesced) == (1, 4)
+    assert len(flight) == 0
+
+    # Other keys, and later calls, run on their own
+    await asyncio.gather(flight.do("k", compute), flight.do("other", compute))
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_caller_and_are_not_kept():
+    flight = SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+
+    async def succeed() -> int:
+        return 1
+
+    assert await flight.do("k", succeed) == 1
+
+
+@pytest.mark.asyncio
+async def test_a_cancelled_caller_does_not_cancel_the_flight():
+    flight = SingleFlight()
+
+    async def compute() -> int:
+        await asyncio.sleep(0.02)
+        return 7
+
+    first = asyncio.ensure_future(flight.do("k", compute))
+    second = asyncio.ensure_future(flight.do("k", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == 7
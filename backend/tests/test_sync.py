@@ -0,0 +1,126 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.core.pagination import decode_change_cursor
+from app.db.session import async_session_factory
+from app.models.pet import Pet
+from tests.conftest import TEST_USER_ID
+
+
+async def _sync_to_end(client, auth_headers, cursor=None) -> tuple[dict, str]:
+    merged = {"pets": [], "abc_logs": [], "insights": [], "deleted": []}
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        resp = await client.get("/api/v1/sync/changes", params=params, headers=auth_headers)
+        assert resp.status_code == 200
+        page = resp.json()
+        for key in merged:
+            merged[key].extend(page[key])
+        cursor = page["next_cursor"]
+        if not page["has_more"]:
+            return merged, cursor
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_only_changes_since_cursor(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    full, cursor = await _sync_to_end(client, auth_headers)
+    assert test_pet["id"] in {p["id"] for p in full["pets"]}
+
+    # Nothing changed: empty page; the position only moves up to the settled point
+    changes, same = await _sync_to_end(client, auth_headers, cursor)
+    assert changes == {"pets": [], "abc_logs": [], "insights": [], "deleted": []}
+    assert decode_change_cursor(same) >= decode_change_cursor(cursor)
+
+    created = []
+    for _ in range(3):
+        resp = await client.post(
+            "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+        )
+        created.append(resp.json()["id"])
+    await client.put(
+        f"/api/v1/pets/{test_pet['id']}", json={"name": "Renamed"}, headers=auth_headers
+    )
+    await client.delete(f"/api/v1/abc-logs/{created[0]}", headers=auth_headers)
+
+    changes, cursor = await _sync_to_end(client, auth_headers, cursor)
+    assert [p["name"] for p in changes["pets"]] == ["Renamed"]
+    assert {log["id"] for log in changes["abc_logs"]} == set(created[1:])
+    assert changes["deleted"][0]["table"] == "abc_logs"
+    assert changes["deleted"][0]["id"] == created[0]
+
+
+@pytest.mark.asyncio
+async def test_sync_invalid_cursor(client, auth_headers):
+    resp = await client.get("/api/v1/sync/changes?cursor=bogus", headers=auth_headers)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_sync_waits_for_open_transactions(client, auth_headers, test_pet, abc_log_payload):
+    _, cursor = await _sync_to_end(client, auth_headers)
+
+    async with async_session_factory() as session:
+        # An earlier transaction, still open while a later one commits
+        pending = Pet(user_id=uuid.UUID(TEST_USER_ID), name="Pending", species="dog")
+        session.add(pending)
+        await session.flush()
+        pending_xid = await session.scalar(text("SELECT pg_current_xact_id()::text::bigint"))
+        resp = await client.post(
+            "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+        )
+        log_id = resp.json()["id"]
+
+        changes, held = await _sync_to_end(client, auth_headers, cursor)
+        assert changes["abc_logs"] == []
+        # The cursor stops short of the open transaction
+        assert decode_change_cursor(held)[0] <= pending_xid
+        await session.commit()
+
+    changes, _ = await _sync_to_end(client, auth_headers, cursor)
+    assert [p["id"] for p in changes["pets"]] == [str(pending.id)]
+    assert [log["id"] for log in changes["abc_logs"]] == [log_id]
+
+
+@pytest.mark.asyncio
+async def test_cursor_behind_pruned_tombstones_resyncs(
+    client, auth_headers, test_pet, abc_log_payload
+):
+    from datetime import datetime, timedelta
+
+    from app.services.sync_retention import prune_tombstones
+
+    _, stale = await _sync_to_end(client, auth_headers)
+    created = []
+    for _ in range(3):
+        resp = await client.post(
+            "/api/v1/abc-logs", json=abc_log_payload(test_pet["id"]), headers=auth_headers
+        )
+        created.append(resp.json()["id"])
+    await client.delete(f"/api/v1/abc-logs/{created[0]}", headers=auth_headers)
+    _, current = await _sync_to_end(client, auth_headers, stale)
+
+    async with async_session_factory() as session:
+        assert await prune_tombstones(session, datetime.now() + timedelta(days=1)) >= 1
+        await session.commit()
+
+    # Behind the pruned delete: start over, flagged, and page through to the end
+    resp = await client.get(
+        "/api/v1/sync/changes", params={"cursor": stale, "limit": 1}, headers=auth_headers
+    )
+    page = resp.json()
+    assert page["reset"] is True
+    assert page["has_more"] is True
+    rest, _ = await _sync_to_end(client, auth_headers, page["next_cursor"])
+    ids = {log["id"] for log in page["abc_logs"] + rest["abc_logs"]}
+    assert ids >= set(created[1:])
+    assert created[0] not in ids
+
+    # A client that had caught up missed nothing
+    resp = await client.get(
+        "/api/v1/sync/changes", params={"cursor": current}, headers=auth_headers
+    )
+    assert resp.json()["reset"] is False
@@ -40,6 +40,9 @@ export default function ProgressPage() {
 
   if (loading) return <LoadingSpinner message="Loading progress data..." />;
 
+  // Series are gap-filled, so an empty range is all zero-count buckets
+  const hasLogs = !!frequency?.data.some((d) => d.count > 0);
+
   return (
     <div>
       <div className="page-header" style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
@@ -63,7 +66,7 @@ export default function ProgressPage() {
       {error && <ErrorBanner message={error} onDismiss={() => setError('')} />}
 
       {/* Frequency Chart */}
-      {frequency && frequency.data.length > 0 && (
+      {hasLogs && frequency && (
         <div className="chart-container">
           <h3>Behavior Frequency</h3>
           <ResponsiveContainer width="100%" height={300}>
@@ -86,7 +89,7 @@ export default function ProgressPage() {
       )}
 
       {/* Severity Trend */}
-      {severity && severity.data.length > 0 && (
+      {hasLogs && severity && (
         <div className="chart-container">
           <h3>Severity Trend</h3>
           <ResponsiveContainer width="100%" height={300}>
@@ -103,8 +106,8 @@ export default function ProgressPage() {
                 contentStyle={{ borderRadius: 8, border: '1px solid var(--border)' }}
               />
               <Legend />
-              <Line type="monotone" dataKey="avg_severity" stroke="var(--primary)" strokeWidth={2} name="Average" dot={{ r: 3 }} />
-              <Line type="monotone" dataKey="max_severity" stroke="var(--accent)" strokeWidth={2} name="Maximum" dot={{ r: 3 }} />
+              <Line type="monotone" dataKey="avg_severity" stroke="var(--primary)" strokeWidth={2} name="Average" dot={{ r: 3 }} connectNulls />
+              <Line type="monotone" dataKey="max_severity" stroke="var(--accent)" strokeWidth={2} name="Maximum" dot={{ r: 3 }} connectNulls />
             </LineChart>
           </ResponsiveContainer>
         </div>
@@ -145,7 +148,7 @@ export default function ProgressPage() {
         </div>
       )}
 
-      {(!frequency || frequency.data.length === 0) && (!severity || severity.data.length === 0) && (
+      {!hasLogs && (
         <div className="empty-state">
           <div className="empty-icon">{"📈"}</div>
           <h3>No data yet</h3>
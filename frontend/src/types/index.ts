@@ -176,16 +176,20 @@ export interface CoachingSessionDetail {
 }
 
 // ── Progress ─────────────────────────────────────────
+export type SeriesResolution = 'day' | 'week' | 'month';
+
 export interface FrequencyData {
   pet_id: string;
   days: number;
+  resolution: SeriesResolution;
   data: { date: string; count: number }[];
 }
 
 export interface SeverityTrendData {
   pet_id: string;
   days: number;
-  data: { date: string; avg_severity: number; max_severity: number }[];
+  resolution: SeriesResolution;
+  data: { date: string; avg_severity: number | null; max_severity: number | null }[];
 }
 
 export interface CategoryBreakdown {
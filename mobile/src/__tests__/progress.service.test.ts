@@ -3,6 +3,7 @@ import {
   getSeverityTrend,
   getCategoryBreakdown,
   getDashboard,
+  getHousehold,
 } from '../services/progress';
 
 jest.mock('../services/api', () => ({
@@ -108,4 +109,16 @@ describe('progress service', () => {
       expect(result).toEqual(payload);
     });
   });
+
+  describe('getHousehold', () => {
+    it('hits the correct endpoint', async () => {
+      const payload = { sparkline_start: '2026-03-01', pets: [] };
+      mockGet.mockResolvedValueOnce(payload);
+
+      const result = await getHousehold();
+
+      expect(mockGet).toHaveBeenCalledWith('/progress/household');
+      expect(result).toEqual(payload);
+    });
+  });
 });
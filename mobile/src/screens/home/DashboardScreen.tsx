@@ -27,17 +27,15 @@ export default function DashboardScreen({ navigation }: Props) {
 
   const loadData = useCallback(async () => {
     try {
-      const petList = await petService.listPets();
+      const [petList, household] = await Promise.all([
+        petService.listPets(),
+        progressService.getHousehold(),
+      ]);
       setPets(petList);
 
       const dashMap: Record<string, DashboardData> = {};
-      for (const pet of petList) {
-        try {
-          const d = await progressService.getDashboard(pet.id);
-          dashMap[pet.id] = d;
-        } catch {
-          // pet may not have logs yet
-        }
+      for (const dash of household.pets) {
+        dashMap[dash.pet_id] = dash;
       }
       setDashboards(dashMap);
     } catch (err) {
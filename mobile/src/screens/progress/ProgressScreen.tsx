@@ -92,24 +92,27 @@ export default function ProgressScreen({ route }: Props) {
     { label: '90d', value: 90 },
   ];
 
+  const shortDate = (date: string) =>
+    new Date(date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' });
+
+  // Series are gap-filled, so an empty range is all zero-count buckets
+  const hasLogs = !!frequency?.data.some((d) => d.count > 0);
+
   const freqChartData =
-    frequency?.data.map((d) => ({
-      x: new Date(d.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-      y: d.count,
-    })) ?? [];
+    hasLogs && frequency ? frequency.data.map((d) => ({ x: shortDate(d.date), y: d.count })) : [];
+
+  // Empty buckets have no severity; the lines join the buckets either side
+  const sevPoints = hasLogs
+    ? (severity?.data ?? []).flatMap((d) =>
+        d.avg_severity !== null && d.max_severity !== null
+          ? [{ x: shortDate(d.date), avg: d.avg_severity, max: d.max_severity }]
+          : [],
+      )
+    : [];
 
-  const sevAvgData =
-    severity?.data.map((d) => ({
-      x: new Date(d.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-      y: d.avg_severity,
-      color: severityColor(d.avg_severity),
-    })) ?? [];
+  const sevAvgData = sevPoints.map((p) => ({ x: p.x, y: p.avg, color: severityColor(p.avg) }));
 
-  const sevMaxData =
-    severity?.data.map((d) => ({
-      x: new Date(d.date).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
-      y: d.max_severity,
-    })) ?? [];
+  const sevMaxData = sevPoints.map((p) => ({ x: p.x, y: p.max }));
 
   return (
     <ScrollView style={styles.container} contentContainerStyle={styles.content}>
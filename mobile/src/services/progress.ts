@@ -1,15 +1,20 @@
 import { api } from './api';
 
+export type SeriesResolution = 'day' | 'week' | 'month';
+
 export interface FrequencyData {
   pet_id: string;
   days: number;
+  resolution: SeriesResolution;
   data: { date: string; count: number }[];
 }
 
 export interface SeverityTrendData {
   pet_id: string;
   days: number;
-  data: { date: string; avg_severity: number; max_severity: number }[];
+  resolution: SeriesResolution;
+  // Buckets without logs are null
+  data: { date: string; avg_severity: number | null; max_severity: number | null }[];
 }
 
 export interface CategoryBreakdown {
@@ -30,6 +35,19 @@ export interface DashboardData {
   pattern_detection_ready: boolean;
 }
 
+export interface HouseholdPet extends DashboardData {
+  name: string;
+  species: string;
+  /** Daily log counts, oldest first, ending today */
+  sparkline: number[];
+  unread_insights: number;
+}
+
+export interface HouseholdData {
+  sparkline_start: string;
+  pets: HouseholdPet[];
+}
+
 export async function getBehaviorFrequency(
   petId: string,
   days = 30,
@@ -54,3 +72,7 @@ export async function getCategoryBreakdown(
 export async function getDashboard(petId: string): Promise<DashboardData> {
   return api.get<DashboardData>(`/progress/dashboard?pet_id=${petId}`);
 }
+
+export async function getHousehold(): Promise<HouseholdData> {
+  return api.get<HouseholdData>('/progress/household');
+}